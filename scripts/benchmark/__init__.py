@@ -0,0 +1,4 @@
+"""
+엔드투엔드 지연시간 벤치마크
+합성 카탈로그 + 로컬 OpenAI 호환 stub 서버로 재현 가능한 성능 측정
+"""
@@ -0,0 +1,133 @@
+"""
+미들웨어 요청당 오버헤드 측정
+
+동일한 최소 FastAPI 앱에 미들웨어 구성만 바꿔 ASGI 수준에서 직접 호출한다.
+(네트워크/uvicorn 비용 제외, 순수 미들웨어 비용 비교)
+
+- bare: 미들웨어 없음
+- base_http: 이전 방식(BaseHTTPMiddleware)의 rate limit
+- asgi: 순수 ASGI RateLimitMiddleware
+- asgi+timing: 순수 ASGI RateLimitMiddleware + TimingMiddleware
+
+사용 예:
+    python -m scripts.benchmark.middleware_overhead --requests 5000 --chunks 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from server.middleware.limiter import MemoryRateLimiter  # noqa: E402
+from server.middleware.rate_limit import RateLimitMiddleware  # noqa: E402
+from server.middleware.timing import TimingMiddleware  # noqa: E402
+
+UNLIMITED = 10 ** 9
+
+
+class BaseHTTPRateLimitMiddleware(BaseHTTPMiddleware):
+    """비교 기준: BaseHTTPMiddleware로 구현한 동일 로직"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.limiter = MemoryRateLimiter()
+
+    async def dispatch(self, request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        result = await self.limiter.hit(f"ip:{client_ip}", UNLIMITED, 3600)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(int(time.time() + result.reset_after))
+        return response
+
+
+def build_app(variant: str, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, Any]:
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(chunks):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if variant == "base_http":
+        app.add_middleware(BaseHTTPRateLimitMiddleware)
+    elif variant.startswith("asgi"):
+        app.add_middleware(RateLimitMiddleware, requests_per_hour=UNLIMITED,
+                           enable_user_limit=False)
+        if variant == "asgi+timing":
+            app.add_middleware(TimingMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> List[float]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    samples = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):  # warmup
+            await client.get(path)
+        for _ in range(requests):
+            start = time.perf_counter()
+            resp = await client.get(path)
+            await resp.aread()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples) * 1e6
+    return {
+        "mean_us": round(float(arr.mean()), 1),
+        "p50_us": round(float(np.percentile(arr, 50)), 1),
+        "p99_us": round(float(np.percentile(arr, 99)), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미들웨어 요청당 오버헤드 측정")
+    parser.add_argument("--requests", type=int, default=3000, help="경로별 요청 수")
+    parser.add_argument("--chunks", type=int, default=50, help="스트리밍 응답 청크 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    variants = ["bare", "base_http", "asgi", "asgi+timing"]
+    report: Dict[str, Any] = {}
+    for path in ("/ping", "/stream"):
+        results = {}
+        for variant in variants:
+            app = build_app(variant, args.chunks)
+            results[variant] = summarize(asyncio.run(measure(app, path, args.requests)))
+        bare = results["bare"]["mean_us"]
+        for variant in variants[1:]:
+            results[variant]["overhead_us"] = round(results[variant]["mean_us"] - bare, 1)
+        report[path] = results
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+로컬 OpenAI 호환 stub 서버
+/v1/chat/completions 요청에 지연시간(고정 + 토큰 생성 속도)을 흉내 내어 응답한다.
+응답은 프롬프트에 등장한 seller_id로 만든 결정적 점수 JSON이므로
+ProductAgent / ReliabilityAgent / CombinedScorer / Orchestrator 모두 정상 경로로 파싱된다.
+"""
+
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# 서브에이전트 컨텍스트는 seller_id, 오케스트레이터 요약 컨텍스트는 id
+_SELLER_ID_RE = re.compile(r"['\"](?:seller_)?id['\"]\s*:\s*['\"]?(\d+)")
+_AGENT_RE = re.compile(r"You are \*\*(\w+)\*\*")
+
+# 프롬프트 첫 줄의 에이전트 이름 → 워크플로우 노드
+AGENT_NODES = {
+    "ProductAgent": "product_agent",
+    "ReliabilityAgent": "reliability_agent",
+    "CombinedScorer": "combined_agent",
+    "FinalMatcher": "orchestrator_agent",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (ASCII 4자 ≈ 1토큰, 한글 등은 1.5자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def _score(seller_id: str) -> float:
+    return round(0.3 + (zlib.crc32(seller_id.encode()) % 700) / 1000.0, 3)
+
+
+def build_mock_decision(prompt: str, schema: Optional[str] = None) -> Dict[str, Any]:
+    """
+    프롬프트의 seller_id로 모든 에이전트가 파싱 가능한 응답 생성
+
+    Args:
+        schema: structured outputs 스키마 이름 (response_format.json_schema.name)
+    """
+    seller_ids: List[str] = list(dict.fromkeys(_SELLER_ID_RE.findall(prompt)))
+    scored = sorted(seller_ids, key=_score, reverse=True)
+    reason = "벤치마크용 응답입니다."
+    if schema == "ProductScoring":
+        return {"s": [
+            {"id": int(sid), "sc": _score(sid), "ch": reason, "pmin": 0, "pmax": 0, "why": reason}
+            for sid in scored
+        ]}
+    if schema == "ReliabilityScoring":
+        return {"s": [
+            {"id": int(sid), "sc": _score(sid), "tl": "medium", "sum": reason,
+             "tags": ["벤치마크"], "why": reason}
+            for sid in scored
+        ]}
+    if schema == "CombinedScoring":
+        return {"s": [
+            {"id": int(sid), "ps": _score(sid), "rs": _score(sid[::-1]), "tl": "medium",
+             "ch": reason, "tags": ["벤치마크"], "pmin": 0, "pmax": 0, "why": reason}
+            for sid in scored
+        ]}
+    if schema == "FinalRanking":
+        return {
+            "r": [{"id": int(sid), "sc": _score(sid), "why": reason, "fit": reason}
+                  for sid in scored[:10]],
+            "why": reason,
+        }
+    return {
+        "recommended_sellers": [
+            {"seller_id": sid, "score": _score(sid), "reasoning": reason} for sid in scored
+        ],
+        "reasoning": reason,
+        "confidence": 0.8,
+    }
+
+
+class MockLLMStats:
+    """요청별 프롬프트 크기 집계 (노드 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: List[Dict[str, Any]] = []
+
+    def record(self, node: str, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.requests.append({
+                "node": node,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            })
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.requests)
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+
+
+class MockLLMServer:
+    """
+    OpenAI 호환 stub 서버 (별도 스레드)
+
+    Args:
+        latency_ms: 요청당 고정 지연 (첫 토큰까지)
+        tokens_per_second: 출력 토큰 생성 속도 (0이면 무제한)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 300.0, tokens_per_second: float = 80.0):
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.stats = MockLLMStats()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # 요청 로그 출력 안 함
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._send_json(200, {"requests": server.stats.snapshot()})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                messages = request.get("messages", [])
+                prompt = "\n".join(str(m.get("content", "")) for m in messages)
+                agent_match = _AGENT_RE.search(prompt)
+                node = AGENT_NODES.get(
+                    agent_match.group(1) if agent_match else "", "other")
+
+                response_format = request.get("response_format") or {}
+                if response_format.get("type") in ("json_object", "json_schema"):
+                    schema = (response_format.get("json_schema") or {}).get("name")
+                    content = json.dumps(build_mock_decision(prompt, schema), ensure_ascii=False)
+                else:
+                    content = "안녕하세요! 찾으시는 상품을 알려주세요."
+
+                prompt_tokens = estimate_tokens(prompt)
+                completion_tokens = estimate_tokens(content)
+                server.stats.record(node, prompt_tokens, completion_tokens)
+
+                delay = server.latency_ms / 1000.0
+                if server.tokens_per_second > 0:
+                    delay += completion_tokens / server.tokens_per_second
+                time.sleep(delay)
+
+                self._send_json(200, {
+                    "id": f"chatcmpl-bench-{int(time.time() * 1000)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "mock"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                })
+
+        return Handler
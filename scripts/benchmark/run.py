@@ -0,0 +1,374 @@
+"""
+엔드투엔드 지연시간 벤치마크 실행
+
+1) 합성 카탈로그를 임시 SQLite DB에 생성
+2) 로컬 OpenAI 호환 stub 서버(고정 지연 + 토큰 속도) 기동
+3) 워크플로우를 프로세스 내에서 실행하여 노드별 지연시간 / DB 쿼리 수 / 프롬프트 토큰 측정
+   (--topologies 지정 시 토폴로지별 지연시간 / LLM 호출 수 / 토큰 수 비교)
+4) uvicorn 서버를 띄워 /api/v1/recommend, /api/v1/recommend/stream 을 고정 동시성으로 호출
+
+결과는 JSON으로 저장되며 --baseline 으로 이전 결과와 비교할 수 있다.
+
+사용 예:
+    python -m scripts.benchmark.run --sellers 500 --requests 40 --concurrency 8 \\
+        --output bench.json --baseline bench_prev.json
+    python -m scripts.benchmark.run --skip-http \\
+        --topologies split,combined,combined_deterministic
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmark.mock_llm import MockLLMServer  # noqa: E402
+
+QUERIES = [
+    "아이폰 14 상태 좋은 거",
+    "맥북 에어 M2 저렴하게",
+    "갤럭시 S23 택배 거래",
+    "다이슨 청소기 새상품",
+    "소니 미러리스 카메라",
+    "아이패드 프로 안전결제",
+]
+
+# 토폴로지 이름 → recommendation_workflow 인자
+TOPOLOGIES = {
+    "split": {"topology": "split", "finalizer": "llm"},
+    "split_deterministic": {"topology": "split", "finalizer": "deterministic"},
+    "combined": {"topology": "combined", "finalizer": "llm"},
+    "combined_deterministic": {"topology": "combined", "finalizer": "deterministic"},
+}
+
+_current_node: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "benchmark_current_node", default=None)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/평균 (ms)"""
+    if not samples:
+        return {"count": 0}
+    arr = np.asarray(samples, dtype=float) * 1000.0
+    return {
+        "count": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 2),
+        "p50_ms": round(float(np.percentile(arr, 50)), 2),
+        "p95_ms": round(float(np.percentile(arr, 95)), 2),
+        "p99_ms": round(float(np.percentile(arr, 99)), 2),
+    }
+
+
+def build_request(i: int) -> Dict[str, Any]:
+    return {
+        "search_query": QUERIES[i % len(QUERIES)],
+        "trust_safety": 50,
+        "quality_condition": 50,
+        "remote_transaction": 50,
+        "activity_responsiveness": 50,
+        "price_flexibility": 50,
+    }
+
+
+# ==================== 프로세스 내 노드 프로파일 ====================
+
+class NodeProfiler:
+    """노드별 지연시간 및 DB 쿼리 수 수집기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, int] = defaultdict(int)
+
+    def wrap(self, name: str, node: Callable) -> Callable:
+        def timed(state):
+            token = _current_node.set(name)
+            start = time.perf_counter()
+            try:
+                return node(state)
+            finally:
+                elapsed = time.perf_counter() - start
+                _current_node.reset(token)
+                with self._lock:
+                    self.durations[name].append(elapsed)
+        return timed
+
+    def on_query(self, *args, **kwargs):
+        node = _current_node.get() or "other"
+        with self._lock:
+            self.queries[node] += 1
+
+
+def profile_nodes(runs: int, **workflow_kwargs) -> Dict[str, Any]:
+    """워크플로우를 직접 실행하여 노드별 지연시간 측정 (workflow_kwargs는 recommendation_workflow 인자)"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from server.workflow.graph import recommendation_workflow
+
+    profiler = NodeProfiler()
+    # writer / 읽기 전용 / 복제본 / 비동기(sync_engine) 엔진 모두 집계하도록 Engine 클래스에 등록
+    event.listen(Engine, "before_cursor_execute", profiler.on_query)
+    try:
+        app = recommendation_workflow(node_wrapper=profiler.wrap, **workflow_kwargs)
+        totals = []
+        for i in range(runs):
+            state = {
+                "user_input": build_request(i),
+                "current_step": "start",
+                "completed_steps": [],
+                "execution_start_time": time.time(),
+            }
+            start = time.perf_counter()
+            app.invoke(state)
+            totals.append(time.perf_counter() - start)
+    finally:
+        event.remove(Engine, "before_cursor_execute", profiler.on_query)
+
+    return {
+        "workflow": percentiles(totals),
+        "nodes": {name: percentiles(samples)
+                  for name, samples in sorted(profiler.durations.items())},
+        "db_queries_per_run": {name: round(count / max(runs, 1), 2)
+                               for name, count in sorted(profiler.queries.items())},
+    }
+
+
+def compare_topologies(mock: MockLLMServer, runs: int, names: List[str]) -> Dict[str, Any]:
+    """토폴로지별 워크플로우 지연시간과 요청당 LLM 호출 수 / 프롬프트·출력 토큰 비교"""
+    results = {}
+    for name in names:
+        mock.stats.reset()
+        profile = profile_nodes(runs, **TOPOLOGIES[name])
+        requests = mock.stats.snapshot()
+        per_run = max(runs, 1)
+        results[name] = {
+            "workflow": profile["workflow"],
+            "llm_calls_per_run": round(len(requests) / per_run, 2),
+            "prompt_tokens_per_run": round(sum(r["prompt_tokens"] for r in requests) / per_run, 1),
+            "completion_tokens_per_run": round(
+                sum(r["completion_tokens"] for r in requests) / per_run, 1),
+            "nodes": profile["nodes"],
+        }
+    return results
+
+
+# ==================== HTTP 부하 ====================
+
+async def _drive_endpoint(base_url: str, path: str, total: int,
+                          concurrency: int, stream: bool) -> Dict[str, Any]:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    first_event: List[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300.0) as client:
+        async def one(i: int):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    if stream:
+                        got_first = False
+                        async with client.stream("POST", path, json=build_request(i)) as resp:
+                            resp.raise_for_status()
+                            async for line in resp.aiter_lines():
+                                if line.startswith("data:") and not got_first:
+                                    first_event.append(time.perf_counter() - start)
+                                    got_first = True
+                    else:
+                        resp = await client.post(path, json=build_request(i))
+                        resp.raise_for_status()
+                        if resp.json().get("status") != "success":
+                            errors += 1
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    errors += 1
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        wall = time.perf_counter() - wall_start
+
+    result = {
+        "latency": percentiles(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+    }
+    if stream:
+        result["first_event"] = percentiles(first_event)
+    return result
+
+
+def _wait_for_server(base_url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("벤치마크 서버가 시작되지 않았습니다")
+
+
+def run_http_load(env: Dict[str, str], port: int, total: int,
+                  concurrency: int) -> Dict[str, Any]:
+    """uvicorn 서버를 별도 프로세스로 띄워 엔드포인트별 지연시간 측정"""
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=str(project_root), env=env,
+    )
+    try:
+        _wait_for_server(base_url)
+        return {
+            "/api/v1/recommend": asyncio.run(_drive_endpoint(
+                base_url, "/api/v1/recommend", total, concurrency, stream=False)),
+            "/api/v1/recommend/stream": asyncio.run(_drive_endpoint(
+                base_url, "/api/v1/recommend/stream", total, concurrency, stream=True)),
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ==================== 결과 비교 ====================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """p50/p95 변화율을 사람이 읽기 쉬운 줄 목록으로 반환"""
+    lines = []
+
+    def walk(cur: Dict[str, Any], base: Dict[str, Any], prefix: str):
+        for key, value in cur.items():
+            if not isinstance(value, dict) or key not in base:
+                continue
+            if "p50_ms" in value and "p50_ms" in base[key]:
+                for metric in ("p50_ms", "p95_ms"):
+                    old, new = base[key][metric], value[metric]
+                    change = (new - old) / old * 100 if old else 0.0
+                    lines.append(
+                        f"{prefix}{key} {metric}: {old:.1f} → {new:.1f} ({change:+.1f}%)")
+            else:
+                walk(value, base[key], f"{prefix}{key}.")
+
+    walk(current, baseline, "")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드투엔드 지연시간 벤치마크")
+    parser.add_argument("--sellers", type=int, default=200, help="판매자 수")
+    parser.add_argument("--products-per-seller", type=int, default=10)
+    parser.add_argument("--reviews-per-seller", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=10, help="노드 프로파일 반복 횟수")
+    parser.add_argument("--requests", type=int, default=20, help="엔드포인트별 HTTP 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="HTTP 동시 요청 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0,
+                        help="stub LLM 고정 지연 (ms)")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=80.0,
+                        help="stub LLM 출력 토큰 속도 (0이면 무제한)")
+    parser.add_argument("--port", type=int, default=8765, help="벤치마크 서버 포트")
+    parser.add_argument("--skip-http", action="store_true", help="HTTP 단계 생략")
+    parser.add_argument("--topologies", default="",
+                        help=f"비교할 토폴로지 (쉼표 구분: {', '.join(TOPOLOGIES)})")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    topologies = [name.strip() for name in args.topologies.split(",") if name.strip()]
+    unknown = [name for name in topologies if name not in TOPOLOGIES]
+    if unknown:
+        parser.error(f"알 수 없는 토폴로지: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    mock = MockLLMServer(latency_ms=args.llm_latency_ms,
+                         tokens_per_second=args.llm_tokens_per_second).start()
+
+    # 서버 모듈 import 전에 환경 변수 설정
+    env_overrides = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": mock.base_url,
+        "LLM_CACHE_MODE": "off",
+        "RATE_LIMIT_ENABLE_IP": "false",
+    }
+    os.environ.update(env_overrides)
+
+    from server.db.database import engine
+    from scripts.benchmark.seed import seed_catalogue
+
+    try:
+        seed_start = time.perf_counter()
+        counts = seed_catalogue(
+            engine,
+            sellers=args.sellers,
+            products_per_seller=args.products_per_seller,
+            reviews_per_seller=args.reviews_per_seller,
+        )
+        print(f"카탈로그 생성: {counts} ({time.perf_counter() - seed_start:.1f}s)")
+
+        report: Dict[str, Any] = {
+            "config": {k: v for k, v in vars(args).items()
+                       if k not in ("output", "baseline")},
+            "catalogue": counts,
+        }
+
+        report["in_process"] = profile_nodes(args.runs)
+
+        prompt_tokens: Dict[str, List[int]] = defaultdict(list)
+        for req in mock.stats.snapshot():
+            prompt_tokens[req["node"]].append(req["prompt_tokens"])
+        report["prompt_tokens"] = {
+            node: {"mean": round(float(np.mean(tokens)), 1), "max": int(max(tokens))}
+            for node, tokens in sorted(prompt_tokens.items())
+        }
+
+        if topologies:
+            report["topologies"] = compare_topologies(mock, args.runs, topologies)
+
+        if not args.skip_http:
+            report["http"] = run_http_load(
+                {**os.environ, **env_overrides}, args.port,
+                args.requests, args.concurrency)
+    finally:
+        mock.stop()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n=== 기준 결과 대비 ===")
+        for line in compare(report, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
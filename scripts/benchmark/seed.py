@@ -0,0 +1,136 @@
+"""
+벤치마크용 합성 카탈로그 생성
+판매자/상품/리뷰 규모를 지정하여 재현 가능한 데이터셋을 만든다.
+"""
+
+import random
+import zlib
+from typing import Dict
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from server.db.models import Base, Product, Seller, Review
+
+CATEGORIES = {
+    "모바일/태블릿": ["스마트폰", "태블릿", "스마트워치"],
+    "PC/노트북": ["노트북", "데스크탑", "모니터"],
+    "카메라/캠코더": ["DSLR", "미러리스", "액션캠"],
+    "가전제품": ["청소기", "공기청정기", "전자레인지"],
+}
+MODELS = {
+    "스마트폰": ["아이폰 14", "아이폰 13", "갤럭시 S23", "갤럭시 Z플립5"],
+    "태블릿": ["아이패드 에어", "아이패드 프로", "갤럭시탭 S9"],
+    "스마트워치": ["애플워치 8", "갤럭시워치 6"],
+    "노트북": ["맥북 에어 M2", "맥북 프로 14", "그램 16"],
+    "데스크탑": ["맥미니 M2", "게이밍 PC"],
+    "모니터": ["LG 울트라기어 27", "삼성 오디세이 G5"],
+    "DSLR": ["캐논 EOS 90D", "니콘 D7500"],
+    "미러리스": ["소니 A7M4", "후지 X-T5"],
+    "액션캠": ["고프로 11", "DJI 오즈모 액션3"],
+    "청소기": ["다이슨 V15", "LG 코드제로"],
+    "공기청정기": ["위닉스 타워", "삼성 블루스카이"],
+    "전자레인지": ["LG 전자레인지", "삼성 전자레인지"],
+}
+CONDITIONS = ["새상품", "거의새것", "중고", "사용감있음"]
+SELL_METHODS = ["직거래", "택배", "직거래, 택배"]
+REVIEW_SNIPPETS = [
+    "친절하고 빠른 거래 감사합니다",
+    "상태 좋아요 만족합니다",
+    "설명과 같고 깨끗해요",
+    "응답이 조금 늦었지만 괜찮았어요",
+    "정품 확인 완료, 안전하게 거래했습니다",
+    "포장이 꼼꼼했어요",
+    "다시는 거래 안 합니다 연락이 안 돼요",
+]
+
+
+def seed_catalogue(
+    engine: Engine,
+    sellers: int = 200,
+    products_per_seller: int = 10,
+    reviews_per_seller: int = 5,
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> Dict[str, int]:
+    """
+    합성 판매자/상품/리뷰 데이터를 일괄 삽입 (기존 데이터는 삭제)
+
+    Returns:
+        생성된 행 수
+    """
+    rng = random.Random(seed)
+    Base.metadata.drop_all(bind=engine, tables=[
+        Product.__table__, Seller.__table__, Review.__table__])
+    Base.metadata.create_all(bind=engine)
+
+    seller_rows = []
+    product_rows = []
+    review_rows = []
+    product_id = 1
+
+    for seller_id in range(1, sellers + 1):
+        category_top = rng.choice(list(CATEGORIES))
+        seller_rows.append({
+            "seller_id": seller_id,
+            "seller_name": f"판매자{seller_id}",
+            "seller_trust": rng.uniform(400, 600),
+            "seller_safe_sales": rng.randint(0, 50),
+            "seller_customs": rng.randint(0, 300),
+            "seller_items": rng.randint(1, 100),
+            "category_top": category_top,
+            "sell_method": rng.choice(SELL_METHODS),
+            "seller_view": rng.randint(0, 5000),
+            "seller_like": rng.randint(0, 500),
+            "seller_chat": rng.randint(0, 1000),
+        })
+
+        for _ in range(products_per_seller):
+            top = category_top if rng.random() < 0.8 else rng.choice(list(CATEGORIES))
+            mid = rng.choice(CATEGORIES[top])
+            model = rng.choice(MODELS[mid])
+            condition = rng.choice(CONDITIONS)
+            base_price = 200000 + (zlib.crc32(model.encode()) % 15) * 100000
+            product_rows.append({
+                "product_id": product_id,
+                "seller_id": seller_id,
+                "title": f"{model} {condition} 판매합니다",
+                "price": float(round(base_price * rng.uniform(0.5, 1.3), -3)),
+                "category": mid,
+                "category_top": top,
+                "condition": condition,
+                "location": rng.choice(["서울", "경기", "부산", "대구", "인천"]),
+                "description": f"{model} {condition}입니다. " + " ".join(
+                    rng.sample(REVIEW_SNIPPETS, 2)),
+                "view_count": rng.randint(0, 3000),
+                "like_count": rng.randint(0, 200),
+                "chat_count": rng.randint(0, 100),
+                "sell_method": rng.choice(SELL_METHODS),
+                "delivery_fee": rng.choice(["있음", "없음"]),
+                "is_safe": rng.choice(["사용", "미사용"]),
+            })
+            product_id += 1
+
+        for _ in range(reviews_per_seller):
+            review_rows.append({
+                "reviewer_id": str(rng.randint(1, max(1, sellers * 5))),
+                "review_role": "구매자",
+                "review_content": rng.choice(REVIEW_SNIPPETS),
+                "seller_id": seller_id,
+                "seller_name": f"판매자{seller_id}",
+            })
+
+    with engine.begin() as conn:
+        for table, rows in (
+            (Seller.__table__, seller_rows),
+            (Product.__table__, product_rows),
+            (Review.__table__, review_rows),
+        ):
+            for i in range(0, len(rows), batch_size):
+                conn.execute(insert(table), rows[i:i + batch_size])
+
+    return {
+        "sellers": len(seller_rows),
+        "products": len(product_rows),
+        "reviews": len(review_rows),
+    }
@@ -1,13 +1,22 @@
 """
 에이전트 평가 스크립트
 정답 데이터와 추천 결과를 비교하여 정확도 계산
+
+- 동시 실행(--concurrency)으로 여러 구매자를 병렬 평가
+- 진행 상황 파일(--progress-file)로 중단 후 이어서 실행
+- 추천 로그는 배치 단위로 일괄 저장
+- LLM 응답 record/replay 캐시(--llm-cache)로 랭킹 로직만 바꾼 경우 빠르게 재채점
 """
 
 import sys
 import os
+import json
+import math
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from sqlalchemy.orm import Session
 
 # 프로젝트 루트를 Python 경로에 추가
@@ -18,10 +27,13 @@ from server.db.database import SessionLocal
 from server.db.models import RecommendationLog, Review
 from server.workflow.graph import recommendation_workflow
 from server.workflow.state import RecommendationState
+from server.utils.llm_agent import configure_llm_cache
 from server.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_K_VALUES = (1, 3, 5, 10)
+
 
 def load_answer_data(csv_path: str = "answer_data.csv") -> pd.DataFrame:
     """정답 데이터 로드"""
@@ -37,28 +49,38 @@ def load_answer_data(csv_path: str = "answer_data.csv") -> pd.DataFrame:
     return df
 
 
-def get_buyer_info_from_reviews(db: Session, buyer_id: str) -> Optional[Dict[str, Any]]:
-    """Review 테이블에서 구매자 정보 조회"""
-    # reviewer_id로 리뷰 조회 (구매자 역할)
-    reviews = (
-        db.query(Review)
-        .filter(Review.reviewer_id == str(buyer_id))
-        .filter(Review.review_role == "구매자")
-        .limit(10)
-        .all()
-    )
-
-    if not reviews:
-        return None
-
-    # 구매자가 거래한 판매자들 수집
-    seller_ids = list(set([review.seller_id for review in reviews]))
+def load_buyer_infos(
+    db: Session, buyer_ids: Iterable[str], max_reviews: int = 10
+) -> Dict[str, Dict[str, Any]]:
+    """여러 구매자의 리뷰 정보를 한 번에 조회 (구매자당 최대 max_reviews개)"""
+    buyer_ids = list({str(b) for b in buyer_ids})
+    reviews_by_buyer: Dict[str, List[Review]] = {}
+
+    # SQLite 바인드 파라미터 제한을 피하기 위해 나눠서 조회
+    chunk_size = 500
+    for i in range(0, len(buyer_ids), chunk_size):
+        chunk = buyer_ids[i:i + chunk_size]
+        reviews = (
+            db.query(Review)
+            .filter(Review.reviewer_id.in_(chunk))
+            .filter(Review.review_role == "구매자")
+            .order_by(Review.id)
+            .all()
+        )
+        for review in reviews:
+            bucket = reviews_by_buyer.setdefault(review.reviewer_id, [])
+            if len(bucket) < max_reviews:
+                bucket.append(review)
 
     return {
-        "buyer_id": buyer_id,
-        "review_count": len(reviews),
-        "traded_seller_ids": seller_ids,
-        "sample_review": reviews[0].review_content if reviews else None,
+        buyer_id: {
+            "buyer_id": buyer_id,
+            "review_count": len(reviews),
+            # 구매자가 거래한 판매자들 수집
+            "traded_seller_ids": list(set([review.seller_id for review in reviews])),
+            "sample_review": reviews[0].review_content if reviews else None,
+        }
+        for buyer_id, reviews in reviews_by_buyer.items()
     }
 
 
@@ -88,9 +110,8 @@ def run_recommendation(
         initial_state: RecommendationState = {
             "user_input": user_input,
             "search_query": {},
-            "persona_classification": None,
-            "price_agent_recommendations": None,
-            "safety_agent_recommendations": None,
+            "product_agent_recommendations": None,
+            "reliability_agent_recommendations": None,
             "final_seller_recommendations": None,
             "final_item_scores": None,
             "ranking_explanation": "",
@@ -141,35 +162,90 @@ def evaluate_recommendation(
     }
 
 
-def save_recommendation_log(
-    db: Session,
+def build_recommendation_log(
     buyer_id: str,
     user_input: Dict[str, Any],
     recommended_sellers: List[Dict[str, Any]],
     ground_truth_seller_id: int,
     evaluation_result: Dict[str, Any],
-):
-    """추천 결과를 DB에 저장"""
-    recommended_seller_ids = evaluation_result["recommended_seller_ids"]
-
-    log = RecommendationLog(
+) -> RecommendationLog:
+    """추천 결과 로그 객체 생성"""
+    return RecommendationLog(
         buyer_id=buyer_id,
         user_input=user_input,
-        recommended_seller_ids=recommended_seller_ids,
+        recommended_seller_ids=evaluation_result["recommended_seller_ids"],
         recommended_sellers=recommended_sellers,
         ground_truth_seller_id=ground_truth_seller_id,
         is_correct=evaluation_result["is_correct"],
         rank=evaluation_result["rank"],
     )
 
-    db.add(log)
-    db.commit()
+
+# ==================== 랭킹 지표 ====================
+
+def compute_ranking_metrics(
+    ranks: List[Optional[int]], k_values: Iterable[int] = DEFAULT_K_VALUES
+) -> Dict[str, Any]:
+    """
+    정답 판매자 순위 리스트로 Hit@K / MRR / NDCG@K 계산
+    (구매자당 정답 1개, 순위가 없으면 추천 실패)
+    """
+    total = len(ranks)
+    metrics: Dict[str, Any] = {}
+    if total == 0:
+        return metrics
+
+    for k in k_values:
+        hits = [r for r in ranks if r is not None and r <= k]
+        metrics[f"hit@{k}"] = len(hits) / total
+        # 정답이 하나뿐이므로 IDCG = 1
+        metrics[f"ndcg@{k}"] = sum(1.0 / math.log2(r + 1) for r in hits) / total
+
+    metrics["mrr"] = sum(1.0 / r for r in ranks if r is not None) / total
+    return metrics
+
+
+# ==================== 진행 상황 (재개용) ====================
+
+class ProgressStore:
+    """완료된 평가 케이스를 JSONL로 기록 (중단 후 재개용)"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not self.path.exists():
+            return {}
+        done: Dict[str, Dict[str, Any]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 중단 시점에 잘린 마지막 줄
+                done[str(record["buyer_id"])] = record
+        return done
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
 
 
 def evaluate_all(
     answer_data_path: str = "answer_data.csv",
     limit: Optional[int] = None,
     save_logs: bool = True,
+    concurrency: int = 4,
+    progress_file: Optional[str] = None,
+    log_batch_size: int = 100,
+    k_values: Iterable[int] = DEFAULT_K_VALUES,
 ) -> Dict[str, Any]:
     """전체 평가 실행"""
     # 정답 데이터 로드
@@ -179,82 +255,155 @@ def evaluate_all(
         answer_df = answer_df.head(limit)
         logger.info(f"평가 제한: {limit}개만 평가")
 
-    # 워크플로우 초기화
+    cases = [
+        (str(row["buyer"]), int(row["seller"]))
+        for _, row in answer_df.iterrows()
+    ]
+
+    # 이전 실행에서 완료된 케이스는 건너뜀
+    progress = ProgressStore(progress_file)
+    completed = progress.load()
+    pending = [case for case in cases if case[0] not in completed]
+    if completed:
+        logger.info(f"이전 진행 상황 로드: {len(completed)}개 완료, {len(pending)}개 남음")
+
+    # 워크플로우 초기화 (컴파일된 그래프는 스레드 간 공유 가능)
     workflow_app = recommendation_workflow()
 
     # DB 연결
     db: Session = SessionLocal()
+    pending_logs: List[RecommendationLog] = []
+    skipped_count = 0
+
+    def flush_logs():
+        if pending_logs:
+            db.add_all(pending_logs)
+            db.commit()
+            pending_logs.clear()
+
+    def evaluate_case(buyer_id: str, ground_truth_seller_id: int, buyer_info: Dict[str, Any]):
+        # 사용자 입력 생성
+        user_input = create_user_input_from_buyer(buyer_info)
+
+        # 추천 실행
+        recommended_sellers = run_recommendation(user_input, workflow_app)
+        if not recommended_sellers:
+            return user_input, None, None
+
+        # 평가
+        evaluation_result = evaluate_recommendation(
+            recommended_sellers, ground_truth_seller_id
+        )
+        return user_input, recommended_sellers, evaluation_result
+
+    def record_result(future, futures, handled):
+        nonlocal skipped_count
+        handled.add(future)
+        buyer_id, ground_truth_seller_id = futures[future]
+        try:
+            user_input, recommended_sellers, evaluation_result = future.result()
+        except Exception:
+            # 한 케이스의 오류로 전체 실행이 중단되지 않도록 건너뜀 (다음 실행에서 재시도)
+            logger.exception(f"구매자 {buyer_id} 평가 중 오류")
+            skipped_count += 1
+            return
+
+        if evaluation_result is None:
+            logger.warning(f"구매자 {buyer_id}에 대한 추천 실패")
+            skipped_count += 1
+            return
+
+        # 결과 저장 (배치 단위)
+        if save_logs:
+            pending_logs.append(build_recommendation_log(
+                buyer_id,
+                user_input,
+                recommended_sellers,
+                ground_truth_seller_id,
+                evaluation_result,
+            ))
+            if len(pending_logs) >= log_batch_size:
+                flush_logs()
+
+        record = {
+            "buyer_id": buyer_id,
+            "ground_truth_seller_id": ground_truth_seller_id,
+            "recommended_seller_ids": evaluation_result["recommended_seller_ids"],
+            "rank": evaluation_result["rank"],
+        }
+        progress.append(record)
+        completed[buyer_id] = record
 
-    # 평가 결과
-    total_count = 0
-    correct_count = 0
-    rank_sum = 0
-    rank_counts = {}  # {rank: count}
+        logger.info(
+            f"[{len(handled)}/{len(futures)}] 구매자 {buyer_id}: "
+            f"{'✅ 정답' if evaluation_result['is_correct'] else '❌ 오답'} "
+            f"(순위: {evaluation_result['rank'] if evaluation_result['rank'] else 'N/A'})"
+        )
 
     try:
-        for idx, row in answer_df.iterrows():
-            buyer_id = str(row["buyer"])
-            ground_truth_seller_id = int(row["seller"])
-
-            logger.info(f"[{idx + 1}/{len(answer_df)}] 구매자 {buyer_id} 평가 중...")
-
-            # 구매자 정보 조회
-            buyer_info = get_buyer_info_from_reviews(db, buyer_id)
-            if not buyer_info:
-                logger.warning(f"구매자 {buyer_id}의 리뷰 정보를 찾을 수 없습니다.")
-                continue
-
-            # 사용자 입력 생성
-            user_input = create_user_input_from_buyer(buyer_info)
-
-            # 추천 실행
-            recommended_sellers = run_recommendation(user_input, workflow_app)
-            if not recommended_sellers:
-                logger.warning(f"구매자 {buyer_id}에 대한 추천 실패")
-                continue
-
-            # 평가
-            evaluation_result = evaluate_recommendation(
-                recommended_sellers, ground_truth_seller_id
-            )
-
-            # 결과 저장
-            if save_logs:
-                save_recommendation_log(
-                    db,
-                    buyer_id,
-                    user_input,
-                    recommended_sellers,
-                    ground_truth_seller_id,
-                    evaluation_result,
-                )
-
-            # 통계 업데이트
-            total_count += 1
-            if evaluation_result["is_correct"]:
-                correct_count += 1
-                rank = evaluation_result["rank"]
-                rank_sum += rank
-                rank_counts[rank] = rank_counts.get(rank, 0) + 1
-
-            logger.info(
-                f"구매자 {buyer_id}: {'✅ 정답' if evaluation_result['is_correct'] else '❌ 오답'} "
-                f"(순위: {evaluation_result['rank'] if evaluation_result['rank'] else 'N/A'})"
-            )
+        # 구매자 정보 일괄 조회
+        buyer_infos = load_buyer_infos(db, [buyer_id for buyer_id, _ in pending])
+        # 읽기 트랜잭션 종료: 평가 동안 DB 연결(SQLite는 단일 writer)을 점유하지 않도록 반환
+        db.commit()
+
+        # Ctrl-C 시 대기 중인 케이스를 기다리지 않고 취소하도록 with 블록 대신 직접 종료
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        futures = {}
+        handled = set()
+        try:
+            for buyer_id, ground_truth_seller_id in pending:
+                buyer_info = buyer_infos.get(buyer_id)
+                if not buyer_info:
+                    logger.warning(f"구매자 {buyer_id}의 리뷰 정보를 찾을 수 없습니다.")
+                    skipped_count += 1
+                    continue
+                future = executor.submit(
+                    evaluate_case, buyer_id, ground_truth_seller_id, buyer_info)
+                futures[future] = (buyer_id, ground_truth_seller_id)
+
+            for future in as_completed(futures):
+                record_result(future, futures, handled)
+        except KeyboardInterrupt:
+            logger.warning("평가 중단: 대기 중인 케이스 취소")
+            executor.shutdown(wait=False, cancel_futures=True)
+            # 이미 끝났지만 아직 반영하지 않은 결과는 버리지 않고 기록
+            for future in futures:
+                if future.done() and not future.cancelled() and future not in handled:
+                    record_result(future, futures, handled)
+            raise
+        else:
+            executor.shutdown(wait=True)
 
     finally:
-        db.close()
-
-    # 최종 결과 계산
-    accuracy = correct_count / total_count if total_count > 0 else 0.0
-    mean_rank = rank_sum / correct_count if correct_count > 0 else None
+        # 중단(예외, Ctrl-C) 시에도 진행 상황에 기록된 케이스의 로그를 남김
+        # (다음 실행은 완료된 케이스를 건너뛰므로 여기서 쓰지 않으면 로그가 누락됨)
+        try:
+            flush_logs()
+        except Exception:
+            logger.exception("추천 로그 저장 실패")
+            db.rollback()
+        finally:
+            db.close()
+
+    # 최종 결과 계산 (이전 실행분 포함)
+    case_ids = {buyer_id for buyer_id, _ in cases}
+    ranks = [record["rank"] for buyer_id, record in completed.items() if buyer_id in case_ids]
+
+    total_count = len(ranks)
+    correct_ranks = [r for r in ranks if r is not None]
+    correct_count = len(correct_ranks)
+    rank_counts: Dict[int, int] = {}
+    for rank in correct_ranks:
+        rank_counts[rank] = rank_counts.get(rank, 0) + 1
 
     results = {
         "total_count": total_count,
         "correct_count": correct_count,
-        "accuracy": accuracy,
-        "mean_rank": mean_rank,
+        "skipped_count": skipped_count,
+        "accuracy": correct_count / total_count if total_count > 0 else 0.0,
+        "mean_rank": sum(correct_ranks) / correct_count if correct_count > 0 else None,
         "rank_distribution": rank_counts,
+        "metrics": compute_ranking_metrics(ranks, k_values),
     }
 
     return results
@@ -270,6 +419,10 @@ def print_evaluation_results(results: Dict[str, Any]):
     print(f"정확도: {results['accuracy']:.2%}")
     if results["mean_rank"]:
         print(f"평균 순위: {results['mean_rank']:.2f}")
+    if results.get("metrics"):
+        print("\n랭킹 지표:")
+        for name, value in results["metrics"].items():
+            print(f"  {name}: {value:.4f}")
     print("\n순위 분포:")
     for rank in sorted(results["rank_distribution"].keys()):
         count = results["rank_distribution"][rank]
@@ -295,16 +448,51 @@ if __name__ == "__main__":
         action="store_true",
         help="추천 로그를 DB에 저장하지 않음",
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="동시에 평가할 케이스 수"
+    )
+    parser.add_argument(
+        "--progress-file",
+        type=str,
+        default=None,
+        help="진행 상황 JSONL 파일 (지정 시 완료된 케이스는 건너뛰고 이어서 실행)",
+    )
+    parser.add_argument(
+        "--log-batch-size", type=int, default=100, help="추천 로그 일괄 저장 단위"
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=["off", "record", "replay"],
+        default=os.getenv("LLM_CACHE_MODE", "off"),
+        help="LLM 응답 캐시 모드 (record: 호출 결과 저장, replay: 저장된 응답만 사용)",
+    )
+    parser.add_argument(
+        "--llm-cache-dir",
+        type=str,
+        default=os.getenv("LLM_CACHE_DIR", ".llm_cache"),
+        help="LLM 응답 캐시 디렉토리",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="평가 결과 JSON 저장 경로"
+    )
 
     args = parser.parse_args()
 
+    configure_llm_cache(args.llm_cache, args.llm_cache_dir)
+
     # 평가 실행
     results = evaluate_all(
         answer_data_path=args.answer_data,
         limit=args.limit,
         save_logs=not args.no_save,
+        concurrency=args.concurrency,
+        progress_file=args.progress_file,
+        log_batch_size=args.log_batch_size,
     )
 
     # 결과 출력
     print_evaluation_results(results)
 
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
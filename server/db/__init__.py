@@ -8,6 +8,7 @@ from .models import (
     History,
     Product,
     Seller,
+    SellerPersona,
     Review,
     Conversation,
     Message,
@@ -21,6 +22,7 @@ __all__ = [
     "History",
     "Product",
     "Seller",
+    "SellerPersona",
     "Review",
     "Conversation",
     "Message",
@@ -0,0 +1,612 @@
+"""
+컬럼형 인메모리 카탈로그 스냅샷
+상품/판매자 테이블을 NumPy 배열로 적재하여 get_sellers_with_products의
+필터링 / view_count 정렬 / 판매자 그룹화를 ORM 없이 벡터 연산으로 처리한다.
+
+- 범주형 문자열(카테고리, 상태, 거래 방식 등)은 intern 문자열 테이블의 정수 코드로 저장
+- 키워드 검색은 소문자 "제목\\n설명" 텍스트를 행 구분자(\\x00)로 이어 붙인 바이트 열에서 수행
+- 응답의 제목/설명은 최종 상위 limit개만 DB에서 PK로 조회 (DB가 원본)
+- 주기적으로 새 상품(product_id 증가분)만 추가 적재하고, 가끔 전체를 다시 적재하여
+  수정/삭제를 반영
+
+CATALOG_SNAPSHOT_DIR을 지정하면 스냅샷을 버전별 디렉토리(.npy 컬럼 파일)로 디스크에 게시하고
+모든 uvicorn 워커가 mmap으로 열어 물리 페이지를 공유한다.
+    <dir>/<version>/manifest.json, products.*.npy, sellers.*.npy, search_data.bin ...
+    <dir>/CURRENT  ← 현재 버전 이름 (os.replace로 원자적 교체)
+워커는 DB를 읽지 않고 CURRENT만 주기적으로 확인하여 새 버전으로 교체하며,
+게시는 마이그레이션 또는 `python -m server.db.catalog_snapshot publish` 작업이 담당한다.
+"""
+
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from server.db.database import ReadSessionLocal
+from server.db.models import Product, Seller
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "false").lower() == "true"
+CATALOG_REFRESH_INTERVAL_SECONDS = float(os.getenv("CATALOG_REFRESH_INTERVAL_SECONDS", "60"))
+CATALOG_FULL_REFRESH_SECONDS = float(os.getenv("CATALOG_FULL_REFRESH_SECONDS", "3600"))
+# 디스크 스냅샷 디렉토리 (비어 있으면 워커별 인메모리 적재)
+CATALOG_SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR", "")
+CATALOG_SNAPSHOT_KEEP = int(os.getenv("CATALOG_SNAPSHOT_KEEP", "3"))
+
+# 정수 코드로 저장하는 범주형 상품 컬럼
+CODE_COLUMNS = ("category", "category_top", "condition", "sell_method", "delivery_fee", "is_safe")
+COUNT_COLUMNS = ("view_count", "like_count", "chat_count")
+
+_PRODUCT_COLUMNS = (
+    Product.product_id, Product.seller_id, Product.price,
+    *(getattr(Product, name) for name in CODE_COLUMNS),
+    *(getattr(Product, name) for name in COUNT_COLUMNS),
+    Product.title, Product.description,
+)
+_SELLER_COLUMNS = (
+    Seller.seller_id, Seller.seller_name, Seller.seller_trust,
+    Seller.seller_safe_sales, Seller.seller_customs,
+)
+_FETCH_BATCH = 10000
+
+_ROW_SEP = b"\x00"
+
+
+class StringTable:
+    """문자열 intern 테이블 (코드 0은 None)"""
+
+    def __init__(self, values: Sequence[Optional[str]] = (None,)):
+        self.values: List[Optional[str]] = list(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value: Optional[str]) -> int:
+        """문자열 → 코드 (없으면 새로 추가)"""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> int:
+        """조회 전용 (없으면 -1)"""
+        return self._codes.get(value, -1)
+
+    def encode(self, values: Iterable[Optional[str]]) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32)
+
+    def copy(self) -> "StringTable":
+        return StringTable(self.values)
+
+
+def _search_text(title: Optional[str], description: Optional[str]) -> bytes:
+    return f"{title or ''}\n{description or ''}".lower().replace("\x00", " ").encode()
+
+
+def _int_array(values: Sequence[Optional[int]]) -> np.ndarray:
+    return np.fromiter((v or 0 for v in values), dtype=np.int64, count=len(values))
+
+
+def _float_array(values: Sequence[Optional[float]], default: float = np.nan) -> np.ndarray:
+    return np.fromiter(
+        (default if v is None else v for v in values), dtype=np.float64, count=len(values))
+
+
+class ColumnarCatalog:
+    """
+    상품/판매자 컬럼 배열 스냅샷 (불변, 갱신 시 새 인스턴스로 교체)
+
+    columns: 상품 컬럼 (product_id 오름차순)
+    sellers: 판매자 컬럼 (seller_id 오름차순)
+    search_data / search_offsets: 행 i의 검색 텍스트 = search_data[offsets[i]:offsets[i+1]-1]
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        sellers: Dict[str, np.ndarray],
+        strings: StringTable,
+        search_data: Any,
+        search_offsets: np.ndarray,
+        seller_row: Optional[np.ndarray] = None,
+        built_at: Optional[float] = None,
+    ):
+        self.columns = columns
+        self.sellers = sellers
+        self.strings = strings
+        self.search_data = search_data
+        self.search_offsets = search_offsets
+        # 마지막 전체 적재 시각 (증분 갱신은 유지)
+        self.built_at = time.time() if built_at is None else built_at
+        if seller_row is None:
+            seller_row = self._match_sellers(columns["seller_id"], sellers["seller_id"])
+        # 상품 → 판매자 행 (판매자가 없는 상품은 -1, inner join과 동일하게 제외)
+        self.seller_row = seller_row
+
+    @staticmethod
+    def _match_sellers(product_seller_ids: np.ndarray, seller_ids: np.ndarray) -> np.ndarray:
+        pos = np.searchsorted(seller_ids, product_seller_ids)
+        pos = np.minimum(pos, max(len(seller_ids) - 1, 0))
+        matched = len(seller_ids) > 0 and seller_ids[pos] == product_seller_ids
+        return np.where(matched, pos, -1).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.columns["product_id"])
+
+    @property
+    def max_product_id(self) -> int:
+        ids = self.columns["product_id"]
+        return int(ids[-1]) if len(ids) else 0
+
+    # -------------------- 적재 --------------------
+
+    @classmethod
+    def build(
+        cls,
+        product_rows: Sequence[Sequence[Any]],
+        seller_rows: Sequence[Sequence[Any]],
+        strings: Optional[StringTable] = None,
+    ) -> "ColumnarCatalog":
+        """_PRODUCT_COLUMNS / _SELLER_COLUMNS 순서의 행으로 스냅샷 생성"""
+        strings = strings or StringTable()
+        columns, search_data, search_offsets = cls._product_columns(product_rows, strings)
+        return cls(columns, cls._seller_columns(seller_rows, strings), strings,
+                   search_data, search_offsets)
+
+    @staticmethod
+    def _product_columns(rows: Sequence[Sequence[Any]], strings: StringTable):
+        n_fields = 3 + len(CODE_COLUMNS) + len(COUNT_COLUMNS) + 2
+        fields = list(zip(*rows)) if rows else [()] * n_fields
+        product_id, seller_id, price = fields[0], fields[1], fields[2]
+        codes = fields[3:3 + len(CODE_COLUMNS)]
+        counts = fields[3 + len(CODE_COLUMNS):3 + len(CODE_COLUMNS) + len(COUNT_COLUMNS)]
+        titles, descriptions = fields[-2], fields[-1]
+
+        columns = {
+            "product_id": _int_array(product_id),
+            "seller_id": _int_array(seller_id),
+            "price": _float_array(price),
+        }
+        for name, values in zip(CODE_COLUMNS, codes):
+            columns[name] = strings.encode(values)
+        for name, values in zip(COUNT_COLUMNS, counts):
+            columns[name] = _int_array(values)
+
+        texts = [_search_text(t, d) + _ROW_SEP for t, d in zip(titles, descriptions)]
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+        return columns, b"".join(texts), offsets
+
+    @staticmethod
+    def _seller_columns(rows: Sequence[Sequence[Any]], strings: StringTable):
+        rows = sorted(rows, key=lambda row: row[0])
+        fields = list(zip(*rows)) if rows else [()] * 5
+        return {
+            "seller_id": _int_array(fields[0]),
+            "seller_name": strings.encode(fields[1]),
+            "seller_trust": _float_array(fields[2], default=0.0),
+            "seller_safe_sales": _int_array(fields[3]),
+            "seller_customs": _int_array(fields[4]),
+        }
+
+    def append(
+        self,
+        product_rows: Sequence[Sequence[Any]],
+        seller_rows: Sequence[Sequence[Any]],
+    ) -> "ColumnarCatalog":
+        """새 상품 행을 뒤에 붙이고 판매자 컬럼을 교체한 새 스냅샷"""
+        strings = self.strings.copy()
+        if not product_rows:
+            return ColumnarCatalog(
+                self.columns, self._seller_columns(seller_rows, strings), strings,
+                self.search_data, self.search_offsets, built_at=self.built_at)
+        new_columns, new_data, new_offsets = self._product_columns(product_rows, strings)
+        columns = {
+            name: np.concatenate([self.columns[name], values])
+            for name, values in new_columns.items()
+        }
+        offsets = np.concatenate(
+            [self.search_offsets, self.search_offsets[-1] + new_offsets[1:]])
+        return ColumnarCatalog(
+            columns, self._seller_columns(seller_rows, strings), strings,
+            bytes(self.search_data) + new_data, offsets, built_at=self.built_at)
+
+    # -------------------- 조회 --------------------
+
+    def _keyword_rows(self, keyword: str) -> np.ndarray:
+        """키워드가 포함된 행 번호 (바이트 열 전체 검색 후 위치 → 행 변환)"""
+        pattern = re.compile(re.escape(keyword.lower().encode()))
+        positions = np.fromiter(
+            (m.start() for m in pattern.finditer(self.search_data)), dtype=np.int64)
+        return np.unique(np.searchsorted(self.search_offsets, positions, side="right") - 1)
+
+    def filter(
+        self,
+        search_query: Optional[str] = None,
+        category: Optional[str] = None,
+        category_top: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        condition: Optional[str] = None,
+        seller_ids: Optional[Sequence[int]] = None,
+        sell_method: Optional[str] = None,
+        delivery_fee: Optional[str] = None,
+        is_safe: Optional[str] = None,
+    ) -> np.ndarray:
+        """조건에 맞는 상품 행 마스크 (product_service._product_filters와 같은 의미)"""
+        mask = self.seller_row >= 0
+        if seller_ids is not None:
+            mask &= np.isin(self.columns["seller_id"], np.asarray(seller_ids, dtype=np.int64))
+
+        for name, value in (("category", category), ("category_top", category_top),
+                            ("condition", condition), ("delivery_fee", delivery_fee),
+                            ("is_safe", is_safe)):
+            if value:
+                mask &= self.columns[name] == self.strings.lookup(value)
+
+        if sell_method:
+            # 포함 여부 ("직거래, 택배"도 "택배"에 해당)
+            codes = [code for code, value in enumerate(self.strings.values)
+                     if value and sell_method in value]
+            mask &= np.isin(self.columns["sell_method"], codes)
+
+        price = self.columns["price"]
+        if price_min is not None:
+            mask &= price >= price_min
+        if price_max is not None:
+            mask &= price <= price_max
+
+        if search_query:
+            keywords = search_query.split() or [search_query]
+            for keyword in keywords:
+                if not mask.any():
+                    break
+                keyword_mask = np.zeros(len(self), dtype=bool)
+                keyword_mask[self._keyword_rows(keyword)] = True
+                mask &= keyword_mask
+        return mask
+
+    def top_rows(self, mask: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+        """조회수 내림차순 상위 limit개 행 (동률은 product_id 순, limit=None이면 전체)"""
+        rows = np.flatnonzero(mask)
+        if limit is not None and len(rows) > limit:
+            views = self.columns["view_count"][rows]
+            kth = len(rows) - limit
+            rows = rows[np.argpartition(views, kth)[kth:]]
+        order = np.lexsort((rows, -self.columns["view_count"][rows]))
+        return rows[order]
+
+    def limit_per_seller(self, rows: np.ndarray, limit: int) -> np.ndarray:
+        """정렬된 행에서 판매자별 앞쪽 limit개만 남김 (순서 유지)"""
+        seller_ids = self.columns["seller_id"][rows]
+        order = np.argsort(seller_ids, kind="stable")
+        sorted_ids = seller_ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        sizes = np.diff(np.r_[starts, len(rows)])
+        rank = np.arange(len(rows)) - np.repeat(starts, sizes)
+        keep = np.empty(len(rows), dtype=bool)
+        keep[order] = rank < limit
+        return rows[keep]
+
+    def group_by_seller(
+        self, rows: np.ndarray, texts: Dict[int, Sequence[Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        행 → 판매자별로 그룹화된 상품 리스트 (product_service._group_by_seller와 같은 형식)
+
+        Args:
+            rows: 정렬된 상품 행 번호
+            texts: product_id → (title, description)
+        """
+        decode = self.strings.values
+        cols = {name: values[rows].tolist() for name, values in self.columns.items()}
+        seller_rows = self.seller_row[rows].tolist()
+        sellers = self.sellers
+        sellers_dict: Dict[int, Dict[str, Any]] = {}
+
+        for i, seller_row in enumerate(seller_rows):
+            seller_id = cols["seller_id"][i]
+            entry = sellers_dict.get(seller_id)
+            if entry is None:
+                entry = sellers_dict[seller_id] = {
+                    "seller_id": seller_id,
+                    "seller_name": decode[sellers["seller_name"][seller_row]],
+                    "seller_trust": float(sellers["seller_trust"][seller_row]),
+                    "seller_safe_sales": int(sellers["seller_safe_sales"][seller_row]),
+                    "seller_customs": int(sellers["seller_customs"][seller_row]),
+                    "products": [],
+                }
+
+            product_id = cols["product_id"][i]
+            price = cols["price"][i]
+            title, description = texts.get(product_id, (None, None))
+            entry["products"].append({
+                "product_id": product_id,
+                "title": title,
+                "price": None if price != price else price,
+                "category": decode[cols["category"][i]],
+                "category_top": decode[cols["category_top"][i]],
+                "condition": decode[cols["condition"][i]],
+                "description": description,
+                "view_count": cols["view_count"][i],
+                "like_count": cols["like_count"][i],
+                "chat_count": cols["chat_count"][i],
+                "sell_method": decode[cols["sell_method"][i]],
+                "delivery_fee": decode[cols["delivery_fee"][i]],
+                "is_safe": decode[cols["is_safe"][i]],
+            })
+
+        return list(sellers_dict.values())
+
+
+def product_texts_stmt(product_ids: Sequence[int]):
+    """응답에 필요한 상품 텍스트만 PK로 조회 (Core select)"""
+    return select(Product.product_id, Product.title, Product.description).where(
+        Product.product_id.in_(product_ids))
+
+
+# ==================== 디스크 스냅샷 (mmap) ====================
+
+_CURRENT_FILE = "CURRENT"
+_MANIFEST_FILE = "manifest.json"
+
+
+def _mmap_file(path: Path) -> Any:
+    """읽기 전용 mmap (빈 파일은 mmap할 수 없으므로 b"")"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _load_array(path: Path) -> np.ndarray:
+    array = np.load(path, mmap_mode="r")
+    return array if array.size else np.array(array)
+
+
+def write_snapshot(catalog: ColumnarCatalog, directory: str) -> str:
+    """
+    스냅샷을 새 버전 디렉토리로 기록하고 CURRENT를 원자적으로 교체
+
+    Returns:
+        게시한 버전 이름
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    version = f"v{int(time.time() * 1000)}-{os.getpid()}"
+
+    # 임시 디렉토리에 모두 기록한 뒤 rename → 워커가 절반만 쓰인 버전을 볼 수 없음
+    tmp = root / f".tmp-{version}"
+    tmp.mkdir()
+    for name, values in catalog.columns.items():
+        np.save(tmp / f"products.{name}.npy", values)
+    for name, values in catalog.sellers.items():
+        np.save(tmp / f"sellers.{name}.npy", values)
+    np.save(tmp / "seller_row.npy", catalog.seller_row)
+    np.save(tmp / "search_offsets.npy", catalog.search_offsets)
+    (tmp / "search_data.bin").write_bytes(catalog.search_data)
+    (tmp / "strings.json").write_text(
+        json.dumps(catalog.strings.values, ensure_ascii=False), encoding="utf-8")
+    (tmp / _MANIFEST_FILE).write_text(json.dumps({
+        "version": version,
+        "created_at": time.time(),
+        "built_at": catalog.built_at,
+        "products": len(catalog),
+        "sellers": len(catalog.sellers["seller_id"]),
+        "max_product_id": catalog.max_product_id,
+        "product_columns": list(catalog.columns),
+        "seller_columns": list(catalog.sellers),
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, root / version)
+
+    current_tmp = root / f".{_CURRENT_FILE}.{os.getpid()}"
+    with open(current_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(current_tmp, root / _CURRENT_FILE)
+
+    _prune_snapshots(root, keep=CATALOG_SNAPSHOT_KEEP, current=version)
+    return version
+
+
+def _prune_snapshots(root: Path, keep: int, current: str) -> None:
+    """오래된 버전 삭제 (이미 mmap한 워커는 unmap 전까지 계속 읽을 수 있음)"""
+    versions = sorted(p.name for p in root.iterdir() if p.is_dir() and p.name.startswith("v"))
+    for name in versions[:-keep] if keep > 0 else []:
+        if name != current:
+            shutil.rmtree(root / name, ignore_errors=True)
+
+
+def current_version(directory: str) -> Optional[str]:
+    """게시된 현재 버전 이름 (없으면 None)"""
+    try:
+        return (Path(directory) / _CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def read_snapshot(directory: str, version: str) -> ColumnarCatalog:
+    """버전 디렉토리를 mmap으로 열어 스냅샷 생성 (배열은 읽기 전용, 복사 없음)"""
+    path = Path(directory) / version
+    manifest = json.loads((path / _MANIFEST_FILE).read_text(encoding="utf-8"))
+    columns = {
+        name: _load_array(path / f"products.{name}.npy") for name in manifest["product_columns"]
+    }
+    sellers = {
+        name: _load_array(path / f"sellers.{name}.npy") for name in manifest["seller_columns"]
+    }
+    strings = StringTable(json.loads((path / "strings.json").read_text(encoding="utf-8")))
+    return ColumnarCatalog(
+        columns, sellers, strings,
+        _mmap_file(path / "search_data.bin"),
+        _load_array(path / "search_offsets.npy"),
+        seller_row=_load_array(path / "seller_row.npy"),
+        built_at=manifest["built_at"],
+    )
+
+
+@contextmanager
+def _publish_lock(directory: str) -> Iterator[None]:
+    """여러 워커가 동시에 시작할 때 한 워커만 최초 스냅샷을 게시하도록 잠금 (POSIX)"""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(Path(directory) / ".lock", "w") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class CatalogStore:
+    """현재 카탈로그 스냅샷 보관 및 백그라운드 갱신"""
+
+    def __init__(
+        self,
+        refresh_interval: float = CATALOG_REFRESH_INTERVAL_SECONDS,
+        full_refresh_interval: float = CATALOG_FULL_REFRESH_SECONDS,
+        snapshot_dir: str = CATALOG_SNAPSHOT_DIR,
+    ):
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.snapshot_dir = snapshot_dir
+        self.current: Optional[ColumnarCatalog] = None
+        self.version: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _fetch(stmt) -> List[Sequence[Any]]:
+        db = ReadSessionLocal()
+        try:
+            rows: List[Sequence[Any]] = []
+            result = db.execute(stmt.execution_options(yield_per=_FETCH_BATCH))
+            for partition in result.partitions():
+                rows.extend(tuple(row) for row in partition)
+            return rows
+        finally:
+            db.close()
+
+    def build(self, base: Optional[ColumnarCatalog] = None) -> ColumnarCatalog:
+        """
+        DB에서 스냅샷 생성
+
+        Args:
+            base: 이전 스냅샷 (주면 새 상품만 추가, full_refresh_interval이 지났으면 무시)
+        """
+        start = time.perf_counter()
+        sellers = self._fetch(select(*_SELLER_COLUMNS))
+        if base is not None and time.time() - base.built_at < self.full_refresh_interval:
+            new_rows = self._fetch(
+                select(*_PRODUCT_COLUMNS)
+                .where(Product.product_id > base.max_product_id)
+                .order_by(Product.product_id))
+            if new_rows:
+                logger.info(f"카탈로그 스냅샷 증분 갱신: 상품 {len(new_rows)}개 추가")
+            return base.append(new_rows, sellers)
+
+        catalog = ColumnarCatalog.build(
+            self._fetch(select(*_PRODUCT_COLUMNS).order_by(Product.product_id)), sellers)
+        logger.info(
+            f"카탈로그 스냅샷 적재 완료: 상품 {len(catalog)}개, "
+            f"판매자 {len(catalog.sellers['seller_id'])}명 ({time.perf_counter() - start:.2f}s)")
+        return catalog
+
+    def load(self) -> ColumnarCatalog:
+        """전체 적재"""
+        self.current = self.build()
+        return self.current
+
+    def refresh(self) -> ColumnarCatalog:
+        """새 상품만 추가 적재 (full_refresh_interval이 지났으면 전체 적재)"""
+        self.current = self.build(self.current)
+        return self.current
+
+    # -------------------- 디스크 스냅샷 --------------------
+
+    def publish(self, full: bool = False) -> str:
+        """
+        게시된 현재 버전을 기준으로 증분(또는 전체) 스냅샷을 만들어 새 버전으로 게시
+        (마이그레이션 / 갱신 작업에서 호출)
+        """
+        version = current_version(self.snapshot_dir)
+        base = None
+        if version and not full:
+            base = read_snapshot(self.snapshot_dir, version)
+        version = write_snapshot(self.build(base), self.snapshot_dir)
+        logger.info(f"카탈로그 스냅샷 게시: {version}")
+        return version
+
+    def open_published(self) -> bool:
+        """CURRENT가 가리키는 버전이 바뀌었으면 mmap으로 열어 교체"""
+        version = current_version(self.snapshot_dir)
+        if version is None or version == self.version:
+            return False
+        self.current = read_snapshot(self.snapshot_dir, version)
+        self.version = version
+        logger.info(f"카탈로그 스냅샷 {version} 사용 (상품 {len(self.current)}개)")
+        return True
+
+    def start(self) -> None:
+        """
+        스냅샷 적재 후 주기적 갱신 스레드 시작
+        디스크 모드에서는 게시된 버전을 열고, 아직 없으면 한 워커만 게시
+        """
+        if self._thread is not None:
+            return
+        if self.snapshot_dir:
+            if not self.open_published():
+                with _publish_lock(self.snapshot_dir):
+                    if current_version(self.snapshot_dir) is None:
+                        self.publish(full=True)
+                self.open_published()
+        else:
+            self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                if self.snapshot_dir:
+                    self.open_published()
+                else:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"카탈로그 스냅샷 갱신 실패: {e}")
+
+
+catalog_store = CatalogStore()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "publish" or not CATALOG_SNAPSHOT_DIR:
+        print("사용법: CATALOG_SNAPSHOT_DIR=<dir> python -m server.db.catalog_snapshot publish [--full]")
+        print("      이전 버전에 새 상품만 추가하여 게시 (--full: DB에서 전체 재생성)")
+        sys.exit(1)
+
+    catalog_store.publish(full="--full" in sys.argv)
@@ -1,12 +1,118 @@
 """
 대화 세션 및 메시지 관리 서비스
+*_async 함수는 이벤트 루프에서 호출하는 비동기 버전
 """
 
+import asyncio
+import os
+import threading
+import time
 import uuid
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict, deque
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from server.db.models import Conversation, Message
-from server.db.database import SessionLocal
+from sqlalchemy import select
+from server.db.database import AsyncSessionLocal, SessionLocal
+from server.db.write_behind import write_behind
+
+# 세션별 최근 메시지 캐시 (hot 세션은 DB 조회 없이 컨텍스트 구성)
+CONVERSATION_CACHE_SESSIONS = int(os.getenv("CONVERSATION_CACHE_SESSIONS", "1000"))
+CONVERSATION_CACHE_MESSAGES = int(os.getenv("CONVERSATION_CACHE_MESSAGES", "20"))
+CONVERSATION_CACHE_TTL_SECONDS = float(os.getenv("CONVERSATION_CACHE_TTL_SECONDS", "300"))
+
+
+class _CachedSession:
+    __slots__ = ("conversation_id", "messages", "loaded_at")
+
+    def __init__(self, conversation_id: int, messages: List[Dict[str, Any]]):
+        self.conversation_id = conversation_id
+        # 오래된 것 → 최신 순 ring buffer
+        self.messages = deque(messages, maxlen=CONVERSATION_CACHE_MESSAGES)
+        self.loaded_at = time.monotonic()
+
+
+class RecentMessageCache:
+    """
+    세션별 최근 메시지 ring buffer (LRU로 세션 수 제한)
+
+    TTL이 지나면 다시 DB에서 읽어 다른 워커가 추가한 메시지를 반영한다.
+    """
+
+    def __init__(self,
+                 max_sessions: int = CONVERSATION_CACHE_SESSIONS,
+                 ttl_seconds: float = CONVERSATION_CACHE_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, _CachedSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[_CachedSession]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return entry
+
+    def load(self, session_id: str, conversation_id: int,
+             messages: List[Dict[str, Any]]) -> None:
+        """DB에서 읽은 최근 메시지(오래된 것 → 최신 순)로 캐시 채움"""
+        if self.max_sessions <= 0:
+            return
+        with self._lock:
+            self._sessions[session_id] = _CachedSession(conversation_id, messages)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def append(self, session_id: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry.messages.append(message)
+
+    def recent(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """최근 limit개 메시지 (오래된 것 → 최신 순)"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            return list(entry.messages)[-limit:]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+_recent_messages = RecentMessageCache()
+
+
+def _message_dict(role: str, content: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"role": role, "content": content, "metadata": metadata or {}}
+
+
+def _message_row(conversation_id: int, session_id: str, role: str, content: str,
+                 metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "conversation_id": conversation_id,
+        "session_id": session_id,
+        "role": role,
+        "content": content,
+        "message_metadata": metadata or {},
+    }
+
+
+def _recent_messages_stmt(session_id: str, limit: int):
+    """최신 메시지부터 limit개 (role, content, metadata)"""
+    return select(
+        Message.role, Message.content, Message.message_metadata
+    ).where(
+        Message.session_id == session_id
+    ).order_by(Message.created_at.desc(), Message.id.desc()).limit(limit)
 
 
 def create_conversation(user_id: Optional[str] = None) -> Conversation:
@@ -45,6 +151,24 @@ def get_or_create_conversation(session_id: Optional[str] = None, user_id: Option
     return create_conversation(user_id=user_id)
 
 
+def _get_or_create_in_session(
+    db: Session, session_id: Optional[str], user_id: Optional[str] = None
+) -> Conversation:
+    """주어진 DB 세션 안에서 대화 조회 또는 생성 (커밋하지 않음)"""
+    conversation = None
+    if session_id:
+        conversation = db.query(Conversation).filter(
+            Conversation.session_id == session_id).first()
+    if conversation is None:
+        conversation = Conversation(
+            session_id=session_id or str(uuid.uuid4()),
+            user_id=user_id
+        )
+        db.add(conversation)
+        db.flush()
+    return conversation
+
+
 def add_message(
     session_id: str,
     role: str,
@@ -54,11 +178,14 @@ def add_message(
     """메시지 추가"""
     db: Session = SessionLocal()
     try:
-        # 대화 세션 조회 또는 생성
-        conversation = get_or_create_conversation(session_id=session_id)
-        
+        cached = _recent_messages.get(session_id)
+        if cached is not None:
+            conversation_id = cached.conversation_id
+        else:
+            conversation_id = _get_or_create_in_session(db, session_id).id
+
         message = Message(
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             session_id=session_id,
             role=role,
             content=content,
@@ -67,51 +194,221 @@ def add_message(
         db.add(message)
         db.commit()
         db.refresh(message)
+        _recent_messages.append(session_id, _message_dict(role, content, metadata))
         return message
     finally:
         db.close()
 
 
+def enqueue_message(
+    session_id: str,
+    role: str,
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    메시지 추가 (write-behind)
+
+    캐시에 대화 ID가 있으면 DB 접근 없이 큐에 넣고 바로 반환한다.
+    """
+    cached = _recent_messages.get(session_id)
+    if cached is None:
+        add_message(session_id, role, content, metadata)
+        return
+
+    write_behind.enqueue(Message, _message_row(
+        cached.conversation_id, session_id, role, content, metadata))
+    _recent_messages.append(session_id, _message_dict(role, content, metadata))
+
+
 def get_conversation_messages(session_id: str, limit: int = 50) -> List[Message]:
-    """대화 세션의 메시지 목록 조회"""
+    """대화 세션의 최근 메시지 목록 조회 (오래된 것 → 최신 순)"""
     db: Session = SessionLocal()
     try:
-        return db.query(Message).filter(
+        messages = db.query(Message).filter(
             Message.session_id == session_id
-        ).order_by(Message.created_at.asc()).limit(limit).all()
+        ).order_by(Message.created_at.desc(), Message.id.desc()).limit(limit).all()
+        return list(reversed(messages))
     finally:
         db.close()
 
 
-def get_conversation_context(session_id: str, limit: int = 10) -> Dict[str, Any]:
-    """대화 컨텍스트 추출 (Agent에 전달할 형식)"""
-    messages = get_conversation_messages(session_id, limit=limit)
-    
-    # 최근 N개 메시지만 사용 (토큰 절약)
-    recent_messages = messages[-limit:] if len(messages) > limit else messages
-    
+def _build_context(session_id: str, recent_messages: List[Dict[str, Any]],
+                   total_messages: int) -> Dict[str, Any]:
+    """
+    Agent에 전달할 컨텍스트 구성
+
+    previous_messages는 최근 N개를 시간순(오래된 것 → 최신)으로 담는다.
+    """
     context = {
-        "previous_messages": [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "metadata": msg.message_metadata or {}
-            }
-            for msg in recent_messages
-        ],
-        "total_messages": len(messages),
+        "previous_messages": recent_messages,
+        "total_messages": total_messages,
         "session_id": session_id
     }
-    
+
     # 이전 추천 결과 추출
-    previous_recommendations = []
-    for msg in recent_messages:
-        if msg.role == "assistant" and msg.message_metadata:
-            if "recommendation_result" in msg.message_metadata:
-                previous_recommendations.append(msg.message_metadata["recommendation_result"])
-    
+    previous_recommendations = [
+        msg["metadata"]["recommendation_result"]
+        for msg in recent_messages
+        if msg["role"] == "assistant" and "recommendation_result" in (msg["metadata"] or {})
+    ]
     if previous_recommendations:
         context["previous_recommendations"] = previous_recommendations
-    
+
     return context
 
+
+def get_conversation_context(session_id: str, limit: int = 10) -> Dict[str, Any]:
+    """대화 컨텍스트 추출 (Agent에 전달할 형식)"""
+    messages = get_conversation_messages(session_id, limit=limit)
+    recent = [_message_dict(m.role, m.content, m.message_metadata) for m in messages]
+    return _build_context(session_id, recent, len(recent))
+
+
+def append_and_get_context(
+    session_id: Optional[str],
+    role: str,
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    limit: int = 10,
+    user_id: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    대화 세션 upsert + 메시지 추가 + 최근 N개 메시지 조회를 하나의 트랜잭션으로 처리
+
+    캐시에 있는 hot 세션은 INSERT를 write-behind 큐에 넣고 컨텍스트는 ring buffer에서 만든다.
+
+    Returns:
+        (session_id, 대화 컨텍스트)
+    """
+    message_dict = _message_dict(role, content, metadata)
+    cached = _recent_messages.get(session_id) if session_id else None
+    limit = max(1, limit)
+
+    if cached is not None and limit <= CONVERSATION_CACHE_MESSAGES:
+        write_behind.enqueue(Message, _message_row(
+            cached.conversation_id, session_id, role, content, metadata))
+        _recent_messages.append(session_id, message_dict)
+        recent = _recent_messages.recent(session_id, limit)
+        return session_id, _build_context(session_id, recent, len(recent))
+
+    db: Session = SessionLocal()
+    try:
+        conversation = _get_or_create_in_session(db, session_id, user_id=user_id)
+        session_id = conversation.session_id
+        db.add(Message(
+            conversation_id=conversation.id,
+            session_id=session_id,
+            role=role,
+            content=content,
+            message_metadata=metadata or {}
+        ))
+        db.flush()
+
+        # 최신 메시지부터 최대 max(limit, 캐시 크기)개 조회 후 시간순으로 뒤집음
+        fetch = max(limit, CONVERSATION_CACHE_MESSAGES)
+        rows = db.execute(_recent_messages_stmt(session_id, fetch)).all()
+        conversation_id = conversation.id
+        db.commit()
+    finally:
+        db.close()
+
+    history = [_message_dict(r.role, r.content, r.message_metadata) for r in reversed(rows)]
+    _recent_messages.load(session_id, conversation_id, history)
+    recent = history[-limit:]
+    return session_id, _build_context(session_id, recent, len(recent))
+
+
+# ==================== 비동기 버전 ====================
+
+async def _get_or_create_async(
+    db, session_id: Optional[str], user_id: Optional[str] = None
+) -> Conversation:
+    """_get_or_create_in_session의 비동기 버전 (커밋하지 않음)"""
+    conversation = None
+    if session_id:
+        conversation = (await db.execute(
+            select(Conversation).where(Conversation.session_id == session_id)
+        )).scalars().first()
+    if conversation is None:
+        conversation = Conversation(
+            session_id=session_id or str(uuid.uuid4()),
+            user_id=user_id
+        )
+        db.add(conversation)
+        await db.flush()
+    return conversation
+
+
+async def _add_message_async(
+    session_id: str, role: str, content: str, metadata: Optional[Dict[str, Any]]
+) -> None:
+    async with AsyncSessionLocal() as db:
+        cached = _recent_messages.get(session_id)
+        if cached is not None:
+            conversation_id = cached.conversation_id
+        else:
+            conversation_id = (await _get_or_create_async(db, session_id)).id
+        db.add(Message(**_message_row(conversation_id, session_id, role, content, metadata)))
+        await db.commit()
+    _recent_messages.append(session_id, _message_dict(role, content, metadata))
+
+
+async def enqueue_message_async(
+    session_id: str,
+    role: str,
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """enqueue_message의 비동기 버전 (큐에 넣지 못하면 비동기 세션으로 직접 기록)"""
+    cached = _recent_messages.get(session_id)
+    if cached is not None and write_behind.try_enqueue(Message, _message_row(
+            cached.conversation_id, session_id, role, content, metadata)):
+        _recent_messages.append(session_id, _message_dict(role, content, metadata))
+        return
+
+    if AsyncSessionLocal is None:
+        await asyncio.to_thread(add_message, session_id, role, content, metadata)
+        return
+    await _add_message_async(session_id, role, content, metadata)
+
+
+async def append_and_get_context_async(
+    session_id: Optional[str],
+    role: str,
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    limit: int = 10,
+    user_id: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """append_and_get_context의 비동기 버전"""
+    message_dict = _message_dict(role, content, metadata)
+    cached = _recent_messages.get(session_id) if session_id else None
+    limit = max(1, limit)
+
+    if cached is not None and limit <= CONVERSATION_CACHE_MESSAGES:
+        if write_behind.try_enqueue(Message, _message_row(
+                cached.conversation_id, session_id, role, content, metadata)):
+            _recent_messages.append(session_id, message_dict)
+            recent = _recent_messages.recent(session_id, limit)
+            return session_id, _build_context(session_id, recent, len(recent))
+
+    if AsyncSessionLocal is None:
+        return await asyncio.to_thread(
+            append_and_get_context, session_id, role, content, metadata, limit, user_id)
+
+    async with AsyncSessionLocal() as db:
+        conversation = await _get_or_create_async(db, session_id, user_id=user_id)
+        session_id = conversation.session_id
+        conversation_id = conversation.id
+        db.add(Message(**_message_row(conversation_id, session_id, role, content, metadata)))
+        await db.flush()
+
+        fetch = max(limit, CONVERSATION_CACHE_MESSAGES)
+        rows = (await db.execute(_recent_messages_stmt(session_id, fetch))).all()
+        await db.commit()
+
+    history = [_message_dict(r.role, r.content, r.message_metadata) for r in reversed(rows)]
+    _recent_messages.load(session_id, conversation_id, history)
+    recent = history[-limit:]
+    return session_id, _build_context(session_id, recent, len(recent))
@@ -5,9 +5,11 @@
 import os
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
+from server.db.replica import DATABASE_READ_URLS, Replica, ReplicaRouter
 from server.utils import config
 
 # 환경 변수에서 DB URL 가져오기
@@ -16,14 +18,73 @@ import os
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./history.db")
 
 
-def _create_engine():
+# SQLite 성능 프로파일 (connect 이벤트로 연결마다 적용)
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+
+if SQLITE_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    SQLITE_SYNCHRONOUS = "NORMAL"
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# 메모리 DB는 연결마다 별개의 DB이므로 WAL/읽기 풀을 적용하지 않음
+_SQLITE_FILE_DB = IS_SQLITE and ":memory:" not in DATABASE_URL \
+    and DATABASE_URL.partition("://")[2] not in ("", "/")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    """
+    SQLite 연결 PRAGMA 설정
+
+    - journal_mode=WAL: 쓰기 중에도 읽기 연결이 막히지 않음
+    - synchronous=NORMAL: WAL에서는 체크포인트 때만 fsync해도 손상되지 않음
+    - mmap_size / cache_size / temp_store: 읽기 위주 도구 쿼리의 I/O와 복사 감소
+    - busy_timeout: 잠금 충돌 시 즉시 실패하지 않고 대기
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.DB_CONN_TIMEOUT * 1000)}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _listen_sqlite_pragmas(target_engine, read_only: bool = False):
+    @event.listens_for(target_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, read_only)
+
+
+def _create_engine(read_only: bool = False, url: str = DATABASE_URL):
     engine_kwargs = {"echo": False}
+    sqlite_file_db = _SQLITE_FILE_DB and url == DATABASE_URL
 
-    if DATABASE_URL.startswith("sqlite"):
+    if url.startswith("sqlite"):
         engine_kwargs["connect_args"] = {
             "check_same_thread": False,
             "timeout": config.DB_CONN_TIMEOUT,
         }
+        if sqlite_file_db:
+            # writer는 연결 1개로 쓰기를 직렬화 ("database is locked" 방지),
+            # 읽기 전용 엔진은 스레드 수만큼 연결을 두어 병렬로 읽음
+            pool_size = SQLITE_READ_POOL_SIZE if read_only else 1
+            engine_kwargs.update(
+                {
+                    "poolclass": QueuePool,
+                    "pool_size": pool_size,
+                    "max_overflow": pool_size if read_only else 0,
+                    "pool_timeout": config.DB_POOL_TIMEOUT,
+                }
+            )
     else:
         engine_kwargs.update(
             {
@@ -35,15 +96,109 @@ def _create_engine():
             }
         )
 
-    return create_engine(DATABASE_URL, **engine_kwargs)
+    new_engine = create_engine(url, **engine_kwargs)
+    if sqlite_file_db:
+        _listen_sqlite_pragmas(new_engine, read_only)
+    return new_engine
 
 
-# Engine 생성
+# Engine 생성 (SQLite 파일 DB에서는 단일 writer)
 engine = _create_engine()
 
 # SessionLocal 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 읽기 전용 Engine (SQLite 파일 DB가 아니면 기본 엔진 공유, 복제본이 있으면 대체 경로)
+read_engine = _create_engine(read_only=True) if _SQLITE_FILE_DB else engine
+
+
+# ==================== 비동기 엔진 ====================
+
+# 동기 드라이버 → 비동기 드라이버
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def _to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+
+def _create_async_engine(url: str = ASYNC_DATABASE_URL):
+    """
+    비동기 엔진 생성 (aiosqlite / asyncpg / aiomysql)
+    드라이버가 설치되지 않았으면 None을 반환하고 서비스는 스레드에서 동기 엔진을 사용
+    """
+    try:
+        from sqlalchemy.ext.asyncio import create_async_engine
+    except ImportError:
+        return None
+
+    engine_kwargs = {"echo": False}
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": config.DB_CONN_TIMEOUT}
+    else:
+        engine_kwargs.update(
+            {
+                "pool_pre_ping": True,
+                "pool_size": config.DB_POOL_SIZE,
+                "max_overflow": config.DB_MAX_OVERFLOW,
+                "pool_timeout": config.DB_POOL_TIMEOUT,
+                "pool_recycle": 1800,
+            }
+        )
+
+    try:
+        new_engine = create_async_engine(url, **engine_kwargs)
+    except ImportError:
+        return None
+
+    if _SQLITE_FILE_DB and url == ASYNC_DATABASE_URL:
+        # SQLite 파일 DB에서 비동기 엔진은 읽기 전용 (쓰기는 SessionLocal 단일 writer)
+        _listen_sqlite_pragmas(new_engine.sync_engine, read_only=True)
+    return new_engine
+
+
+async_engine = _create_async_engine()
+
+# AsyncSessionLocal 생성 (비동기 드라이버가 없으면 None)
+# SQLite 파일 DB는 쓰기를 writer 연결 1개로 직렬화하므로 비동기 쓰기 세션을 두지 않음
+# (서비스는 None이면 스레드에서 SessionLocal로 기록, 비동기 엔진은 AsyncReadSessionLocal 읽기에만 사용)
+AsyncSessionLocal = None
+if async_engine is not None and not _SQLITE_FILE_DB:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+# ==================== 읽기 라우팅 ====================
+
+# 카탈로그 읽기 전용 세션: DATABASE_READ_URLS 복제본으로 분산 (lag guard 포함)
+read_router = ReplicaRouter(
+    primary=read_engine,
+    primary_async=async_engine,
+    replicas=[
+        Replica(
+            engine=_create_engine(read_only=True, url=url),
+            async_engine=_create_async_engine(_to_async_url(url)) if async_engine else None,
+        )
+        for url in DATABASE_READ_URLS
+    ],
+)
+
+# ReadSessionLocal() / AsyncReadSessionLocal(): 호출마다 복제본을 골라 세션 생성
+ReadSessionLocal = read_router.session
+AsyncReadSessionLocal = read_router.async_session if async_engine is not None else None
+
 # Base 클래스
 Base = declarative_base()
 
@@ -63,9 +218,33 @@ class Database:
         finally:
             db.close()
 
+    async def get_async_session(self):
+        """비동기 세션 생성 (FastAPI 의존성)"""
+        if AsyncSessionLocal is None:
+            raise RuntimeError(
+                "비동기 쓰기 세션을 사용할 수 없습니다 (드라이버 미설치 또는 SQLite 단일 writer)")
+        async with AsyncSessionLocal() as session:
+            yield session
+
     def create_tables(self):
-        """테이블 생성"""
+        """테이블 생성 (기존 테이블에 나중에 추가된 인덱스도 생성)"""
         Base.metadata.create_all(bind=self.engine)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+
+    def start_replica_monitor(self):
+        """읽기 복제본 지연 첫 조회 + lag guard 시작 (첫 요청 전에 확인을 끝내기 위해 시작 시 호출)"""
+        read_router.start_monitor()
+
+    async def dispose(self):
+        """커넥션 풀 정리"""
+        await read_router.dispose()
+        if async_engine is not None:
+            await async_engine.dispose()
+        self.engine.dispose()
+        if read_engine is not self.engine:
+            read_engine.dispose()
 
 
 # 전역 데이터베이스 인스턴스
@@ -0,0 +1,119 @@
+"""
+추천 이력 조회/저장 서비스
+"""
+
+import asyncio
+import base64
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from server.db.database import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal
+from server.db.models import History
+from server.db.write_behind import write_behind
+
+# 목록 조회 요약 컬럼 (큰 results JSON 제외)
+_SUMMARY_COLUMNS = (History.id, History.search_query, History.created_at)
+
+
+def encode_cursor(history_id: int) -> str:
+    """id → 불투명 커서 문자열"""
+    return base64.urlsafe_b64encode(str(history_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    커서 문자열 → id
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+def _history_page_stmt(cursor: Optional[str], limit: int, include_results: bool):
+    """
+    최신순 keyset 페이지 조회 (기본 키 사용, 깊은 페이지도 OFFSET 스캔 없음)
+    다음 페이지 존재 여부 확인을 위해 limit + 1개 조회
+
+    id는 삽입 순서대로 증가하므로 최신순 정렬 기준으로 사용.
+    created_at은 server_default(func.now())와 write-behind(파이썬 datetime)가 저장 형식이 달라
+    SQLite에서 문자열 비교가 어긋나므로 커서 비교에 쓰지 않음
+    """
+    stmt = select(History) if include_results else select(*_SUMMARY_COLUMNS)
+    if cursor:
+        stmt = stmt.where(History.id < decode_cursor(cursor))
+    return stmt.order_by(History.id.desc()).limit(limit + 1)
+
+
+def _to_page(rows, limit: int, include_results: bool) -> Dict[str, Any]:
+    items = []
+    for row in rows[:limit]:
+        item = {"id": row.id, "search_query": row.search_query, "created_at": row.created_at}
+        if include_results:
+            item["user_input"] = row.user_input
+            item["results"] = row.results
+        items.append(item)
+
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(items[-1]["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def list_history(
+    cursor: Optional[str] = None, limit: int = 100, include_results: bool = False
+) -> Dict[str, Any]:
+    """
+    히스토리 목록 조회 (최신순, 커서 페이지네이션)
+
+    Args:
+        cursor: 이전 페이지 응답의 next_cursor (없으면 첫 페이지)
+        limit: 페이지 크기
+        include_results: True면 user_input / results 포함
+
+    Returns:
+        {"items": [...], "next_cursor": 다음 페이지 커서 또는 None}
+    """
+    stmt = _history_page_stmt(cursor, limit, include_results)
+    db: Session = ReadSessionLocal()
+    try:
+        result = db.execute(stmt)
+        rows = result.scalars().all() if include_results else result.all()
+        return _to_page(rows, limit, include_results)
+    finally:
+        db.close()
+
+
+async def list_history_async(
+    cursor: Optional[str] = None, limit: int = 100, include_results: bool = False
+) -> Dict[str, Any]:
+    """list_history의 비동기 버전"""
+    if AsyncReadSessionLocal is None:
+        return await asyncio.to_thread(list_history, cursor, limit, include_results)
+    stmt = _history_page_stmt(cursor, limit, include_results)
+    async with AsyncReadSessionLocal() as db:
+        result = await db.execute(stmt)
+        rows = result.scalars().all() if include_results else result.all()
+        return _to_page(rows, limit, include_results)
+
+
+def save_history(values: Dict[str, Any]) -> None:
+    """히스토리 저장 (write-behind)"""
+    write_behind.enqueue(History, values)
+
+
+async def save_history_async(values: Dict[str, Any]) -> None:
+    """save_history의 비동기 버전 (큐에 넣지 못하면 비동기 세션으로 직접 기록)"""
+    if write_behind.try_enqueue(History, values):
+        return
+    if AsyncSessionLocal is None:
+        await asyncio.to_thread(save_history, values)
+        return
+    async with AsyncSessionLocal() as db:
+        db.add(History(**values))
+        await db.commit()
@@ -341,6 +341,21 @@ def migrate_all(csv_dir: str = ".", clear_existing: bool = False):
 
     print("\n모든 마이그레이션 완료!")
 
+    # 판매자 페르소나 벡터 (사전 랭킹 / LLM 대체 랭킹용)
+    from server.db.seller_persona import build_persona_vectors
+    print(f"판매자 페르소나 벡터 계산 완료: {build_persona_vectors()}명")
+
+    # 워커들이 mmap으로 공유하는 카탈로그 스냅샷 새 버전 게시
+    from server.db.catalog_snapshot import CATALOG_SNAPSHOT_DIR, catalog_store
+    if CATALOG_SNAPSHOT_DIR:
+        version = catalog_store.publish(full=True)
+        print(f"카탈로그 스냅샷 게시 완료: {version}")
+
+    # 후보 검색 인덱스 (BM25 / 의미 검색) 재생성 (파일 교체 시 워커가 다시 로드)
+    from server.retrieval.build import build_all
+    build_all()
+    print("후보 검색 인덱스 생성 완료")
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
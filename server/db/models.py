@@ -2,7 +2,7 @@
 SQLAlchemy 모델 정의
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, LargeBinary
 from sqlalchemy.sql import func
 from server.db.database import Base
 
@@ -65,6 +65,16 @@ class Seller(Base):
     persona_vector = Column(JSON)  # 판매자 페르소나 벡터
 
 
+class SellerPersona(Base):
+    """판매자 페르소나 벡터 (오프라인 계산, 슬라이더 5차원 float32 바이트)"""
+
+    __tablename__ = "seller_personas"
+
+    seller_id = Column(Integer, primary_key=True)
+    vector = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Review(Base):
     """판매자 리뷰 정보"""
 
@@ -1,18 +1,232 @@
 """
 상품 및 판매자 데이터 조회 서비스
 Price Agent에서 사용할 상품 조회 로직
+
+*_async 함수는 이벤트 루프에서 호출하는 비동기 버전 (AsyncReadSessionLocal 사용,
+비동기 드라이버가 없으면 동기 함수를 스레드에서 실행)
+
+카탈로그 스냅샷(CATALOG_SNAPSHOT_ENABLED)이 적재되어 있으면 필터/정렬/그룹화는
+컬럼 배열에서 처리하고 DB에서는 결과 상품의 제목/설명만 조회
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
+
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
-from server.db.database import SessionLocal
+from sqlalchemy import Select, or_, and_, func, select
+from server.db.catalog_snapshot import ColumnarCatalog, catalog_store, product_texts_stmt
+from server.db.database import AsyncReadSessionLocal, ReadSessionLocal
 from server.db.models import Product, Seller
 from server.utils.logger import get_logger
+from server.utils.metrics import timed
 
 logger = get_logger(__name__)
 
 
+def _product_filters(
+    search_query: Optional[str],
+    category: Optional[str],
+    category_top: Optional[str],
+    price_min: Optional[float],
+    price_max: Optional[float],
+    condition: Optional[str],
+    sell_method: Optional[str] = None,
+    delivery_fee: Optional[str] = None,
+    is_safe: Optional[str] = None,
+) -> list:
+    """조회 조건 → WHERE 절 목록 (sell_method는 포함 여부, 나머지는 일치)"""
+    filters = []
+
+    if search_query:
+        # 검색어를 키워드로 분리하여 각 키워드가 포함되는지 확인 (AND 조건)
+        # 공백으로 분리하고, 각 키워드가 제목 또는 설명에 포함되어야 함
+        keywords = [kw.strip().lower()
+                    for kw in search_query.split() if kw.strip()]
+
+        if keywords:
+            # 각 키워드에 대해 제목 또는 설명에 포함되는지 확인
+            keyword_filters = []
+            for keyword in keywords:
+                keyword_filters.append(
+                    or_(
+                        func.lower(Product.title).contains(keyword),
+                        func.lower(Product.description).contains(keyword)
+                    )
+                )
+            # 모든 키워드가 포함되어야 함 (AND 조건)
+            filters.append(and_(*keyword_filters))
+            logger.debug(
+                "검색 쿼리 필터 적용",
+                extra={
+                    "search_query": search_query,
+                    "keywords": keywords,
+                    "keyword_count": len(keywords)
+                }
+            )
+        else:
+            # 키워드가 없으면 원본 검색어로 검색
+            search_query_lower = search_query.lower()
+            filters.append(
+                or_(
+                    func.lower(Product.title).contains(search_query_lower),
+                    func.lower(Product.description).contains(
+                        search_query_lower)
+                )
+            )
+            logger.debug(
+                "검색 쿼리 필터 적용 (단일 검색어)",
+                extra={"search_query": search_query}
+            )
+
+    if category:
+        filters.append(Product.category == category)
+
+    if category_top:
+        filters.append(Product.category_top == category_top)
+
+    if price_min is not None:
+        filters.append(Product.price >= price_min)
+
+    if price_max is not None:
+        filters.append(Product.price <= price_max)
+
+    if condition:
+        filters.append(Product.condition == condition)
+
+    if sell_method:
+        filters.append(Product.sell_method.contains(sell_method))
+
+    if delivery_fee:
+        filters.append(Product.delivery_fee == delivery_fee)
+
+    if is_safe:
+        filters.append(Product.is_safe == is_safe)
+
+    return filters
+
+
+def _sellers_with_products_stmt(filters: list, limit: int) -> Select:
+    """Product-Seller 조인 조회 (조회수 높은 순)"""
+    stmt = select(Product, Seller).join(
+        Seller, Product.seller_id == Seller.seller_id
+    )
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    return stmt.order_by(Product.view_count.desc()).limit(limit)
+
+
+def _products_by_seller_ids_stmt(seller_ids: List[int]) -> Select:
+    return select(Product, Seller).join(
+        Seller, Product.seller_id == Seller.seller_id
+    ).where(
+        Product.seller_id.in_(seller_ids)
+    ).order_by(Product.view_count.desc())
+
+
+# DB에 상품이 하나라도 있는지 확인 (COUNT(*) 전체 스캔 대신 LIMIT 1)
+_ANY_PRODUCT_STMT = select(Product.product_id).limit(1)
+
+
+def _group_by_seller(rows, per_seller_limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """(Product, Seller) 행 → 판매자별로 그룹화된 상품 리스트"""
+    sellers_dict = {}
+
+    for product, seller in rows:
+        seller_id = seller.seller_id
+
+        # 판매자당 상품 수 제한
+        if per_seller_limit is not None and seller_id in sellers_dict:
+            if len(sellers_dict[seller_id]["products"]) >= per_seller_limit:
+                continue
+
+        if seller_id not in sellers_dict:
+            sellers_dict[seller_id] = {
+                "seller_id": seller.seller_id,
+                "seller_name": seller.seller_name,
+                "seller_trust": seller.seller_trust,
+                "seller_safe_sales": seller.seller_safe_sales,
+                "seller_customs": seller.seller_customs,
+                "products": []
+            }
+
+        sellers_dict[seller_id]["products"].append({
+            "product_id": product.product_id,
+            "title": product.title,
+            "price": product.price,
+            "category": product.category,
+            "category_top": product.category_top,
+            "condition": product.condition,
+            "description": product.description,
+            "view_count": product.view_count,
+            "like_count": product.like_count,
+            "chat_count": product.chat_count,
+            "sell_method": product.sell_method,
+            "delivery_fee": product.delivery_fee,
+            "is_safe": product.is_safe
+        })
+
+    return list(sellers_dict.values())
+
+
+def _catalog_sellers_rows(
+    catalog: ColumnarCatalog,
+    search_query, category, category_top, price_min, price_max, condition, limit: int,
+    sell_method=None, delivery_fee=None, is_safe=None,
+):
+    mask = catalog.filter(search_query, category, category_top, price_min, price_max, condition,
+                          sell_method=sell_method, delivery_fee=delivery_fee, is_safe=is_safe)
+    rows = catalog.top_rows(mask, limit)
+    _log_query_result(len(rows), search_query, category, price_min, price_max)
+    return rows
+
+
+def _catalog_seller_ids_rows(catalog: ColumnarCatalog, seller_ids: List[int], limit: int):
+    rows = catalog.top_rows(catalog.filter(seller_ids=seller_ids))
+    return catalog.limit_per_seller(rows, limit)
+
+
+def _catalog_texts_stmt(catalog: ColumnarCatalog, rows):
+    return product_texts_stmt(catalog.columns["product_id"][rows].tolist())
+
+
+def _texts_by_id(result) -> Dict[int, tuple]:
+    return {product_id: (title, description) for product_id, title, description in result}
+
+
+def _log_query_result(result_count: int, search_query, category, price_min, price_max):
+    logger.info(
+        "상품 조회 완료",
+        extra={
+            "result_count": result_count,
+            "search_query": search_query,
+            "category": category,
+            "price_range": f"{price_min}-{price_max}" if price_min or price_max else None
+        }
+    )
+
+
+def _catalog_group(catalog: ColumnarCatalog, rows) -> List[Dict[str, Any]]:
+    """스냅샷 행 → 판매자별 그룹 (제목/설명은 DB에서 PK로 조회)"""
+    if not len(rows):
+        return []
+    db: Session = ReadSessionLocal()
+    try:
+        texts = _texts_by_id(db.execute(_catalog_texts_stmt(catalog, rows)))
+    finally:
+        db.close()
+    return catalog.group_by_seller(rows, texts)
+
+
+async def _catalog_group_async(catalog: ColumnarCatalog, rows) -> List[Dict[str, Any]]:
+    if not len(rows):
+        return []
+    async with AsyncReadSessionLocal() as db:
+        texts = _texts_by_id(await db.execute(_catalog_texts_stmt(catalog, rows)))
+    return catalog.group_by_seller(rows, texts)
+
+
+@timed("db")
 def get_sellers_with_products(
     search_query: Optional[str] = None,
     category: Optional[str] = None,
@@ -20,7 +234,10 @@ def get_sellers_with_products(
     price_min: Optional[float] = None,
     price_max: Optional[float] = None,
     condition: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    sell_method: Optional[str] = None,
+    delivery_fee: Optional[str] = None,
+    is_safe: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     판매자와 상품 정보를 함께 조회 (Price Agent용)
@@ -33,136 +250,40 @@ def get_sellers_with_products(
         price_max: 최대 가격
         condition: 상품 상태 (중고/새상품)
         limit: 최대 조회 개수
+        sell_method: 거래 방식 포함 여부 (직거래/택배)
+        delivery_fee: 배송비 (있음/없음)
+        is_safe: 안전거래 여부 (사용/미사용)
 
     Returns:
         판매자별로 그룹화된 상품 리스트
     """
-    db: Session = SessionLocal()
+    catalog = catalog_store.current
+    if catalog is not None:
+        rows = _catalog_sellers_rows(
+            catalog, search_query, category, category_top, price_min, price_max, condition, limit,
+            sell_method, delivery_fee, is_safe)
+        return _catalog_group(catalog, rows)
+
+    db: Session = ReadSessionLocal()
 
     try:
         # DB에 상품이 있는지 먼저 확인
-        total_product_count = db.query(Product).count()
-        if total_product_count == 0:
+        if db.execute(_ANY_PRODUCT_STMT).first() is None:
             return []  # DB에 상품이 없으면 빈 리스트 반환
 
-        # 기본 쿼리: Product와 Seller 조인
-        query = db.query(Product, Seller).join(
-            Seller, Product.seller_id == Seller.seller_id
-        )
-
-        # 필터 적용
-        filters = []
-
-        if search_query:
-            # 검색어를 키워드로 분리하여 각 키워드가 포함되는지 확인 (AND 조건)
-            # 공백으로 분리하고, 각 키워드가 제목 또는 설명에 포함되어야 함
-            keywords = [kw.strip().lower()
-                        for kw in search_query.split() if kw.strip()]
-
-            if keywords:
-                # 각 키워드에 대해 제목 또는 설명에 포함되는지 확인
-                keyword_filters = []
-                for keyword in keywords:
-                    keyword_filters.append(
-                        or_(
-                            func.lower(Product.title).contains(keyword),
-                            func.lower(Product.description).contains(keyword)
-                        )
-                    )
-                # 모든 키워드가 포함되어야 함 (AND 조건)
-                filters.append(and_(*keyword_filters))
-                logger.debug(
-                    "검색 쿼리 필터 적용",
-                    extra={
-                        "search_query": search_query,
-                        "keywords": keywords,
-                        "keyword_count": len(keywords)
-                    }
-                )
-            else:
-                # 키워드가 없으면 원본 검색어로 검색
-                search_query_lower = search_query.lower()
-                filters.append(
-                    or_(
-                        func.lower(Product.title).contains(search_query_lower),
-                        func.lower(Product.description).contains(
-                            search_query_lower)
-                    )
-                )
-                logger.debug(
-                    "검색 쿼리 필터 적용 (단일 검색어)",
-                    extra={"search_query": search_query}
-                )
-
-        if category:
-            filters.append(Product.category == category)
-
-        if category_top:
-            filters.append(Product.category_top == category_top)
+        filters = _product_filters(
+            search_query, category, category_top, price_min, price_max, condition,
+            sell_method, delivery_fee, is_safe)
+        results = db.execute(_sellers_with_products_stmt(filters, limit)).all()
+        _log_query_result(len(results), search_query, category, price_min, price_max)
 
-        if price_min is not None:
-            filters.append(Product.price >= price_min)
-
-        if price_max is not None:
-            filters.append(Product.price <= price_max)
-
-        if condition:
-            filters.append(Product.condition == condition)
-
-        if filters:
-            query = query.filter(and_(*filters))
-
-        # 정렬: 조회수 높은 순
-        results = query.order_by(Product.view_count.desc()).limit(limit).all()
-
-        logger.info(
-            "상품 조회 완료",
-            extra={
-                "result_count": len(results),
-                "search_query": search_query,
-                "category": category,
-                "price_range": f"{price_min}-{price_max}" if price_min or price_max else None
-            }
-        )
-
-        # 판매자별로 그룹화
-        sellers_dict = {}
-
-        for product, seller in results:
-            seller_id = seller.seller_id
-
-            if seller_id not in sellers_dict:
-                sellers_dict[seller_id] = {
-                    "seller_id": seller.seller_id,
-                    "seller_name": seller.seller_name,
-                    "seller_trust": seller.seller_trust,
-                    "seller_safe_sales": seller.seller_safe_sales,
-                    "seller_customs": seller.seller_customs,
-                    "products": []
-                }
-
-            sellers_dict[seller_id]["products"].append({
-                "product_id": product.product_id,
-                "title": product.title,
-                "price": product.price,
-                "category": product.category,
-                "category_top": product.category_top,
-                "condition": product.condition,
-                "description": product.description,
-                "view_count": product.view_count,
-                "like_count": product.like_count,
-                "chat_count": product.chat_count,
-                "sell_method": product.sell_method,
-                "delivery_fee": product.delivery_fee,
-                "is_safe": product.is_safe
-            })
-
-        return list(sellers_dict.values())
+        return _group_by_seller(results)
 
     finally:
         db.close()
 
 
+@timed("db")
 def get_products_by_seller_ids(seller_ids: List[int], limit: int = 100) -> List[Dict[str, Any]]:
     """
     특정 판매자들의 상품 조회
@@ -174,57 +295,21 @@ def get_products_by_seller_ids(seller_ids: List[int], limit: int = 100) -> List[
     Returns:
         판매자별로 그룹화된 상품 리스트
     """
-    db: Session = SessionLocal()
+    catalog = catalog_store.current
+    if catalog is not None:
+        return _catalog_group(catalog, _catalog_seller_ids_rows(catalog, seller_ids, limit))
 
-    try:
-        results = db.query(Product, Seller).join(
-            Seller, Product.seller_id == Seller.seller_id
-        ).filter(
-            Product.seller_id.in_(seller_ids)
-        ).order_by(Product.view_count.desc()).all()
-
-        sellers_dict = {}
-
-        for product, seller in results:
-            seller_id = seller.seller_id
-
-            # 판매자당 상품 수 제한
-            if seller_id in sellers_dict:
-                if len(sellers_dict[seller_id]["products"]) >= limit:
-                    continue
-
-            if seller_id not in sellers_dict:
-                sellers_dict[seller_id] = {
-                    "seller_id": seller.seller_id,
-                    "seller_name": seller.seller_name,
-                    "seller_trust": seller.seller_trust,
-                    "seller_safe_sales": seller.seller_safe_sales,
-                    "seller_customs": seller.seller_customs,
-                    "products": []
-                }
+    db: Session = ReadSessionLocal()
 
-            sellers_dict[seller_id]["products"].append({
-                "product_id": product.product_id,
-                "title": product.title,
-                "price": product.price,
-                "category": product.category,
-                "category_top": product.category_top,
-                "condition": product.condition,
-                "description": product.description,
-                "view_count": product.view_count,
-                "like_count": product.like_count,
-                "chat_count": product.chat_count,
-                "sell_method": product.sell_method,
-                "delivery_fee": product.delivery_fee,
-                "is_safe": product.is_safe
-            })
-
-        return list(sellers_dict.values())
+    try:
+        results = db.execute(_products_by_seller_ids_stmt(seller_ids)).all()
+        return _group_by_seller(results, per_seller_limit=limit)
 
     finally:
         db.close()
 
 
+@timed("db")
 def search_products_by_keywords(
     keywords: List[str],
     category: Optional[str] = None,
@@ -246,40 +331,218 @@ def search_products_by_keywords(
     Returns:
         판매자별로 그룹화된 상품 리스트
     """
-    if not keywords:
-        # 키워드가 없으면 필터만 적용하여 조회
-        return get_sellers_with_products(
-            search_query=None,
-            category=category,
-            price_min=price_min,
-            price_max=price_max,
-            limit=limit
-        )
-
-    # 키워드를 공백으로 연결하여 검색 (get_sellers_with_products에서 키워드별 AND 조건으로 처리)
-    # 중복 제거 및 정규화
+    return get_sellers_with_products(
+        search_query=_keywords_to_query(keywords),
+        category=category,
+        price_min=price_min,
+        price_max=price_max,
+        limit=limit
+    )
+
+
+def _keywords_to_query(keywords: List[str]) -> Optional[str]:
+    """
+    키워드 중복 제거 및 정규화 후 공백으로 연결
+    (get_sellers_with_products에서 분리하여 키워드별 AND 조건으로 처리, 없으면 None)
+    """
     unique_keywords = []
     seen = set()
-    for kw in keywords:
+    for kw in keywords or []:
         kw_clean = kw.strip().lower()
         if kw_clean and kw_clean not in seen:
             unique_keywords.append(kw_clean)
             seen.add(kw_clean)
+    return " ".join(unique_keywords) or None
 
-    if not unique_keywords:
-        return get_sellers_with_products(
-            search_query=None,
-            category=category,
-            price_min=price_min,
-            price_max=price_max,
-            limit=limit
-        )
 
-    # 키워드를 공백으로 연결 (get_sellers_with_products에서 분리하여 AND 조건으로 처리)
-    search_query = " ".join(unique_keywords)
+@timed("db")
+def filter_product_ids(
+    category: Optional[str] = None,
+    category_top: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    condition: Optional[str] = None,
+    sell_method: Optional[str] = None,
+    delivery_fee: Optional[str] = None,
+    is_safe: Optional[str] = None,
+) -> np.ndarray:
+    """
+    조건에 맞는 상품 ID 배열 (검색 엔진의 사전 필터용)
 
-    return get_sellers_with_products(
-        search_query=search_query,
+    Returns:
+        product_id 배열 (int64)
+    """
+    catalog = catalog_store.current
+    if catalog is not None:
+        mask = catalog.filter(None, category, category_top, price_min, price_max, condition,
+                              sell_method=sell_method, delivery_fee=delivery_fee, is_safe=is_safe)
+        return np.asarray(catalog.columns["product_id"][mask])
+
+    filters = _product_filters(None, category, category_top, price_min, price_max, condition,
+                               sell_method, delivery_fee, is_safe)
+    stmt = select(Product.product_id)
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    db: Session = ReadSessionLocal()
+    try:
+        return np.fromiter(db.execute(stmt).scalars(), dtype=np.int64)
+    finally:
+        db.close()
+
+
+@timed("db")
+def get_product_vocabulary() -> Dict[str, List[str]]:
+    """
+    검색어 해석용 사전 (DB에 있는 카테고리 / 대분류 / 상품 상태 값)
+
+    Returns:
+        {"category": [...], "category_top": [...], "condition": [...]}
+    """
+    columns = ("category", "category_top", "condition")
+    catalog = catalog_store.current
+    if catalog is not None:
+        values = catalog.strings.values
+        return {
+            name: sorted({values[code] for code in np.unique(catalog.columns[name])} - {None, ""})
+            for name in columns
+        }
+
+    db: Session = ReadSessionLocal()
+    try:
+        return {
+            name: sorted(
+                value for value in db.execute(select(getattr(Product, name)).distinct()).scalars()
+                if value
+            )
+            for name in columns
+        }
+    finally:
+        db.close()
+
+
+def get_catalogue_stats() -> Dict[str, int]:
+    """
+    카탈로그 상품 수 / 최대 product_id (검색 인덱스 최신 여부 확인용)
+
+    Returns:
+        {"product_count": ..., "max_product_id": ...}
+    """
+    catalog = catalog_store.current
+    if catalog is not None:
+        return {"product_count": len(catalog), "max_product_id": catalog.max_product_id}
+
+    db: Session = ReadSessionLocal()
+    try:
+        count, max_id = db.execute(select(func.count(), func.max(Product.product_id))).one()
+        return {"product_count": int(count or 0), "max_product_id": int(max_id or 0)}
+    finally:
+        db.close()
+
+
+@timed("db")
+def get_sellers_by_product_ids(product_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    주어진 상품들을 순서대로 판매자별로 그룹화 (검색 엔진 결과 순위 유지)
+
+    Args:
+        product_ids: 순위순 상품 ID 리스트
+
+    Returns:
+        판매자별로 그룹화된 상품 리스트 (판매자 순서 = 최상위 상품 순위)
+    """
+    if not product_ids:
+        return []
+
+    catalog = catalog_store.current
+    if catalog is not None:
+        if not len(catalog):
+            return []
+        catalog_ids = catalog.columns["product_id"]
+        ids = np.asarray(product_ids, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(catalog_ids, ids), max(len(catalog_ids) - 1, 0))
+        found = (catalog_ids[pos] == ids) & (catalog.seller_row[pos] >= 0)
+        return _catalog_group(catalog, pos[found])
+
+    rank = {product_id: i for i, product_id in enumerate(product_ids)}
+    stmt = select(Product, Seller).join(
+        Seller, Product.seller_id == Seller.seller_id
+    ).where(Product.product_id.in_(product_ids))
+    db: Session = ReadSessionLocal()
+    try:
+        results = db.execute(stmt).all()
+    finally:
+        db.close()
+    results.sort(key=lambda row: rank[row[0].product_id])
+    return _group_by_seller(results)
+
+
+# ==================== 비동기 버전 ====================
+
+async def get_sellers_with_products_async(
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    category_top: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    condition: Optional[str] = None,
+    limit: int = 50,
+    sell_method: Optional[str] = None,
+    delivery_fee: Optional[str] = None,
+    is_safe: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """get_sellers_with_products의 비동기 버전"""
+    if AsyncReadSessionLocal is None:
+        return await asyncio.to_thread(
+            get_sellers_with_products, search_query, category, category_top,
+            price_min, price_max, condition, limit, sell_method, delivery_fee, is_safe)
+
+    catalog = catalog_store.current
+    if catalog is not None:
+        rows = _catalog_sellers_rows(
+            catalog, search_query, category, category_top, price_min, price_max, condition, limit,
+            sell_method, delivery_fee, is_safe)
+        return await _catalog_group_async(catalog, rows)
+
+    async with AsyncReadSessionLocal() as db:
+        if (await db.execute(_ANY_PRODUCT_STMT)).first() is None:
+            return []
+
+        filters = _product_filters(
+            search_query, category, category_top, price_min, price_max, condition,
+            sell_method, delivery_fee, is_safe)
+        results = (await db.execute(_sellers_with_products_stmt(filters, limit))).all()
+        _log_query_result(len(results), search_query, category, price_min, price_max)
+
+        return _group_by_seller(results)
+
+
+async def get_products_by_seller_ids_async(
+    seller_ids: List[int], limit: int = 100
+) -> List[Dict[str, Any]]:
+    """get_products_by_seller_ids의 비동기 버전"""
+    if AsyncReadSessionLocal is None:
+        return await asyncio.to_thread(get_products_by_seller_ids, seller_ids, limit)
+
+    catalog = catalog_store.current
+    if catalog is not None:
+        return await _catalog_group_async(
+            catalog, _catalog_seller_ids_rows(catalog, seller_ids, limit))
+
+    async with AsyncReadSessionLocal() as db:
+        results = (await db.execute(_products_by_seller_ids_stmt(seller_ids))).all()
+        return _group_by_seller(results, per_seller_limit=limit)
+
+
+async def search_products_by_keywords_async(
+    keywords: List[str],
+    category: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """search_products_by_keywords의 비동기 버전"""
+    return await get_sellers_with_products_async(
+        search_query=_keywords_to_query(keywords),
         category=category,
         price_min=price_min,
         price_max=price_max,
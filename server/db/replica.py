@@ -0,0 +1,189 @@
+"""
+읽기 복제본(read replica) 라우팅
+카탈로그(상품/판매자/리뷰) 읽기 전용 조회를 DATABASE_READ_URLS의 복제본으로 분산하고,
+Message / History / RecommendationLog 쓰기는 primary에 남긴다.
+
+- 선택 방식: round_robin | least_connections (풀에서 빌려간 연결 수 기준)
+- lag guard: 백그라운드 스레드가 주기적으로 복제 지연을 조회하여
+  REPLICA_MAX_LAG_SECONDS를 넘거나 조회에 실패한 복제본은 제외
+  (복제본은 확인 전까지 제외 상태, 첫 조회는 모니터 시작 시 동기로 수행)
+- 사용 가능한 복제본이 없으면 primary(읽기 엔진)로 대체
+"""
+
+import itertools
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DATABASE_READ_URLS = [
+    url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()
+]
+DATABASE_READ_STRATEGY = os.getenv("DATABASE_READ_STRATEGY", "round_robin").lower()
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_LAG_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL_SECONDS", "5"))
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+def replication_lag(conn) -> Optional[float]:
+    """
+    복제 지연(초) 조회
+
+    Returns:
+        지연 시간 (primary이거나 지연을 알 수 없는 DB는 0, 복제가 멈췄으면 None)
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # 받은 WAL을 모두 재생했으면 쓰기가 없어 타임스탬프가 오래돼도 지연 0
+        value = conn.execute(text(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )).scalar()
+        return float(value or 0)
+    if dialect in ("mysql", "mariadb"):
+        row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        if row is None:
+            return 0.0
+        value = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return None if value is None else float(value)
+    return 0.0
+
+
+@dataclass
+class Replica:
+    """복제본 하나의 엔진과 상태"""
+
+    engine: Engine
+    async_engine: Any = None
+    healthy: bool = False  # 첫 지연 조회 전에는 사용하지 않음
+    lag: Optional[float] = None
+
+    @property
+    def in_use(self) -> int:
+        """현재 빌려간 연결 수 (least_connections 기준)"""
+        count = self.engine.pool.checkedout()
+        if self.async_engine is not None:
+            count += self.async_engine.pool.checkedout()
+        return count
+
+
+class ReplicaRouter:
+    """읽기 전용 세션을 복제본 엔진에 분배하는 세션 팩토리"""
+
+    def __init__(
+        self,
+        primary: Engine,
+        primary_async: Any = None,
+        replicas: Optional[List[Replica]] = None,
+        strategy: str = DATABASE_READ_STRATEGY,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    ):
+        if strategy not in STRATEGIES:
+            logger.warning(f"알 수 없는 DATABASE_READ_STRATEGY '{strategy}', round_robin 사용")
+            strategy = "round_robin"
+        self.primary = primary
+        self.primary_async = primary_async
+        self.replicas = replicas or []
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._checked = False
+        self._stop = threading.Event()
+        self._session_factory = sessionmaker(autocommit=False, autoflush=False)
+        self._async_session_factory = None
+        if primary_async is not None:
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+            self._async_session_factory = async_sessionmaker(
+                class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    def pick(self) -> Optional[Replica]:
+        """사용 가능한 복제본 선택 (없으면 None → primary)"""
+        if not self.replicas:
+            return None
+        self._ensure_monitor()
+        candidates = [replica for replica in self.replicas if replica.healthy]
+        if not candidates:
+            return None
+        if self.strategy == "least_connections":
+            return min(candidates, key=lambda replica: replica.in_use)
+        return candidates[next(self._counter) % len(candidates)]
+
+    def session(self) -> Session:
+        """읽기 전용 동기 세션 (ReadSessionLocal)"""
+        replica = self.pick()
+        return self._session_factory(bind=replica.engine if replica else self.primary)
+
+    def async_session(self):
+        """읽기 전용 비동기 세션 (AsyncReadSessionLocal)"""
+        replica = self.pick()
+        bind = replica.async_engine if replica and replica.async_engine is not None \
+            else self.primary_async
+        return self._async_session_factory(bind=bind)
+
+    # -------------------- lag guard --------------------
+
+    def check_replicas(self) -> None:
+        """복제본별 지연 조회 후 사용 가능 여부 갱신"""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    lag = replication_lag(conn)
+            except Exception as e:
+                logger.warning(f"복제본 지연 조회 실패 ({replica.engine.url!r}): {e}")
+                lag = None
+
+            healthy = lag is not None and lag <= self.max_lag
+            if not self._checked and not healthy:
+                logger.warning(f"복제본 제외: {replica.engine.url!r} (lag={lag})")
+            elif self._checked and healthy != replica.healthy:
+                logger.warning(
+                    f"복제본 {'복귀' if healthy else '제외'}: {replica.engine.url!r} (lag={lag})")
+            replica.lag = lag
+            replica.healthy = healthy
+        self._checked = True
+
+    def start_monitor(self) -> None:
+        """첫 지연 조회를 동기로 끝낸 뒤 lag guard 스레드 시작 (이미 시작됐으면 무시)"""
+        if self.replicas:
+            self._ensure_monitor()
+
+    def _ensure_monitor(self) -> None:
+        if self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is not None:
+                return
+            # 확인되지 않은 복제본으로 읽기가 가지 않도록 첫 조회는 호출 스레드에서 수행
+            # (동시에 들어온 다른 요청은 lock에서 대기)
+            self.check_replicas()
+            monitor = threading.Thread(
+                target=self._run_monitor, name="replica-lag-guard", daemon=True)
+            monitor.start()
+            self._monitor = monitor
+
+    def _run_monitor(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check_replicas()
+
+    async def dispose(self) -> None:
+        """lag guard 종료 및 복제본 커넥션 풀 정리"""
+        self._stop.set()
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+            replica.engine.dispose()
@@ -2,7 +2,7 @@
 Pydantic 스키마 정의
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
 import html
@@ -130,13 +130,26 @@ class HistoryRequest(BaseModel):
     results: List[RecommendationResult]
 
 
-class HistoryResponse(BaseModel):
-    """히스토리 조회 응답"""
+class HistorySummary(BaseModel):
+    """히스토리 목록 항목 (results 제외)"""
     id: int
+    search_query: Optional[str] = None
+    created_at: datetime
+
+
+class HistoryResponse(HistorySummary):
+    """히스토리 조회 응답"""
     user_input: Dict[str, Any]
-    search_query: str
     results: List[Dict[str, Any]]
-    created_at: datetime
+
+
+class HistoryPage(BaseModel):
+    """히스토리 목록 페이지 (커서 페이지네이션)"""
+    items: List[Union[HistoryResponse, HistorySummary]]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="다음 페이지 커서 (마지막 페이지면 null)"
+    )
 
 
 class ConversationCreate(BaseModel):
@@ -0,0 +1,313 @@
+"""
+판매자 페르소나 벡터
+사용자 선호도 슬라이더 5차원(SLIDER_KEYS)과 같은 축으로 판매자별 0~1 벡터를 오프라인 계산하여
+seller_personas 테이블에 float32 바이트로 저장하고, 서버는 전체를 (n, 5) 배열로 적재하여
+사용자 슬라이더 벡터와 가까운 판매자 top-k를 한 번의 벡터 연산으로 찾는다.
+LLM 호출 전 후보 사전 랭킹과 LLM 실패 시 대체 랭킹에 사용한다.
+
+차원별 계산 (공통 툴 피처와 같은 정규화):
+- trust_safety: 신뢰도 점수, 안전거래 판매 비율, 안전결제 상품 비율
+- quality_condition: 상품 상태 점수 평균, 평균 평점
+- remote_transaction: 택배 가능 상품 비율
+- activity_responsiveness: 인기도(조회/좋아요/채팅), 응답 시간, 등록 상품 수
+- price_flexibility: 같은 카테고리 안에서 가격이 낮은 정도 (가격 백분위의 보수)
+
+벡터 계산:
+    python -m server.db.seller_persona
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from server.db.database import ReadSessionLocal, SessionLocal
+from server.db.models import Product, Seller, SellerPersona
+from server.utils.logger import get_logger
+from server.utils.tools import CONDITION_SCORES, SLIDER_KEYS, normalize_slider_inputs
+
+logger = get_logger(__name__)
+
+# 서버가 페르소나 벡터를 다시 적재하는 주기 (초)
+PERSONA_INDEX_TTL_SECONDS = int(os.getenv("PERSONA_INDEX_TTL_SECONDS", "300"))
+
+PERSONA_DIM = len(SLIDER_KEYS)
+_MAX_DISTANCE = float(np.sqrt(PERSONA_DIM))
+_INSERT_BATCH = 5000
+
+
+def _bincount_mean(index: np.ndarray, values: np.ndarray, n: int, default: float) -> np.ndarray:
+    """그룹별 평균 (값이 없는 그룹은 default)"""
+    counts = np.bincount(index, minlength=n)
+    sums = np.bincount(index, weights=values, minlength=n)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), default)
+
+
+def _category_price_percentile(categories: List[Optional[str]], prices: np.ndarray) -> np.ndarray:
+    """상품별 카테고리 내 가격 백분위 (0 = 최저가, 가격 없음/단독 상품은 0.5)"""
+    percentile = np.full(len(prices), 0.5)
+    valid = ~np.isnan(prices)
+    if not valid.any():
+        return percentile
+    _, category_codes = np.unique(
+        np.array([c or "" for c in categories], dtype=object)[valid], return_inverse=True)
+    valid_prices = prices[valid]
+    order = np.lexsort((valid_prices, category_codes))
+    sorted_codes = category_codes[order]
+    starts = np.searchsorted(sorted_codes, sorted_codes, side="left")
+    ends = np.searchsorted(sorted_codes, sorted_codes, side="right")
+    sizes = ends - starts
+    ranks = np.arange(len(order)) - starts
+    valid_percentile = np.empty(len(order))
+    valid_percentile[order] = np.where(sizes > 1, ranks / np.maximum(sizes - 1, 1), 0.5)
+    percentile[valid] = valid_percentile
+    return percentile
+
+
+def compute_persona_vectors(db) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    전체 판매자 페르소나 벡터 계산
+
+    Returns:
+        (seller_ids (n,), vectors (n, 5) float32)
+    """
+    sellers = db.execute(
+        select(
+            Seller.seller_id, Seller.seller_trust, Seller.seller_safe_sales,
+            Seller.seller_customs, Seller.seller_items, Seller.seller_view,
+            Seller.seller_like, Seller.seller_chat, Seller.avg_rating,
+            Seller.response_time_hours, Seller.sell_method,
+        ).order_by(Seller.seller_id)
+    ).all()
+    if not sellers:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, PERSONA_DIM), dtype=np.float32)
+
+    def column(i: int, default: float = 0.0) -> np.ndarray:
+        return np.array([default if row[i] is None else row[i] for row in sellers], dtype=np.float64)
+
+    seller_ids = np.array([row[0] for row in sellers], dtype=np.int64)
+    n = len(seller_ids)
+
+    products = db.execute(
+        select(
+            Product.seller_id, Product.price, Product.condition, Product.sell_method,
+            Product.is_safe, Product.category_top,
+        )
+    ).all()
+    # 상품 → 판매자 행 번호 (판매자 테이블에 없는 상품은 제외)
+    product_seller_ids = np.array([p[0] if p[0] is not None else -1 for p in products], dtype=np.int64)
+    product_seller = np.minimum(np.searchsorted(seller_ids, product_seller_ids), n - 1)
+    known = seller_ids[product_seller] == product_seller_ids
+    products = [p for p, ok in zip(products, known) if ok]
+    product_seller = product_seller[known]
+
+    has_products = np.bincount(product_seller, minlength=n) > 0
+    condition_score = np.array([CONDITION_SCORES.get(p[2] or "", 0.5) for p in products])
+    remote = np.array([1.0 if "택배" in (p[3] or "") else 0.0 for p in products])
+    safe_payment = np.array([1.0 if p[4] == "사용" else 0.0 for p in products])
+    prices = np.array([np.nan if p[1] is None else p[1] for p in products], dtype=np.float64)
+    price_percentile = _category_price_percentile([p[5] for p in products], prices)
+
+    # trust_safety (seller_profile_tool과 같은 400~600 → 0~1 정규화)
+    trust = np.clip((column(1) - 400.0) / 200.0, 0.0, 1.0)
+    safe_sales_ratio = np.minimum(column(2) / np.maximum(column(3), 1.0), 1.0)
+    trust_safety = (0.5 * trust + 0.25 * safe_sales_ratio
+                    + 0.25 * _bincount_mean(product_seller, safe_payment, n, 0.0))
+
+    # quality_condition (평점이 없으면 중간값)
+    ratings = column(8)
+    rating_score = np.where(ratings > 0, np.minimum(ratings / 5.0, 1.0), 0.5)
+    quality_condition = 0.7 * _bincount_mean(product_seller, condition_score, n, 0.5) + 0.3 * rating_score
+
+    # remote_transaction (상품이 없으면 판매자 선호 거래 방식)
+    seller_remote = np.array([1.0 if "택배" in (row[10] or "") else 0.0 for row in sellers])
+    remote_transaction = np.where(
+        has_products, _bincount_mean(product_seller, remote, n, 0.0), seller_remote)
+
+    # activity_responsiveness (popularity_index는 seller_profile_tool과 동일)
+    popularity = np.minimum(1.0, (column(5) * 0.2 + column(6) * 0.5 + column(7) * 0.3) / 1000.0)
+    response = np.maximum(0.0, 1.0 - column(9, 24.0) / 24.0)
+    activity_responsiveness = 0.4 * popularity + 0.3 * response + 0.3 * np.minimum(column(4) / 50.0, 1.0)
+
+    # price_flexibility
+    price_flexibility = 1.0 - _bincount_mean(product_seller, price_percentile, n, 0.5)
+
+    vectors = np.column_stack([
+        trust_safety, quality_condition, remote_transaction,
+        activity_responsiveness, price_flexibility,
+    ]).astype(np.float32)
+    return seller_ids, np.clip(vectors, 0.0, 1.0)
+
+
+def store_persona_vectors(db, seller_ids: np.ndarray, vectors: np.ndarray) -> None:
+    """seller_personas 테이블 전체 교체 (하나의 트랜잭션)"""
+    db.execute(delete(SellerPersona))
+    rows = [
+        {"seller_id": int(seller_id), "vector": vector.tobytes()}
+        for seller_id, vector in zip(seller_ids, np.ascontiguousarray(vectors, dtype=np.float32))
+    ]
+    for start in range(0, len(rows), _INSERT_BATCH):
+        db.execute(insert(SellerPersona), rows[start:start + _INSERT_BATCH])
+    db.commit()
+
+
+def build_persona_vectors() -> int:
+    """전체 판매자 페르소나 벡터 계산 후 저장 (오프라인 작업). 저장한 판매자 수 반환"""
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        seller_ids, vectors = compute_persona_vectors(db)
+        store_persona_vectors(db, seller_ids, vectors)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    logger.info(
+        f"판매자 페르소나 벡터 계산: 판매자 {len(seller_ids)}명, "
+        f"{time.perf_counter() - start:.1f}s")
+    return len(seller_ids)
+
+
+def user_persona_vector(user_input: Dict[str, Any]) -> np.ndarray:
+    """사용자 슬라이더(0~100)를 페르소나 벡터(0~1)로 변환"""
+    normalized = normalize_slider_inputs(user_input)
+    return np.array([normalized[key] / 100.0 for key in SLIDER_KEYS], dtype=np.float32)
+
+
+class PersonaIndex:
+    """판매자 페르소나 벡터 (seller_id 오름차순, 점수 = 1 - 유클리드 거리 / sqrt(5))"""
+
+    def __init__(self, seller_ids: np.ndarray, vectors: np.ndarray):
+        self.seller_ids = seller_ids
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.seller_ids)
+
+    @classmethod
+    def load(cls) -> "PersonaIndex":
+        db = ReadSessionLocal()
+        try:
+            rows = db.execute(
+                select(SellerPersona.seller_id, SellerPersona.vector)
+                .order_by(SellerPersona.seller_id)
+            ).all()
+        finally:
+            db.close()
+        seller_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32)
+        return cls(seller_ids, vectors.reshape(len(rows), PERSONA_DIM))
+
+    def _scores(self, user_vector: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        distances = np.linalg.norm(self.vectors[rows] - user_vector, axis=1)
+        return 1.0 - distances / _MAX_DISTANCE
+
+    def nearest(
+        self, user_vector: np.ndarray, k: int, seller_ids: Optional[Sequence[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        사용자 벡터와 가까운 판매자 top-k
+
+        Args:
+            user_vector: (5,) 사용자 페르소나 벡터
+            k: 결과 수
+            seller_ids: 후보 판매자 (None이면 전체)
+
+        Returns:
+            (seller_ids, scores) 점수 내림차순
+        """
+        if seller_ids is None:
+            rows = np.arange(len(self))
+        else:
+            rows = np.flatnonzero(np.isin(self.seller_ids, np.asarray(seller_ids, dtype=np.int64)))
+        scores = self._scores(user_vector, rows)
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return self.seller_ids[rows[order]], scores[order].astype(np.float32)
+
+    def scores_for(self, user_vector: np.ndarray, seller_ids: Sequence[int]) -> Dict[int, float]:
+        """판매자별 매칭 점수 (벡터가 없는 판매자는 제외)"""
+        ids = np.asarray(seller_ids, dtype=np.int64)
+        positions = np.searchsorted(self.seller_ids, ids)
+        found = positions < len(self)
+        found[found] = self.seller_ids[positions[found]] == ids[found]
+        scores = self._scores(user_vector, positions[found])
+        return {int(seller_id): float(score) for seller_id, score in zip(ids[found], scores)}
+
+
+class _PersonaIndexHolder:
+    """PERSONA_INDEX_TTL_SECONDS마다 DB에서 다시 적재"""
+
+    def __init__(self):
+        self._index: Optional[PersonaIndex] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[PersonaIndex]:
+        if time.monotonic() - self._loaded_at >= PERSONA_INDEX_TTL_SECONDS:
+            with self._lock:
+                if time.monotonic() - self._loaded_at >= PERSONA_INDEX_TTL_SECONDS:
+                    try:
+                        self._index = PersonaIndex.load()
+                    except Exception:
+                        logger.exception("판매자 페르소나 벡터 적재 실패")
+                    self._loaded_at = time.monotonic()
+        return self._index if self._index is not None and len(self._index) else None
+
+
+_holder = _PersonaIndexHolder()
+
+
+def get_persona_index() -> Optional[PersonaIndex]:
+    """현재 페르소나 인덱스 (벡터가 없으면 None)"""
+    return _holder.get()
+
+
+def persona_scores(user_input: Dict[str, Any], seller_ids: Sequence[int]) -> Dict[int, float]:
+    """판매자별 사용자 선호도 매칭 점수 (인덱스나 벡터가 없는 판매자는 제외)"""
+    index = get_persona_index()
+    if index is None or not len(seller_ids):
+        return {}
+    return index.scores_for(user_persona_vector(user_input), seller_ids)
+
+
+def nearest_sellers(user_input: Dict[str, Any], k: int) -> List[Tuple[int, float]]:
+    """
+    전체 판매자 중 사용자 선호도와 가장 가까운 top-k (후보 검색 결과가 없을 때 LLM 없는 대체 추천용)
+
+    Returns:
+        [(seller_id, persona_score), ...] 점수 내림차순 (인덱스가 없으면 빈 리스트)
+    """
+    index = get_persona_index()
+    if index is None or not len(index):
+        return []
+    seller_ids, scores = index.nearest(user_persona_vector(user_input), k)
+    return [(int(sid), float(score)) for sid, score in zip(seller_ids, scores)]
+
+
+def rank_sellers_by_persona(
+    user_input: Dict[str, Any], sellers: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    판매자 리스트에 persona_score를 붙여 점수 내림차순으로 정렬
+    인덱스가 없거나 벡터가 없는 판매자는 0.5, 동점은 기존 순서 유지
+    """
+    scores = persona_scores(
+        user_input, [int(s["seller_id"]) for s in sellers if s.get("seller_id") is not None])
+    ranked = [{**s, "persona_score": scores.get(s.get("seller_id"), 0.5)} for s in sellers]
+    ranked.sort(key=lambda s: s["persona_score"], reverse=True)
+    return ranked
+
+
+if __name__ == "__main__":
+    from server.db.database import database
+
+    database.create_tables()
+    count = build_persona_vectors()
+    print(f"판매자 페르소나 벡터 저장 완료: {count}명")
@@ -0,0 +1,208 @@
+"""
+Write-behind 저장 큐
+요청 경로에서 Message / History / RecommendationLog INSERT를 분리하여
+백그라운드 스레드가 테이블별 multi-row INSERT로 모아 커밋한다.
+
+- batch_size개가 모이거나 flush_interval이 지나면 flush
+- stop() 시 남은 항목을 모두 기록한 뒤 종료
+- 큐가 가득 차거나 워커가 없으면 호출 스레드에서 바로 기록 (유실 없음)
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from server.db.database import engine as default_engine
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "200"))
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """ORM 모델 행을 모아 일괄 INSERT하는 백그라운드 writer"""
+
+    def __init__(
+        self,
+        engine: Engine = default_engine,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000.0,
+        max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+    ):
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+        logger.info(
+            f"Write-behind 시작 (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """남은 항목을 모두 기록하고 워커 종료"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            self._thread = None
+        logger.info(f"Write-behind 종료 (기록 {self.written}건, 실패 {self.failed}건)")
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """지금까지 넣은 항목이 모두 기록될 때까지 대기"""
+        if not self.running:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def enqueue(self, model: Type[Any], values: Dict[str, Any]) -> None:
+        """
+        INSERT 예약
+
+        Args:
+            model: ORM 모델 클래스 (Message, History, RecommendationLog 등)
+            values: 컬럼 값 (created_at이 없으면 현재 시각으로 채움)
+        """
+        table, values = self._prepare(model, values)
+        if not self._put(table, values):
+            self._write([(table, values)])
+
+    def try_enqueue(self, model: Type[Any], values: Dict[str, Any]) -> bool:
+        """
+        큐에 넣기만 시도 (블로킹 없음)
+
+        Returns:
+            워커가 없거나 큐가 가득 차 넣지 못하면 False (호출자가 직접 기록)
+        """
+        return self._put(*self._prepare(model, values))
+
+    @staticmethod
+    def _prepare(model: Type[Any], values: Dict[str, Any]):
+        table = model.__table__
+        if "created_at" in table.c and "created_at" not in values:
+            values = {**values, "created_at": datetime.now(timezone.utc)}
+        return table, values
+
+    def _put(self, table: Any, values: Dict[str, Any]) -> bool:
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait((table, values))
+            return True
+        except queue.Full:
+            logger.warning("Write-behind 큐가 가득 차 직접 기록으로 대체")
+            return False
+
+    # -------------------- 워커 --------------------
+
+    def _run(self) -> None:
+        pending: List[Tuple[Any, Dict[str, Any]]] = []
+        waiters: List[threading.Event] = []
+        deadline: Optional[float] = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # 대기 중인 항목을 더 가져와 배치를 채움 (블로킹 없이)
+            while len(pending) < self.batch_size and not stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    pending.append(item)
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if pending and (stopping or waiters or due or len(pending) >= self.batch_size):
+                self._write(pending)
+                pending = []
+                deadline = None
+
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+        # stop 이후 큐에 남은 항목 정리
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._write(leftovers)
+        for waiter in waiters:
+            waiter.set()
+
+    def _write(self, items: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        """테이블별 multi-row INSERT를 하나의 트랜잭션으로 기록"""
+        # executemany는 같은 컬럼 집합끼리만 묶을 수 있음
+        batches: Dict[Tuple[Any, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+        for table, values in items:
+            batches.setdefault((table, tuple(sorted(values))), []).append(values)
+        try:
+            with self.engine.begin() as conn:
+                for (table, _), rows in batches.items():
+                    conn.execute(insert(table), rows)
+            self.written += len(items)
+        except Exception as e:
+            # 배치 전체가 실패하면 한 건씩 재시도하여 문제 행만 버림
+            logger.error(f"Write-behind 배치 기록 실패 ({len(items)}건): {e}")
+            if len(items) == 1:
+                self.failed += 1
+                return
+            for item in items:
+                self._write([item])
+
+
+write_behind = WriteBehindQueue()
@@ -2,13 +2,18 @@
 FastAPI 메인 애플리케이션
 """
 
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from server.routers import workflow_router, history_router
+from server.routers import workflow_router, history_router, metrics_router
+from server.db.catalog_snapshot import CATALOG_SNAPSHOT_ENABLED, catalog_store
 from server.db.database import database
+from server.db.write_behind import WRITE_BEHIND_ENABLED, write_behind
 from server.utils.logger import setup_logging, get_logger
+from server.middleware.limiter import create_rate_limiter
 from server.middleware.rate_limit import RateLimitMiddleware
+from server.middleware.timing import TimingMiddleware
 from server.utils.config import PORT, HOST
 import os
 
@@ -31,9 +36,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate Limiting 미들웨어 추가
+# Rate Limiting 미들웨어 추가 (백엔드는 종료 시 정리하기 위해 앱에서 소유)
+rate_limiter = create_rate_limiter()
 app.add_middleware(
     RateLimitMiddleware,
+    backend=rate_limiter,
     requests_per_hour=int(os.getenv("RATE_LIMIT_PER_HOUR", "100")),
     window_seconds=int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600")),
     enable_user_limit=os.getenv(
@@ -42,9 +49,13 @@ app.add_middleware(
                               "true").lower() == "true",
 )
 
+# 요청 타이밍 미들웨어 (가장 바깥쪽에서 rate limit 포함 전체 시간 측정)
+app.add_middleware(TimingMiddleware)
+
 # 라우터 등록
 app.include_router(workflow_router)
 app.include_router(history_router)
+app.include_router(metrics_router)
 
 # 데이터베이스 초기화
 
@@ -88,6 +99,20 @@ async def startup():
     database.create_tables()
     logger.info("데이터베이스 초기화 완료")
 
+    # 읽기 복제본 지연 확인 (확인 전 복제본은 사용하지 않음)
+    await asyncio.to_thread(database.start_replica_monitor)
+
+    # 메시지/히스토리 write-behind 저장 시작
+    if WRITE_BEHIND_ENABLED:
+        write_behind.start()
+
+    # 컬럼형 카탈로그 스냅샷 적재 (실패하면 DB 조회 경로 사용)
+    if CATALOG_SNAPSHOT_ENABLED:
+        try:
+            await asyncio.to_thread(catalog_store.start)
+        except Exception as e:
+            logger.error(f"카탈로그 스냅샷 적재 실패, DB 조회로 대체: {e}")
+
     # 캐시 시스템 초기화 확인
     from server.utils.cache import cache_manager
     if cache_manager.use_redis:
@@ -99,6 +124,16 @@ async def startup():
     await warmup_workflow()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    # 대기 중인 write-behind 항목을 모두 기록한 뒤 종료
+    await asyncio.to_thread(write_behind.stop)
+    await asyncio.to_thread(catalog_store.stop)
+    # Redis rate limiter 커넥션 풀 해제 (memory 백엔드는 no-op)
+    await rate_limiter.close()
+    await database.dispose()
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
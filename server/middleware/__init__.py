@@ -3,6 +3,7 @@
 """
 
 from .rate_limit import RateLimitMiddleware
+from .timing import TimingMiddleware
 
-__all__ = ["RateLimitMiddleware"]
+__all__ = ["RateLimitMiddleware", "TimingMiddleware"]
 
@@ -0,0 +1,172 @@
+"""
+Rate limiter 백엔드
+슬라이딩 윈도우 카운터(현재/이전 고정 윈도우 가중합)로 키당 O(1) 메모리/연산
+
+- memory: 프로세스 내 상태, 유휴 키 주기적 제거
+- redis: Lua 스크립트로 원자적 확인+증가 (워커/레플리카 간 공유)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rate limiter 백엔드 설정
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_REDIS_URL = os.getenv(
+    "RATE_LIMIT_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+RATE_LIMIT_EVICT_INTERVAL_SECONDS = float(
+    os.getenv("RATE_LIMIT_EVICT_INTERVAL_SECONDS", "60"))
+
+
+class RateLimitResult(NamedTuple):
+    """확인 결과 (count는 이번 요청 반영 후 추정치)"""
+    allowed: bool
+    count: int
+    limit: int
+    reset_after: float  # 현재 고정 윈도우가 끝날 때까지 남은 초
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.count)
+
+
+def _sliding_count(previous: int, current: int, elapsed: float, window: float) -> float:
+    """이전 윈도우 요청 수를 겹치는 비율만큼 가중한 추정치"""
+    return previous * max(0.0, 1.0 - elapsed / window) + current
+
+
+class RateLimiterBackend:
+    """Rate limiter 백엔드 인터페이스"""
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        """허용이면 카운트를 1 증가시키고 결과 반환 (확인+증가는 원자적)"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateLimiter(RateLimiterBackend):
+    """
+    프로세스 내 슬라이딩 윈도우 카운터
+
+    키당 [윈도우 번호, 현재 카운트, 이전 카운트] 3개 값만 보관하고,
+    evict_interval마다 두 윈도우 이상 요청이 없던 키를 제거한다.
+    """
+
+    def __init__(self, evict_interval: float = RATE_LIMIT_EVICT_INTERVAL_SECONDS):
+        self._state: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._evict_interval = evict_interval
+        self._last_evict = time.monotonic()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_evict >= self._evict_interval:
+                self._evict(now, window_seconds)
+
+            window_index = int(now // window_seconds)
+            state = self._state.get(key)
+            if state is None:
+                state = [window_index, 0, 0]
+                self._state[key] = state
+            elif state[0] != window_index:
+                # 바로 다음 윈도우면 현재 → 이전, 그보다 오래됐으면 둘 다 초기화
+                state[2] = state[1] if window_index - state[0] == 1 else 0
+                state[1] = 0
+                state[0] = window_index
+
+            elapsed = now - window_index * window_seconds
+            estimate = _sliding_count(state[2], state[1], elapsed, window_seconds)
+            allowed = estimate < limit
+            if allowed:
+                state[1] += 1
+                estimate += 1
+
+        return RateLimitResult(allowed, int(estimate), limit, window_seconds - elapsed)
+
+    def _evict(self, now: float, window_seconds: int) -> None:
+        cutoff = int(now // window_seconds) - 1
+        stale = [key for key, state in self._state.items() if state[0] < cutoff]
+        for key in stale:
+            del self._state[key]
+        self._last_evict = now
+        if stale:
+            logger.debug(f"Rate limit 유휴 키 {len(stale)}개 제거")
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+# KEYS[1]=현재 윈도우 키, KEYS[2]=이전 윈도우 키
+# ARGV[1]=limit, ARGV[2]=window(초), ARGV[3]=윈도우 내 경과 시간(초)
+_SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local weight = 1 - elapsed / window
+if weight < 0 then weight = 0 end
+local estimate = previous * weight + current
+if estimate < limit then
+    redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], window * 2)
+    return {1, tostring(estimate + 1)}
+end
+return {0, tostring(estimate)}
+"""
+
+
+class RedisRateLimiter(RateLimiterBackend):
+    """Redis 슬라이딩 윈도우 카운터 (키당 고정 윈도우 2개, TTL로 자동 만료)"""
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL, prefix: str = "reco:ratelimit",
+                 client=None):
+        # client: 이미 만든 redis.asyncio 호환 클라이언트 (테스트 등), 없으면 url로 생성
+        self._client = client or redis_asyncio.from_url(
+            url, socket_connect_timeout=2, socket_timeout=2)
+        self._script = self._client.register_script(_SLIDING_WINDOW_LUA)
+        self._prefix = prefix
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.time()
+        window_index = int(now // window_seconds)
+        elapsed = now - window_index * window_seconds
+        allowed, estimate = await self._script(
+            keys=[
+                f"{self._prefix}:{key}:{window_index}",
+                f"{self._prefix}:{key}:{window_index - 1}",
+            ],
+            args=[limit, window_seconds, elapsed],
+        )
+        return RateLimitResult(
+            bool(int(allowed)), int(float(estimate)), limit, window_seconds - elapsed)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_rate_limiter(backend: Optional[str] = None) -> RateLimiterBackend:
+    """RATE_LIMIT_BACKEND 설정에 따라 백엔드 생성 (redis 불가 시 memory)"""
+    backend = (backend or RATE_LIMIT_BACKEND).lower()
+    if backend == "redis":
+        if REDIS_AVAILABLE:
+            logger.info("Rate limiter: Redis 백엔드 사용")
+            return RedisRateLimiter()
+        logger.warning("redis 패키지가 없어 in-memory rate limiter 사용")
+    elif backend != "memory":
+        logger.warning(f"알 수 없는 RATE_LIMIT_BACKEND={backend}, memory 사용")
+    return MemoryRateLimiter()
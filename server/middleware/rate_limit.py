@@ -1,16 +1,24 @@
 """
 API Rate Limiting 미들웨어
 사용자별, IP 기반 요청 제한
+
+BaseHTTPMiddleware 대신 순수 ASGI로 구현하여 요청당 task/queue 오버헤드가 없고
+StreamingResponse(SSE)의 backpressure를 그대로 유지한다.
 """
 
 import time
-from typing import Dict, Tuple, Optional
-from collections import defaultdict
-from fastapi import Request, HTTPException, status
+from typing import Optional
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.middleware.limiter import (
+    RateLimiterBackend,
+    RateLimitResult,
+    create_rate_limiter,
+)
 from server.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,9 +27,12 @@ logger = get_logger(__name__)
 DEFAULT_RATE_LIMIT = 100  # 시간당 기본 요청 수
 DEFAULT_WINDOW_SECONDS = 3600  # 1시간
 
+# 제한에서 제외할 경로 (정적 문서, 헬스체크, 메트릭)
+EXEMPT_PATHS = frozenset(["/", "/docs", "/openapi.json", "/redoc", "/metrics"])
+
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate Limiting 미들웨어"""
+class RateLimitMiddleware:
+    """Rate Limiting 미들웨어 (ASGI)"""
 
     def __init__(
         self,
@@ -30,20 +41,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         window_seconds: int = DEFAULT_WINDOW_SECONDS,
         enable_user_limit: bool = True,
         enable_ip_limit: bool = True,
+        backend: Optional[RateLimiterBackend] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.requests_per_hour = requests_per_hour
         self.window_seconds = window_seconds
         self.enable_user_limit = enable_user_limit
         self.enable_ip_limit = enable_ip_limit
 
-        # 사용자별 요청 기록: {user_id: [(timestamp, count), ...]}
-        self.user_requests: Dict[str, list] = defaultdict(list)
+        # 슬라이딩 윈도우 카운터 백엔드 (memory / redis, RATE_LIMIT_BACKEND)
+        self.limiter = backend or create_rate_limiter()
 
-        # IP별 요청 기록: {ip: [(timestamp, count), ...]}
-        self.ip_requests: Dict[str, list] = defaultdict(list)
-
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, request: HTTPConnection) -> str:
         """클라이언트 IP 주소 추출"""
         # X-Forwarded-For 헤더 확인 (프록시/로드밸런서 뒤에 있을 때)
         forwarded_for = request.headers.get("X-Forwarded-For")
@@ -62,7 +71,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return "unknown"
 
-    def _get_user_id(self, request: Request) -> Optional[str]:
+    def _get_user_id(self, request: HTTPConnection) -> Optional[str]:
         """사용자 ID 추출 (세션 ID 또는 인증 토큰에서)"""
         # 세션 ID 확인
         session_id = request.headers.get("X-Session-ID")
@@ -78,129 +87,99 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return None
 
-    def _cleanup_old_requests(self, requests_list: list, current_time: float):
-        """오래된 요청 기록 정리"""
-        cutoff_time = current_time - self.window_seconds
-        return [
-            (ts, count)
-            for ts, count in requests_list
-            if ts > cutoff_time
-        ]
-
-    def _check_rate_limit(
-        self, identifier: str, requests_list: list, current_time: float
-    ) -> Tuple[bool, int, int]:
+    async def _check_rate_limit(self, identifier: str) -> Optional[RateLimitResult]:
         """
-        Rate limit 확인
+        Rate limit 확인 및 기록 (원자적)
 
         Returns:
-            (is_allowed, current_count, limit)
+            RateLimitResult, 백엔드 오류 시 None (요청 허용)
         """
-        # 오래된 요청 정리
-        requests_list[:] = self._cleanup_old_requests(requests_list, current_time)
-
-        # 현재 시간대 요청 수 계산
-        current_count = sum(count for _, count in requests_list)
-
-        # 제한 확인
-        is_allowed = current_count < self.requests_per_hour
-
-        if not is_allowed:
-            # 다음 요청 가능 시간 계산
-            if requests_list:
-                oldest_time = min(ts for ts, _ in requests_list)
-                reset_time = oldest_time + self.window_seconds
-                wait_seconds = max(0, int(reset_time - current_time))
-            else:
-                wait_seconds = 0
-
+        try:
+            result = await self.limiter.hit(
+                identifier, self.requests_per_hour, self.window_seconds)
+        except Exception as e:
+            logger.warning(f"Rate limiter 백엔드 오류, 요청 허용: {e}")
+            return None
+
+        if not result.allowed:
             logger.warning(
-                f"Rate limit 초과: {identifier} (현재: {current_count}/{self.requests_per_hour}, 대기: {wait_seconds}초)"
+                f"Rate limit 초과: {identifier} (현재: {result.count}/{result.limit}, 대기: {int(result.reset_after)}초)"
             )
 
-        return is_allowed, current_count, self.requests_per_hour
-
-    async def dispatch(self, request: Request, call_next):
+        return result
+
+    def _limit_headers(self, result: RateLimitResult, current_time: float) -> dict:
+        return {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(int(current_time + result.reset_after)),
+        }
+
+    def _limit_exceeded(self, result: RateLimitResult, message: str,
+                        current_time: float) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "error": "Rate limit exceeded",
+                "message": message,
+                "current_count": result.count,
+                "limit": result.limit,
+                "retry_after": int(result.reset_after) + 1,
+            },
+            headers={
+                **self._limit_headers(result, current_time),
+                "Retry-After": str(int(result.reset_after) + 1),
+            },
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """미들웨어 요청 처리"""
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        # 정적 파일이나 헬스체크는 제외
-        if request.url.path in ["/", "/docs", "/openapi.json", "/redoc"]:
-            return await call_next(request)
-
+        request = HTTPConnection(scope)
         current_time = time.time()
-        client_ip = self._get_client_ip(request)
-        user_id = self._get_user_id(request)
+        ip_result = None
 
         # IP 기반 제한 확인
         if self.enable_ip_limit:
-            is_allowed, current_count, limit = self._check_rate_limit(
-                f"IP:{client_ip}", self.ip_requests[client_ip], current_time
-            )
-
-            if not is_allowed:
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": f"IP 주소당 시간당 {limit}회 요청 제한을 초과했습니다.",
-                        "current_count": current_count,
-                        "limit": limit,
-                        "retry_after": self.window_seconds,
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(limit),
-                        "X-RateLimit-Remaining": str(max(0, limit - current_count)),
-                        "X-RateLimit-Reset": str(int(current_time + self.window_seconds)),
-                    },
+            client_ip = self._get_client_ip(request)
+            ip_result = await self._check_rate_limit(f"ip:{client_ip}")
+            if ip_result is not None and not ip_result.allowed:
+                response = self._limit_exceeded(
+                    ip_result,
+                    f"IP 주소당 시간당 {ip_result.limit}회 요청 제한을 초과했습니다.",
+                    current_time,
                 )
-
-            # 요청 기록 추가
-            self.ip_requests[client_ip].append((current_time, 1))
+                await response(scope, receive, send)
+                return
 
         # 사용자별 제한 확인
+        user_id = self._get_user_id(request)
         if self.enable_user_limit and user_id:
-            is_allowed, current_count, limit = self._check_rate_limit(
-                f"User:{user_id}", self.user_requests[user_id], current_time
-            )
-
-            if not is_allowed:
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": f"사용자당 시간당 {limit}회 요청 제한을 초과했습니다.",
-                        "current_count": current_count,
-                        "limit": limit,
-                        "retry_after": self.window_seconds,
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(limit),
-                        "X-RateLimit-Remaining": str(max(0, limit - current_count)),
-                        "X-RateLimit-Reset": str(int(current_time + self.window_seconds)),
-                    },
+            user_result = await self._check_rate_limit(f"user:{user_id}")
+            if user_result is not None and not user_result.allowed:
+                response = self._limit_exceeded(
+                    user_result,
+                    f"사용자당 시간당 {user_result.limit}회 요청 제한을 초과했습니다.",
+                    current_time,
                 )
+                await response(scope, receive, send)
+                return
 
-            # 요청 기록 추가
-            self.user_requests[user_id].append((current_time, 1))
-
-        # 요청 처리
-        response = await call_next(request)
+        if ip_result is None:
+            await self.app(scope, receive, send)
+            return
 
-        # Rate limit 헤더 추가
-        if self.enable_ip_limit:
-            current_count = sum(
-                count
-                for _, count in self._cleanup_old_requests(
-                    self.ip_requests[client_ip], current_time
-                )
-            )
-            response.headers["X-RateLimit-Limit"] = str(self.requests_per_hour)
-            response.headers["X-RateLimit-Remaining"] = str(
-                max(0, self.requests_per_hour - current_count)
-            )
-            response.headers["X-RateLimit-Reset"] = str(
-                int(current_time + self.window_seconds)
-            )
+        # 응답 시작 메시지에 Rate limit 헤더 추가
+        limit_headers = self._limit_headers(ip_result, current_time)
 
-        return response
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for key, value in limit_headers.items():
+                    headers[key] = value
+            await send(message)
 
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,68 @@
+"""
+HTTP 요청 타이밍 미들웨어 (ASGI)
+라우트별 첫 바이트까지 시간(TTFB)과 전체 응답 시간을 히스토그램으로 기록
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.utils.metrics import registry
+
+HTTP_DURATION_METRIC = "reco_http_request_duration_seconds"
+HTTP_TTFB_METRIC = "reco_http_time_to_first_byte_seconds"
+
+
+def _route_label(scope: Scope) -> str:
+    """라벨 카디널리티 제한을 위해 실제 경로 대신 라우트 템플릿 사용"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """요청 지연시간 계측 미들웨어 (스트리밍 응답은 마지막 body 전송까지 측정)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            registry.observe(
+                HTTP_DURATION_METRIC,
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=_route_label(scope),
+                status=status_code,
+            )
+
+        async def timed_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                registry.observe(
+                    HTTP_TTFB_METRIC,
+                    time.perf_counter() - start,
+                    method=scope["method"],
+                    route=_route_label(scope),
+                )
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            # 예외/클라이언트 연결 종료로 마지막 body가 전송되지 않은 경우
+            record()
@@ -0,0 +1,21 @@
+"""
+후보 검색 모듈 (BM25, 임베딩 ANN 인덱스, 하이브리드 결합)
+"""
+
+from .candidates import RETRIEVAL_ENABLED, retrieve_candidate_sellers
+from .hybrid import hybrid_search, reciprocal_rank_fusion
+from .lexical import BM25Index, build_lexical_index, get_lexical_index
+from .semantic import SemanticIndex, build_semantic_index, get_semantic_index
+
+__all__ = [
+    "RETRIEVAL_ENABLED",
+    "retrieve_candidate_sellers",
+    "hybrid_search",
+    "reciprocal_rank_fusion",
+    "BM25Index",
+    "build_lexical_index",
+    "get_lexical_index",
+    "SemanticIndex",
+    "build_semantic_index",
+    "get_semantic_index",
+]
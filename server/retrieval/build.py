@@ -0,0 +1,20 @@
+"""
+검색 인덱스 생성 스크립트 (오프라인 작업)
+DB 상품 텍스트를 한 번 읽어 의미 검색(IVF) / BM25 인덱스를 모두 생성
+
+사용법:
+    python -m server.retrieval.build
+"""
+
+from server.retrieval.lexical import build_lexical_index
+from server.retrieval.semantic import build_semantic_index, load_product_texts
+
+
+def build_all() -> None:
+    products = load_product_texts()
+    build_semantic_index(products=products)
+    build_lexical_index(products=products)
+
+
+if __name__ == "__main__":
+    build_all()
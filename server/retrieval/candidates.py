@@ -0,0 +1,116 @@
+"""
+후보 판매자 검색 (에이전트 앞단)
+BM25 + 의미 검색 하이브리드로 사용자 필터 안의 상품 top-k를 찾아 판매자별로 묶는다.
+에이전트는 이 후보가 있으면 조회수 상위 목록 대신 사용한다.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server.db.product_service import (
+    filter_product_ids,
+    get_catalogue_stats,
+    get_sellers_by_product_ids,
+)
+from server.retrieval.hybrid import hybrid_search
+from server.retrieval.lexical import get_lexical_index
+from server.retrieval.semantic import get_semantic_index
+from server.utils.logger import get_logger
+from server.utils.metrics import timed
+
+logger = get_logger(__name__)
+
+RETRIEVAL_ENABLED = os.getenv("RETRIEVAL_ENABLED", "true").lower() == "true"
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "50"))
+# 카탈로그 상품 수 / 최대 product_id 재조회 주기 (초), 인덱스가 이보다 뒤처지면 사용하지 않음
+RETRIEVAL_FRESHNESS_TTL_SECONDS = int(os.getenv("RETRIEVAL_FRESHNESS_TTL_SECONDS", "60"))
+
+
+class _CatalogueStatsCache:
+    """get_catalogue_stats 결과를 TTL 동안 재사용 (조회 실패 시 None → 최신 여부 확인 생략)"""
+
+    def __init__(self):
+        self._value: Optional[Dict[str, int]] = None
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Dict[str, int]]:
+        if time.monotonic() - self._loaded_at >= RETRIEVAL_FRESHNESS_TTL_SECONDS:
+            with self._lock:
+                if time.monotonic() - self._loaded_at >= RETRIEVAL_FRESHNESS_TTL_SECONDS:
+                    try:
+                        self._value = get_catalogue_stats()
+                    except Exception:
+                        logger.exception("카탈로그 통계 조회 실패")
+                        self._value = None
+                    self._loaded_at = time.monotonic()
+        return self._value
+
+
+_catalogue_stats = _CatalogueStatsCache()
+
+
+def is_index_stale(index_ids: np.ndarray, stats: Optional[Dict[str, int]]) -> bool:
+    """인덱스가 카탈로그보다 오래됨 (상품 수가 적거나 최대 product_id가 작음 → 새 상품 누락)"""
+    if stats is None:
+        return False
+    index_max_id = int(index_ids.max()) if len(index_ids) else 0
+    return len(index_ids) < stats["product_count"] or index_max_id < stats["max_product_id"]
+
+
+@timed("tool")
+def retrieve_candidate_sellers(
+    query: str,
+    category: Optional[str] = None,
+    category_top: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    condition: Optional[str] = None,
+    k: int = RETRIEVAL_TOP_K,
+    sell_method: Optional[str] = None,
+    delivery_fee: Optional[str] = None,
+    is_safe: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    검색어 기반 후보 판매자 조회
+
+    Returns:
+        (판매자별로 그룹화된 상품 리스트, 검색 정보)
+        인덱스가 없거나 카탈로그보다 오래되었으면 빈 리스트 (에이전트가 기존 조회로 대체)
+    """
+    lexical = get_lexical_index()
+    semantic = get_semantic_index()
+    if (lexical is None and semantic is None) or not query:
+        return [], {"method": None}
+
+    # 마지막 인덱스 생성 이후 추가된 상품이 추천에서 빠지지 않도록 오래된 인덱스는 사용하지 않음
+    stats = _catalogue_stats.get()
+    if lexical is not None and is_index_stale(lexical.ids, stats):
+        lexical = None
+    if semantic is not None and is_index_stale(semantic.ivf.ids, stats):
+        semantic = None
+    if lexical is None and semantic is None:
+        logger.warning("검색 인덱스가 카탈로그보다 오래됨, 기존 조회로 대체 (python -m server.retrieval.build)",
+                       extra={"catalogue": stats})
+        return [], {"method": None, "stale_index": True}
+
+    allowed_ids = None
+    if any(v is not None for v in (category, category_top, price_min, price_max, condition,
+                                   sell_method, delivery_fee, is_safe)):
+        allowed_ids = filter_product_ids(category, category_top, price_min, price_max, condition,
+                                         sell_method, delivery_fee, is_safe)
+
+    product_ids, scores, retriever_counts = hybrid_search(
+        query, k, lexical, semantic, allowed_ids=allowed_ids)
+    sellers = get_sellers_by_product_ids(product_ids.tolist())
+    return sellers, {
+        "method": "hybrid" if len(retriever_counts) == 2 else next(iter(retriever_counts)),
+        "retriever_counts": retriever_counts,
+        "product_count": len(product_ids),
+        "seller_count": len(sellers),
+        "top_score": float(scores[0]) if len(scores) else None,
+    }
@@ -0,0 +1,92 @@
+"""
+상품 텍스트 임베딩
+문자 n-gram 해싱(HashingVectorizer) → TruncatedSVD 차원 축소 → L2 정규화
+
+- 외부 모델 없이 scikit-learn만 사용 (오프라인 학습, 추론은 행렬 곱 한 번)
+- 문자 n-gram이라 "아이폰14" / "아이폰 14" 같은 띄어쓰기 차이에도 가까운 벡터가 나옴
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# 해싱 차원 / 임베딩 차원 (SVD 성분 행렬 크기 = N_FEATURES x DIM x 4바이트)
+DEFAULT_N_FEATURES = 2 ** 16
+DEFAULT_DIM = 96
+DEFAULT_NGRAM_RANGE = (2, 3)
+# SVD 학습에 사용하는 최대 문서 수
+SVD_SAMPLE_SIZE = 50000
+
+
+class HashedSVDEmbedder:
+    """해싱 n-gram + SVD 임베더 (fit 이후 components만 저장하면 재현 가능)"""
+
+    def __init__(
+        self,
+        n_features: int = DEFAULT_N_FEATURES,
+        dim: int = DEFAULT_DIM,
+        ngram_range: Sequence[int] = DEFAULT_NGRAM_RANGE,
+        components: Optional[np.ndarray] = None,
+    ):
+        self.n_features = n_features
+        self.dim = dim
+        self.ngram_range = tuple(ngram_range)
+        self.components = components
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=self.ngram_range,
+            n_features=n_features,
+            alternate_sign=False,
+            norm="l2",
+            lowercase=True,
+        )
+
+    def fit(self, texts: Sequence[str], seed: int = 0) -> "HashedSVDEmbedder":
+        """문서 샘플로 SVD 성분 학습"""
+        from sklearn.decomposition import TruncatedSVD
+
+        if len(texts) > SVD_SAMPLE_SIZE:
+            rng = np.random.default_rng(seed)
+            texts = [texts[i] for i in rng.choice(len(texts), SVD_SAMPLE_SIZE, replace=False)]
+
+        hashed = self._vectorizer.transform(texts)
+        # 성분 수는 문서 수/특성 수보다 작아야 함
+        dim = max(1, min(self.dim, hashed.shape[0] - 1, hashed.shape[1] - 1))
+        svd = TruncatedSVD(n_components=dim, random_state=seed)
+        svd.fit(hashed)
+        self.dim = dim
+        self.components = svd.components_.astype(np.float32)
+        return self
+
+    def transform(self, texts: Sequence[str], batch_size: int = 10000) -> np.ndarray:
+        """텍스트 → L2 정규화된 float32 임베딩 (n, dim)"""
+        if self.components is None:
+            raise RuntimeError("임베더가 학습되지 않았습니다 (fit 먼저 호출)")
+
+        out = np.empty((len(texts), self.components.shape[0]), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            hashed = self._vectorizer.transform(texts[start:start + batch_size])
+            out[start:start + batch_size] = hashed @ self.components.T
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        out /= np.maximum(norms, 1e-12)
+        return out
+
+    def encode(self, text: str) -> np.ndarray:
+        """단일 질의 임베딩 (dim,)"""
+        return self.transform([text])[0]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """npz 저장용 배열"""
+        return {
+            "embedder_components": self.components,
+            "embedder_config": np.array(
+                [self.n_features, self.ngram_range[0], self.ngram_range[1]], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "HashedSVDEmbedder":
+        n_features, ngram_min, ngram_max = (int(v) for v in arrays["embedder_config"])
+        components = np.asarray(arrays["embedder_components"], dtype=np.float32)
+        return cls(n_features=n_features, dim=components.shape[0],
+                   ngram_range=(ngram_min, ngram_max), components=components)
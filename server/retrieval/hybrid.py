@@ -0,0 +1,81 @@
+"""
+하이브리드 검색 (BM25 + 의미 검색)
+두 검색을 병렬로 실행하고 reciprocal-rank fusion으로 합친다.
+BM25는 모델 번호 등 정확한 토큰을, 의미 검색은 띄어쓰기/표기 차이와 유사어를 보완한다.
+
+    score(d) = Σ weight_r / (HYBRID_RRF_K + rank_r(d))
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from server.retrieval.lexical import BM25Index
+from server.retrieval.semantic import SemanticIndex
+
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+HYBRID_SEMANTIC_WEIGHT = float(os.getenv("HYBRID_SEMANTIC_WEIGHT", "1.0"))
+# 각 검색기에서 가져올 후보 수 (k의 배수)
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, np.ndarray], weights: Dict[str, float], k: int, rrf_k: int = HYBRID_RRF_K
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    순위 리스트 RRF 결합
+
+    Args:
+        rankings: 검색기 이름 → 순위순 product_id 배열
+        weights: 검색기 이름 → 가중치
+        k: 결과 수
+
+    Returns:
+        (product_ids, fused_scores) 점수 내림차순
+    """
+    parts = [(ids, weights.get(name, 1.0)) for name, ids in rankings.items() if len(ids)]
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    all_ids = np.concatenate([ids for ids, _ in parts]).astype(np.int64)
+    contributions = np.concatenate([
+        weight / (rrf_k + np.arange(1, len(ids) + 1, dtype=np.float64)) for ids, weight in parts
+    ])
+    unique_ids, inverse = np.unique(all_ids, return_inverse=True)
+    fused = np.bincount(inverse, weights=contributions, minlength=len(unique_ids))
+    order = np.argsort(-fused, kind="stable")[:k]
+    return unique_ids[order], fused[order].astype(np.float32)
+
+
+def hybrid_search(
+    query: str,
+    k: int,
+    lexical: Optional[BM25Index],
+    semantic: Optional[SemanticIndex],
+    allowed_ids: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+    """
+    BM25 / 의미 검색 병렬 실행 후 RRF 결합 (한쪽 인덱스만 있으면 그 결과만 사용)
+
+    Returns:
+        (product_ids, fused_scores, 검색기별 결과 수)
+    """
+    depth = k * max(1, HYBRID_CANDIDATE_FACTOR)
+    futures = {}
+    if lexical is not None:
+        futures["lexical"] = _executor.submit(lexical.search, query, depth, allowed_ids)
+    if semantic is not None:
+        futures["semantic"] = _executor.submit(semantic.search, query, depth, allowed_ids)
+
+    rankings = {name: future.result()[0] for name, future in futures.items()}
+    product_ids, scores = reciprocal_rank_fusion(
+        rankings,
+        {"lexical": HYBRID_LEXICAL_WEIGHT, "semantic": HYBRID_SEMANTIC_WEIGHT},
+        k,
+    )
+    return product_ids, scores, {name: len(ids) for name, ids in rankings.items()}
@@ -0,0 +1,50 @@
+"""
+검색 인덱스 파일 저장/지연 로드
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+import numpy as np
+
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def save_npz(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """npz로 저장 (임시 파일에 쓴 뒤 교체하여 읽는 쪽이 절반만 쓰인 파일을 보지 않음)"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, target)
+
+
+class IndexFile(Generic[T]):
+    """인덱스 파일 지연 로드 (파일이 교체되면 다시 로드, 없으면 None)"""
+
+    def __init__(self, path: str, loader: Callable[[str], T]):
+        self.path = path
+        self.loader = loader
+        self._index: Optional[T] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._index = self.loader(self.path)
+                    self._mtime = mtime
+                    logger.info(f"검색 인덱스 로드: {self.path}")
+        return self._index
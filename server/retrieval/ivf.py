@@ -0,0 +1,141 @@
+"""
+IVF(inverted file) 근사 최근접 이웃 인덱스
+MiniBatchKMeans 중심점으로 벡터를 리스트에 나누고, 질의와 가까운 n_probe개 리스트만
+내적(코사인)으로 점수화한다. 벡터는 리스트 순서로 정렬해 연속 메모리로 저장.
+
+필터(허용 행 마스크)가 있으면 프로브한 리스트에서 허용 행만 점수화하고,
+결과가 k개보다 적으면 프로브 수를 늘린다. 허용 행이 적으면 전수 탐색이 더 빠르므로 바로 전수 탐색.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 허용 행 수가 k * 이 값 이하이면 전수 탐색
+_BRUTE_FORCE_FACTOR = 20
+
+
+class IVFIndex:
+    """정규화된 벡터용 IVF 인덱스 (점수 = 내적)"""
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        list_offsets: np.ndarray,
+    ):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.list_offsets = list_offsets
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls, vectors: np.ndarray, ids: np.ndarray, n_lists: Optional[int] = None, seed: int = 0
+    ) -> "IVFIndex":
+        """
+        인덱스 생성
+
+        Args:
+            vectors: (n, dim) 정규화된 벡터
+            ids: (n,) 벡터별 ID (product_id)
+            n_lists: 리스트 수 (기본 sqrt(n))
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        n = len(vectors)
+        if n == 0:
+            dim = vectors.shape[1] if vectors.ndim == 2 else 0
+            return cls(np.zeros((0, dim), np.float32), vectors.reshape(0, dim), ids,
+                       np.zeros(1, np.int64))
+
+        n_lists = max(1, min(n_lists or int(np.sqrt(n)), n))
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_lists, random_state=seed, batch_size=4096, n_init=3)
+        assignments = kmeans.fit_predict(vectors)
+
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=n_lists)
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(counts, out=list_offsets[1:])
+        return cls(kmeans.cluster_centers_.astype(np.float32), vectors[order], ids[order],
+                   list_offsets)
+
+    def _probe_rows(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        nearest = np.argsort(-(self.centroids @ query))[:n_probe]
+        return np.concatenate([
+            np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in nearest
+        ]) if len(nearest) else np.zeros(0, dtype=np.int64)
+
+    @staticmethod
+    def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        n_probe: int = 8,
+        allowed: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        상위 k개 검색
+
+        Args:
+            query: (dim,) 정규화된 질의 벡터
+            k: 결과 수
+            n_probe: 탐색할 리스트 수
+            allowed: (n,) 인덱스 행 순서의 허용 마스크 (None이면 전체)
+
+        Returns:
+            (ids, scores) 점수 내림차순
+        """
+        if len(self) == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+
+        if allowed is not None and int(allowed.sum()) <= k * _BRUTE_FORCE_FACTOR:
+            rows = np.flatnonzero(allowed)
+        else:
+            n_probe = max(1, min(n_probe, self.n_lists))
+            while True:
+                rows = self._probe_rows(query, n_probe)
+                if allowed is not None:
+                    rows = rows[allowed[rows]]
+                if len(rows) >= k or n_probe >= self.n_lists:
+                    break
+                n_probe = min(n_probe * 2, self.n_lists)
+
+        rows, scores = self._top_k(rows, self.vectors[rows] @ query, k)
+        return self.ids[rows], scores
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "ivf_centroids": self.centroids,
+            "ivf_vectors": self.vectors,
+            "ivf_ids": self.ids,
+            "ivf_list_offsets": self.list_offsets,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "IVFIndex":
+        return cls(
+            np.asarray(arrays["ivf_centroids"], dtype=np.float32),
+            np.asarray(arrays["ivf_vectors"], dtype=np.float32),
+            np.asarray(arrays["ivf_ids"], dtype=np.int64),
+            np.asarray(arrays["ivf_list_offsets"], dtype=np.int64),
+        )
@@ -0,0 +1,191 @@
+"""
+BM25 어휘 검색 인덱스
+한국어 매물 제목의 띄어쓰기 차이("아이폰14" / "아이폰 14", "갤럭시탭" / "갤럭시 탭")를
+토큰화 단계에서 흡수하고, 모델 번호("s23", "a7m4")는 그대로 정확히 매칭한다.
+
+- 한글 / 영문·숫자 연속 구간을 각각 토큰으로 분리
+- 3글자 이상 한글 구간은 음절 bigram도 추가
+- 영문+숫자가 섞인 구간은 전체 토큰과 영문/숫자 부분 토큰을 함께 사용
+- 용어별 posting(문서 ID, tf)은 CSC 배열로 저장하여 질의 시 numpy로 점수 누적
+"""
+
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from server.retrieval.index_file import IndexFile, save_npz
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", "./data/retrieval/bm25_index.npz")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_RUN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+_ALNUM_PARTS = re.compile(r"[a-z]+|[0-9]+")
+_STOP_WORDS = {"의", "을", "를", "이", "가", "은", "는", "에", "에서", "로", "으로",
+               "와", "과", "도", "만", "까지", "부터"}
+
+
+def tokenize(text: str) -> List[str]:
+    """매물 텍스트 / 검색어 토큰화 (색인과 질의에 같은 규칙 적용)"""
+    tokens: List[str] = []
+    for run in _RUN_PATTERN.findall((text or "").lower()):
+        if run in _STOP_WORDS:
+            continue
+        tokens.append(run)
+        if "가" <= run[0] <= "힣":
+            if len(run) >= 3:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            parts = _ALNUM_PARTS.findall(run)
+            if len(parts) > 1:
+                tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """CSC posting 기반 BM25 인덱스"""
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        ids: np.ndarray,
+    ):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.ids = ids
+        n_docs = len(ids)
+        doc_freq = np.diff(indptr)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        avg_length = float(doc_lengths.mean()) if n_docs else 0.0
+        # 문서 길이 정규화 항 k1 * (1 - b + b * len / avg)
+        self._length_norm = (
+            BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(avg_length, 1e-9))
+        ).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, product_ids: Sequence[int], texts: Sequence[str]) -> "BM25Index":
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(analyzer=tokenize)
+        try:
+            counts = vectorizer.fit_transform(texts).tocsc()
+            vocabulary = {term: int(i) for term, i in vectorizer.vocabulary_.items()}
+        except ValueError:
+            # 빈 카탈로그 / 토큰이 하나도 없는 경우
+            return cls({}, np.zeros(1, np.int64), np.zeros(0, np.int32), np.zeros(0, np.float32),
+                       np.zeros(len(texts), np.float32), np.asarray(product_ids, dtype=np.int64))
+
+        counts.sort_indices()
+        return cls(
+            vocabulary,
+            counts.indptr.astype(np.int64),
+            counts.indices.astype(np.int32),
+            counts.data.astype(np.float32),
+            np.asarray(counts.sum(axis=1)).ravel().astype(np.float32),
+            np.asarray(product_ids, dtype=np.int64),
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """전체 문서의 BM25 점수 (n,)"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            scores[docs] += self.idf[term_id] * tf * (BM25_K1 + 1) / (tf + self._length_norm[docs])
+        return scores
+
+    def search(
+        self, query: str, k: int, allowed_ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 상위 k개 (점수 0인 문서 제외)
+
+        Returns:
+            (product_ids, scores) 점수 내림차순
+        """
+        scores = self.scores(query)
+        if allowed_ids is not None:
+            scores[~np.isin(self.ids, allowed_ids)] = 0.0
+        rows = np.flatnonzero(scores > 0)
+        if len(rows) > k:
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+        return self.ids[rows], scores[rows]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        terms = [""] * len(self.vocabulary)
+        for term, i in self.vocabulary.items():
+            terms[i] = term
+        return {
+            "bm25_terms": np.array(json.dumps(terms, ensure_ascii=False)),
+            "bm25_indptr": self.indptr,
+            "bm25_doc_ids": self.doc_ids,
+            "bm25_term_freqs": self.term_freqs,
+            "bm25_doc_lengths": self.doc_lengths,
+            "bm25_ids": self.ids,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "BM25Index":
+        terms = json.loads(str(arrays["bm25_terms"]))
+        return cls(
+            {term: i for i, term in enumerate(terms)},
+            np.asarray(arrays["bm25_indptr"]), np.asarray(arrays["bm25_doc_ids"]),
+            np.asarray(arrays["bm25_term_freqs"]), np.asarray(arrays["bm25_doc_lengths"]),
+            np.asarray(arrays["bm25_ids"]),
+        )
+
+    def save(self, path: str) -> None:
+        save_npz(path, self.to_arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with np.load(path) as arrays:
+            return cls.from_arrays(arrays)
+
+
+def build_lexical_index(
+    path: str = LEXICAL_INDEX_PATH,
+    products: Optional[Tuple[List[int], List[str]]] = None,
+) -> BM25Index:
+    """DB의 전체 상품으로 BM25 인덱스 생성 후 저장 (오프라인 작업)"""
+    from server.retrieval.semantic import load_product_texts
+
+    start = time.perf_counter()
+    product_ids, texts = products or load_product_texts()
+    index = BM25Index.build(product_ids, texts)
+    index.save(path)
+    logger.info(
+        f"BM25 인덱스 생성: 상품 {len(index)}개, 용어 {len(index.vocabulary)}개, "
+        f"{time.perf_counter() - start:.1f}s → {path}")
+    return index
+
+
+_index_file = IndexFile(LEXICAL_INDEX_PATH, BM25Index.load)
+
+
+def get_lexical_index() -> Optional[BM25Index]:
+    """현재 BM25 인덱스 (파일이 없으면 None)"""
+    return _index_file.get()
@@ -0,0 +1,127 @@
+"""
+의미 기반 상품 검색 인덱스
+오프라인으로 상품 제목/설명 임베딩과 IVF 인덱스를 만들어 npz 파일 하나로 저장하고,
+서버는 파일을 읽어 질의 임베딩 → 필터 적용 top-k 검색만 수행한다.
+
+인덱스 생성:
+    python -m server.retrieval.build
+"""
+
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from server.retrieval.embedding import HashedSVDEmbedder
+from server.retrieval.index_file import IndexFile, save_npz
+from server.retrieval.ivf import IVFIndex
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEMANTIC_INDEX_PATH = os.getenv("SEMANTIC_INDEX_PATH", "./data/retrieval/semantic_index.npz")
+SEMANTIC_N_PROBE = int(os.getenv("SEMANTIC_N_PROBE", "8"))
+
+# 임베딩 텍스트에 포함할 설명 길이 (제목 비중 유지)
+_DESCRIPTION_CHARS = 300
+
+
+def product_text(title: Optional[str], description: Optional[str]) -> str:
+    """임베딩 입력 텍스트 (제목을 두 번 넣어 가중)"""
+    title = title or ""
+    return f"{title} {title} {(description or '')[:_DESCRIPTION_CHARS]}"
+
+
+class SemanticIndex:
+    """임베더 + IVF 인덱스"""
+
+    def __init__(self, embedder: HashedSVDEmbedder, ivf: IVFIndex, built_at: float):
+        self.embedder = embedder
+        self.ivf = ivf
+        self.built_at = built_at
+
+    def __len__(self) -> int:
+        return len(self.ivf)
+
+    @classmethod
+    def build(
+        cls, product_ids: Sequence[int], texts: Sequence[str], n_lists: Optional[int] = None
+    ) -> "SemanticIndex":
+        embedder = HashedSVDEmbedder().fit(texts)
+        vectors = embedder.transform(texts)
+        return cls(embedder, IVFIndex.build(vectors, np.asarray(product_ids), n_lists),
+                   time.time())
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed_ids: Optional[np.ndarray] = None,
+        n_probe: int = SEMANTIC_N_PROBE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의와 가까운 상품 top-k
+
+        Args:
+            query: 검색어
+            k: 결과 수
+            allowed_ids: 허용 product_id (사전 필터, None이면 전체)
+
+        Returns:
+            (product_ids, scores) 유사도 내림차순
+        """
+        allowed = None
+        if allowed_ids is not None:
+            allowed = np.isin(self.ivf.ids, allowed_ids)
+        return self.ivf.search(self.embedder.encode(query), k, n_probe=n_probe, allowed=allowed)
+
+    def save(self, path: str) -> None:
+        save_npz(path, {"built_at": np.array(self.built_at),
+                        **self.embedder.to_arrays(), **self.ivf.to_arrays()})
+
+    @classmethod
+    def load(cls, path: str) -> "SemanticIndex":
+        with np.load(path) as arrays:
+            return cls(HashedSVDEmbedder.from_arrays(arrays), IVFIndex.from_arrays(arrays),
+                       float(arrays["built_at"]))
+
+
+def load_product_texts() -> Tuple[List[int], List[str]]:
+    """인덱스 생성용 (product_id, 텍스트) 전체 조회"""
+    from server.db.database import ReadSessionLocal
+    from server.db.models import Product
+
+    db = ReadSessionLocal()
+    try:
+        rows = db.execute(
+            select(Product.product_id, Product.title, Product.description)
+            .order_by(Product.product_id)
+        ).all()
+    finally:
+        db.close()
+    return [row[0] for row in rows], [product_text(row[1], row[2]) for row in rows]
+
+
+def build_semantic_index(
+    path: str = SEMANTIC_INDEX_PATH,
+    products: Optional[Tuple[List[int], List[str]]] = None,
+) -> SemanticIndex:
+    """DB의 전체 상품으로 인덱스 생성 후 저장 (오프라인 작업)"""
+    start = time.perf_counter()
+    product_ids, texts = products or load_product_texts()
+    index = SemanticIndex.build(product_ids, texts)
+    index.save(path)
+    logger.info(
+        f"의미 검색 인덱스 생성: 상품 {len(index)}개, 리스트 {index.ivf.n_lists}개, "
+        f"{time.perf_counter() - start:.1f}s → {path}")
+    return index
+
+
+_index_file = IndexFile(SEMANTIC_INDEX_PATH, SemanticIndex.load)
+
+
+def get_semantic_index() -> Optional[SemanticIndex]:
+    """현재 인덱스 (파일이 없으면 None)"""
+    return _index_file.get()
@@ -4,5 +4,6 @@ FastAPI 라우터 모듈
 
 from .workflow import router as workflow_router
 from .history import router as history_router
+from .metrics import router as metrics_router
 
-__all__ = ["workflow_router", "history_router"]
+__all__ = ["workflow_router", "history_router", "metrics_router"]
@@ -2,51 +2,36 @@
 히스토리 라우터
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from server.db.database import Database
-from server.db.schemas import HistoryResponse, HistoryRequest
-from server.db.models import History
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from server.db.schemas import HistoryPage, HistoryRequest
+from server.db.history_service import list_history_async, save_history_async
 
 router = APIRouter(prefix="/api/v1/history", tags=["history"])
 
-database = Database()
 
-
-def get_db():
-    """DB 세션 의존성"""
-    db = next(database.get_session())
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.get("/", response_model=List[HistoryResponse])
+@router.get("/", response_model=HistoryPage)
 async def get_history(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
+    limit: int = Query(default=100, ge=1, le=500),
+    include_results: bool = Query(default=False, description="user_input/results 포함 여부")
 ):
-    """히스토리 조회"""
-    history = db.query(History).offset(skip).limit(limit).all()
-    return history
-
-
-@router.post("/")
-async def create_history(
-    history_data: HistoryRequest,
-    db: Session = Depends(get_db)
-):
-    """히스토리 저장"""
-    history = History(
-        user_input=history_data.user_input.dict(),
-        search_query=history_data.search_query,
-        persona_type=None,  # 페르소나 사용 안 함
-        results=[r.dict() for r in history_data.results]
-    )
-    db.add(history)
-    db.commit()
-    db.refresh(history)
-    return history
+    """히스토리 조회 (최신순, 커서 페이지네이션)"""
+    try:
+        return await list_history_async(
+            cursor=cursor, limit=limit, include_results=include_results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/", status_code=202)
+async def create_history(history_data: HistoryRequest):
+    """히스토리 저장 (write-behind 큐에 넣고 바로 반환)"""
+    values = {
+        "user_input": history_data.user_input.dict(),
+        "search_query": history_data.search_query,
+        "persona_type": None,  # 페르소나 사용 안 함
+        "results": [r.dict() for r in history_data.results],
+    }
+    await save_history_async(values)
+    return {"status": "queued", **values}
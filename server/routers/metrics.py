@@ -0,0 +1,22 @@
+"""
+메트릭 라우터
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from server.utils.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus 스크레이프 엔드포인트
+    노드/도구/LLM/DB 구간별 지연시간 히스토그램과 LLM 토큰 카운터
+    """
+    return PlainTextResponse(
+        registry.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -12,10 +12,10 @@ from server.workflow.state import RecommendationState
 from server.workflow.graph import recommendation_workflow
 from server.utils.logger import get_logger
 from server.utils import config
+from server.utils.metrics import TimingCollector, collect_timings
 from server.db.conversation_service import (
-    get_or_create_conversation,
-    add_message,
-    get_conversation_context
+    append_and_get_context_async,
+    enqueue_message_async
 )
 import time
 
@@ -34,28 +34,30 @@ def get_workflow_app():
     return _workflow_app
 
 
+def _invoke_with_timings(workflow_app, initial_state, collector: TimingCollector):
+    """executor 스레드에서 span 수집 컨텍스트를 설정하고 워크플로우 실행"""
+    with collect_timings(collector):
+        return workflow_app.invoke(initial_state)
+
+
 @router.post("/recommend")
-async def recommend_products(user_input: UserInput) -> Dict[str, Any]:
+async def recommend_products(user_input: UserInput, timings: bool = False) -> Dict[str, Any]:
     """
     상품 추천 API
+
+    Args:
+        timings: true이면 노드/도구/LLM/DB 구간별 소요 시간(timings)을 응답에 포함
     """
     try:
-        # 대화 세션 관리
-        session_id = user_input.session_id
-        conversation = get_or_create_conversation(session_id=session_id)
-        session_id = conversation.session_id
-
-        # 사용자 메시지 저장
-        add_message(
-            session_id=session_id,
+        # 세션 upsert + 사용자 메시지 저장 + 최근 대화 컨텍스트 조회 (단일 트랜잭션)
+        session_id, conversation_context = await append_and_get_context_async(
+            session_id=user_input.session_id,
             role="user",
             content=user_input.search_query,
-            metadata={"user_input": user_input.dict()}
+            metadata={"user_input": user_input.dict()},
+            limit=10,
         )
 
-        # 이전 대화 컨텍스트 조회
-        conversation_context = get_conversation_context(session_id, limit=10)
-
         # user_input에 대화 컨텍스트 추가
         user_input_dict = user_input.dict()
         user_input_dict["conversation_context"] = conversation_context
@@ -81,9 +83,17 @@ async def recommend_products(user_input: UserInput) -> Dict[str, Any]:
             }
         )
 
+        collector = TimingCollector() if timings else None
+
         try:
+            if collector is not None:
+                workflow_call = loop.run_in_executor(
+                    None, _invoke_with_timings, workflow_app, initial_state, collector)
+            else:
+                workflow_call = loop.run_in_executor(
+                    None, workflow_app.invoke, initial_state)
             final_state = await asyncio.wait_for(
-                loop.run_in_executor(None, workflow_app.invoke, initial_state),
+                workflow_call,
                 timeout=config.WORKFLOW_TIMEOUT_SECONDS,
             )
 
@@ -198,10 +208,16 @@ async def recommend_products(user_input: UserInput) -> Dict[str, Any]:
             "execution_time": execution_time,  # 계산된 실행 시간 사용
             "session_id": session_id,  # 세션 ID 반환
         })
-
-        # Assistant 메시지 저장
+        if final_state.get("retrieval_info"):
+            response["retrieval"] = final_state["retrieval_info"]
+        if final_state.get("candidate_pools"):
+            response["candidate_pools"] = final_state["candidate_pools"]
+        if collector is not None:
+            response["timings"] = collector.to_dict()
+
+        # Assistant 메시지 저장 (write-behind)
         if not final_state.get("error_message"):
-            add_message(
+            await enqueue_message_async(
                 session_id=session_id,
                 role="assistant",
                 content=f"추천 완료: {len(final_item_scores)}개 상품",
@@ -227,22 +243,15 @@ async def stream_workflow_progress(
     워크플로우 진행 상황을 SSE로 스트리밍
     """
     try:
-        # 대화 세션 관리
-        session_id = user_input.session_id
-        conversation = get_or_create_conversation(session_id=session_id)
-        session_id = conversation.session_id
-
-        # 사용자 메시지 저장
-        add_message(
-            session_id=session_id,
+        # 세션 upsert + 사용자 메시지 저장 + 최근 대화 컨텍스트 조회 (단일 트랜잭션)
+        session_id, conversation_context = await append_and_get_context_async(
+            session_id=user_input.session_id,
             role="user",
             content=user_input.search_query,
-            metadata={"user_input": user_input.dict()}
+            metadata={"user_input": user_input.dict()},
+            limit=10,
         )
 
-        # 이전 대화 컨텍스트 조회
-        conversation_context = get_conversation_context(session_id, limit=10)
-
         # user_input에 대화 컨텍스트 추가
         user_input_dict = user_input.dict()
         user_input_dict["conversation_context"] = conversation_context
@@ -267,6 +276,7 @@ async def stream_workflow_progress(
         step_weights = {
             "start": 0,
             "initialized": 20,
+            "candidates_retrieved": 30,
             "price_analyzed": 50,
             "safety_analyzed": 50,
             "recommendation_completed": 100,
@@ -305,7 +315,7 @@ async def stream_workflow_progress(
                         progress = step_weights[current_step]
                     elif len(completed_steps) > 0:
                         # 완료된 단계 수에 따라 진행률 계산
-                        total_steps = 4  # init, price, safety, orchestrator
+                        total_steps = 5  # init, candidates, price, safety, orchestrator
                         progress = min(
                             int((len(completed_steps) / total_steps) * 100), 90)
 
@@ -313,6 +323,7 @@ async def stream_workflow_progress(
                     messages = {
                         "start": "워크플로우 시작",
                         "initialized": "검색 쿼리 생성 완료",
+                        "candidates_retrieved": "후보 판매자 검색 완료",
                         "price_analyzed": "상품 특성 분석 완료",
                         "safety_analyzed": "신뢰도 분석 완료",
                         "recommendation_completed": "추천 완료",
@@ -359,8 +370,8 @@ async def stream_workflow_progress(
                         }
                         yield f"data: {json.dumps(final_data, ensure_ascii=False)}\n\n"
 
-                        # Assistant 메시지 저장
-                        add_message(
+                        # Assistant 메시지 저장 (write-behind)
+                        await enqueue_message_async(
                             session_id=session_id,
                             role="assistant",
                             content=f"추천 완료: {len(node_state.get('final_item_scores', []))}개 상품",
@@ -4,14 +4,122 @@ LLM 기반 자율 의사결정 에이전트 유틸리티
 """
 
 import os
-from typing import Dict, Any, Optional, List
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Type, TypeVar
 import time
+from functools import lru_cache
 from openai import OpenAI
+from pydantic import BaseModel, ValidationError
 from server.utils import config
+from server.utils.logger import get_logger
+from server.utils.metrics import Span, record_llm_tokens, span
+
+logger = get_logger(__name__)
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")
 
+# LLM 응답 record/replay 캐시 (오프라인 평가용)
+# off: 사용 안 함, record: 호출 결과 저장(캐시 히트 시 재사용), replay: 캐시만 사용 (미스 시 fallback)
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "off").lower()
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+
+
+class LLMResponseCache:
+    """입력 해시(model + messages + format) 기반 LLM 응답 파일 캐시"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], format: str) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "format": format},
+            ensure_ascii=False, sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def configure_llm_cache(mode: str = "off", directory: Optional[str] = None) -> None:
+    """record/replay 캐시 모드 설정 (평가 스크립트 등에서 호출)"""
+    global LLM_CACHE_MODE, LLM_CACHE_DIR, _llm_cache
+    if mode not in ("off", "record", "replay"):
+        raise ValueError(f"지원하지 않는 LLM 캐시 모드: {mode}")
+    LLM_CACHE_MODE = mode
+    if directory:
+        LLM_CACHE_DIR = directory
+    _llm_cache = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    global _llm_cache
+    if LLM_CACHE_MODE == "off":
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache(LLM_CACHE_DIR)
+    return _llm_cache
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def strict_json_schema(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    pydantic 모델 → structured outputs용 response_format
+    strict 모드 규칙에 맞게 모든 객체에 additionalProperties=false, 전체 필드 required 적용
+    """
+    def _strict(node: Any) -> Any:
+        if isinstance(node, dict):
+            node = {k: _strict(v) for k, v in node.items()
+                    if not (k in ("title", "default") and not isinstance(v, dict))}
+            if node.get("type") == "object" and "properties" in node:
+                node["additionalProperties"] = False
+                node["required"] = list(node["properties"])
+            return node
+        if isinstance(node, list):
+            return [_strict(item) for item in node]
+        return node
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "strict": True,
+            "schema": _strict(schema.model_json_schema()),
+        },
+    }
+
 
 class LLMAgent:
     """LLM 기반 의사결정 에이전트"""
@@ -38,9 +146,49 @@ class LLMAgent:
             options: 선택 가능한 옵션들
             format: 출력 형식 ("json", "text")
         """
-        if not self.client:
-            return {"error": "OpenAI API key not found", "fallback": True}
+        with span("llm", self.model) as current:
+            return self._decide(context, decision_task, options, format, current)
+
+    def decide_structured(self,
+                          context: Dict[str, Any],
+                          decision_task: str,
+                          schema: Type[SchemaT]) -> Optional[SchemaT]:
+        """
+        strict JSON schema(structured outputs)로 판단 요청 후 검증된 모델 반환
+
+        Args:
+            context: 판단에 필요한 컨텍스트 정보
+            decision_task: 수행할 결정 작업 설명
+            schema: 응답 pydantic 모델
+
+        Returns:
+            검증된 응답 모델 (호출 실패 / 검증 실패 시 None)
+        """
+        with span("llm", self.model) as current:
+            raw = self._decide(context, decision_task, None, "json", current, schema)
+            if raw.get("error"):
+                logger.warning(
+                    "LLM 구조화 응답 실패",
+                    extra={"schema": schema.__name__, "error": raw.get("error")},
+                )
+                return None
+            try:
+                return schema.model_validate(raw)
+            except ValidationError as e:
+                current.set(fallback=True)
+                logger.warning(
+                    "LLM 구조화 응답 검증 실패",
+                    extra={"schema": schema.__name__, "error": str(e)[:300]},
+                )
+                return None
 
+    def _decide(self,
+                context: Dict[str, Any],
+                decision_task: str,
+                options: Optional[List[Any]],
+                format: str,
+                current: Span,
+                schema: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
         messages = []
         if self.system_prompt:
             messages.append({"role": "system", "content": self.system_prompt})
@@ -49,32 +197,65 @@ class LLMAgent:
             context, decision_task, options, format)
         messages.append({"role": "user", "content": user_prompt})
 
+        cache = get_llm_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = LLMResponseCache.make_key(
+                self.model, messages, f"json_schema:{schema.__name__}" if schema else format)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                current.set(cached=True)
+                return cached
+            if LLM_CACHE_MODE == "replay":
+                current.set(fallback=True)
+                return {"error": "LLM replay 캐시 미스", "fallback": True}
+
+        if not self.client:
+            current.set(fallback=True)
+            return {"error": "OpenAI API key not found", "fallback": True}
+
         last_error: Optional[Exception] = None
 
         # max_retries=0이면 1번만 시도, max_retries=1이면 최대 2번 시도
         max_attempts = self.max_retries + 1
 
+        if schema is not None:
+            response_format = strict_json_schema(schema)
+        else:
+            response_format = {"type": "json_object"} if format == "json" else None
+
         for attempt in range(max_attempts):
             try:
                 # gpt-5-mini는 temperature=1만 지원하므로 파라미터 제거 (기본값 사용)
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    response_format={
-                        "type": "json_object"} if format == "json" else None,
+                    response_format=response_format,
                     timeout=self.request_timeout,
                 )
 
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    record_llm_tokens(
+                        self.model, usage.prompt_tokens, usage.completion_tokens)
+                    current.set(prompt_tokens=usage.prompt_tokens,
+                                completion_tokens=usage.completion_tokens)
+                current.set(attempts=attempt + 1)
+
                 result = response.choices[0].message.content
                 if format == "json":
-                    import json
                     try:
-                        return json.loads(result)
+                        parsed = json.loads(result)
                     except json.JSONDecodeError:
                         # JSON 파싱 실패 시 텍스트로 반환
                         logger.warning(f"JSON 파싱 실패, 텍스트로 반환: {result[:100]}")
                         return {"result": result, "error": "JSON 파싱 실패"}
-                return {"result": result}
+                else:
+                    parsed = {"result": result}
+
+                if cache_key is not None:
+                    cache.put(cache_key, parsed)
+                return parsed
 
             except Exception as e:
                 last_error = e
@@ -83,17 +264,55 @@ class LLMAgent:
                     time.sleep(sleep_for)
                     continue
 
+        current.set(fallback=True, attempts=max_attempts)
         return {"error": str(last_error) if last_error else "LLM 호출 실패", "fallback": True}
 
+    @staticmethod
+    def _prompt_prefix(task: str) -> str:
+        """요청마다 같은 프롬프트 앞부분 (프롬프트 캐시 대상)"""
+        return f"다음 정보를 바탕으로 {task}를 수행해주세요.\n\n## 컨텍스트 정보:\n"
+
+    def warm_prefix(self, decision_task: str, schema: Optional[Type[BaseModel]] = None) -> None:
+        """
+        system + 작업 설명 prefix만 담은 짧은 요청으로 프롬프트 캐시를 미리 채움
+        (이어지는 실제 요청의 입력 처리 시간 단축, 실패는 무시)
+
+        Args:
+            decision_task: 실제 요청과 같은 작업 설명
+            schema: 실제 요청이 decide_structured로 보내는 스키마
+                (response_format도 캐시되는 prefix에 포함되므로 같은 값을 보내야 캐시가 맞음)
+        """
+        if not self.client or LLM_CACHE_MODE == "replay":
+            return
+        messages = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": self._prompt_prefix(decision_task)})
+        with span("llm", f"{self.model}:warmup") as current:
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    response_format=strict_json_schema(schema) if schema is not None else None,
+                    max_completion_tokens=1,
+                    timeout=self.request_timeout,
+                )
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    record_llm_tokens(
+                        self.model, usage.prompt_tokens, usage.completion_tokens)
+                    current.set(prompt_tokens=usage.prompt_tokens)
+            except Exception as e:
+                current.set(error=str(e)[:200])
+
     def _build_prompt(self, context: Dict[str, Any], task: str, options: Optional[List[Any]], format: str = "json") -> str:
         """프롬프트 구성"""
         # format이 "text"인 경우 간단한 프롬프트
         if format == "text":
             return task
 
-        # JSON 형식인 경우 기존 로직 사용
-        prompt = f"다음 정보를 바탕으로 {task}를 수행해주세요.\n\n"
-        prompt += "## 컨텍스트 정보:\n"
+        # JSON 형식인 경우 기존 로직 사용 (고정 prefix 뒤에 요청별 컨텍스트)
+        prompt = self._prompt_prefix(task)
         for key, value in context.items():
             prompt += f"- {key}: {value}\n"
 
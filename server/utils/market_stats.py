@@ -0,0 +1,199 @@
+"""
+시세 통계 유틸리티
+price_updater와 item_market_tool이 공유하는 가격 통계 함수 및
+병합 가능한 분위수 스케치(KLL 방식)
+"""
+
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# ==================== 벡터화 통계 ====================
+
+def _as_price_array(values: Iterable[float]) -> np.ndarray:
+    arr = np.asarray(list(values) if not isinstance(
+        values, np.ndarray) else values, dtype=float)
+    return arr[np.isfinite(arr)]
+
+
+def iqr_bounds(sorted_values: np.ndarray) -> Optional[Tuple[float, float]]:
+    """Tukey hinge 기반 IQR 허용 범위 (정렬된 배열 입력, 4개 미만이면 None)"""
+    n = sorted_values.size
+    if n < 4:
+        return None
+    q1 = float(np.median(sorted_values[: n // 2]))
+    q3 = float(np.median(sorted_values[(n + 1) // 2:]))
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def iqr_filter(values: Iterable[float]) -> np.ndarray:
+    """IQR 밖의 이상치를 제거한 정렬 배열 반환"""
+    arr = np.sort(_as_price_array(values))
+    bounds = iqr_bounds(arr)
+    if bounds is None:
+        return arr
+    lo, hi = bounds
+    return arr[(arr >= lo) & (arr <= hi)]
+
+
+def summarize_prices(values: Iterable[float]) -> Tuple[float, float]:
+    """이상치 제거 후 (평균, 중앙값), 데이터가 없으면 (0.0, 0.0)"""
+    filtered = iqr_filter(values)
+    if filtered.size == 0:
+        return 0.0, 0.0
+    return float(filtered.mean()), float(np.median(filtered))
+
+
+# ==================== 분위수 스케치 ====================
+
+class QuantileSketch:
+    """
+    병합 가능한 분위수 스케치 (KLL)
+
+    k개 이하의 값은 정확히 보관하고, 이후에는 레벨별 compactor가
+    절반씩 샘플링하여 O(k log(n/k)) 메모리로 분위수를 근사한다.
+    to_dict/from_dict로 JSON 직렬화하여 쿼리/카테고리별로 저장할 수 있다.
+    """
+
+    _CAPACITY_DECAY = 2.0 / 3.0
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = int(k)
+        self.n = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    # -------------------- 갱신 --------------------
+
+    def update(self, value: float) -> None:
+        self.extend([value])
+
+    def extend(self, values: Iterable[float]) -> None:
+        arr = _as_price_array(values)
+        if arr.size == 0:
+            return
+        self.n += int(arr.size)
+        self.total += float(arr.sum())
+        lo, hi = float(arr.min()), float(arr.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+        self.levels[0].extend(arr.tolist())
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """다른 스케치를 병합 (in-place, self 반환)"""
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self._CAPACITY_DECAY ** depth)))
+
+    def _compress(self) -> None:
+        while sum(len(items) for items in self.levels) > self._retained_capacity():
+            for h in range(len(self.levels)):
+                if len(self.levels[h]) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    items = np.sort(np.asarray(self.levels[h], dtype=float))
+                    # 홀수 개면 하나는 현재 레벨에 남김
+                    leftover = items[-1:] if items.size % 2 else items[:0]
+                    pairs = items[: items.size - leftover.size]
+                    offset = self._rng.randint(0, 1)
+                    self.levels[h + 1].extend(pairs[offset::2].tolist())
+                    self.levels[h] = leftover.tolist()
+                    break
+            else:
+                break
+
+    def _retained_capacity(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    # -------------------- 조회 --------------------
+
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        values = []
+        weights = []
+        for h, items in enumerate(self.levels):
+            if items:
+                values.append(np.asarray(items, dtype=float))
+                weights.append(np.full(len(items), 2 ** h, dtype=float))
+        if not values:
+            return np.empty(0), np.empty(0)
+        v = np.concatenate(values)
+        w = np.concatenate(weights)
+        order = np.argsort(v, kind="stable")
+        return v[order], w[order]
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        values, weights = self._weighted_items()
+        cum = np.cumsum(weights)
+        idx = int(np.searchsorted(cum, q * cum[-1], side="left"))
+        return float(values[min(idx, values.size - 1)])
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        return [self.quantile(q) for q in qs]
+
+    def cdf(self, value: float) -> Optional[float]:
+        """value 이하 비율 (0~1)"""
+        if self.n == 0:
+            return None
+        values, weights = self._weighted_items()
+        idx = int(np.searchsorted(values, value, side="right"))
+        return float(weights[:idx].sum() / weights.sum())
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.n if self.n else None
+
+    def iqr_bounds(self) -> Optional[Tuple[float, float]]:
+        if self.n < 4:
+            return None
+        q1, q3 = self.quantile(0.25), self.quantile(0.75)
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    # -------------------- 직렬화 --------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "levels": [list(items) for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(k=data.get("k", 200))
+        sketch.n = int(data.get("n", 0))
+        sketch.total = float(data.get("total", 0.0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        sketch.levels = [list(items) for items in data.get("levels", [[]])] or [[]]
+        return sketch
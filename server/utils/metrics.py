@@ -0,0 +1,254 @@
+"""
+타이밍 계측 및 메트릭 집계
+노드/도구/LLM/DB 조회 구간을 span으로 측정하여
+Prometheus 텍스트 형식 히스토그램(/metrics)과 요청별 timings 응답으로 제공
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 지연시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SPAN_METRIC = "reco_span_duration_seconds"
+TOKEN_METRIC = "reco_llm_tokens_total"
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (스레드 안전)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """(누적 버킷 카운트, 전체 개수, 합계)"""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for c in self.counts:
+                running += c
+                cumulative.append(running)
+            return cumulative, self.count, self.sum
+
+
+class MetricsRegistry:
+    """라벨별 히스토그램/카운터 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    @staticmethod
+    def _key(metric: str, labels: Dict[str, str]):
+        return metric, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, metric: str, value: float, **labels) -> None:
+        key = self._key(metric, labels)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, Histogram())
+        hist.observe(value)
+
+    def inc(self, metric: str, amount: float = 1.0, **labels) -> None:
+        key = self._key(metric, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines: List[str] = []
+        seen = set()
+        for (name, labels), hist in histograms:
+            if name not in seen:
+                lines.append(f"# TYPE {name} histogram")
+                seen.add(name)
+            cumulative, count, total = hist.snapshot()
+            for bound, c in zip(hist.buckets, cumulative):
+                lines.append(f"{name}_bucket{_labels(labels, le=_fmt(bound))} {c}")
+            lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {count}')
+            lines.append(f"{name}_sum{_labels(labels)} {_fmt(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for (name, labels), value in counters:
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{_labels(labels)} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **extra) -> str:
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+# ==================== 요청별 수집 ====================
+
+class TimingCollector:
+    """
+    요청 하나의 span 목록
+
+    LangGraph는 병렬 노드를 워커 스레드에서 실행하므로(컨텍스트 복사)
+    같은 collector 객체에 여러 스레드가 동시에 기록할 수 있다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """timings 응답: span 목록 + 종류별 합계 (ms)"""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["start_ms"])
+        totals: Dict[str, float] = {}
+        for s in spans:
+            totals[s["kind"]] = round(totals.get(s["kind"], 0.0) + s["duration_ms"], 2)
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "by_kind_ms": totals,
+            "spans": spans,
+        }
+
+
+_collector: contextvars.ContextVar[Optional[TimingCollector]] = contextvars.ContextVar(
+    "timing_collector", default=None)
+
+
+@contextmanager
+def collect_timings(collector: Optional[TimingCollector] = None) -> Iterator[TimingCollector]:
+    """
+    현재 컨텍스트의 span을 collector에 모은다
+
+    run_in_executor는 컨텍스트를 복사하지 않으므로 executor 안에서 호출해야 한다.
+    """
+    collector = collector or TimingCollector()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+# ==================== span ====================
+
+class Span:
+    """측정 중인 구간 (set()으로 속성 추가)"""
+
+    __slots__ = ("kind", "name", "attributes")
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.attributes: Dict[str, Any] = {}
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+
+@contextmanager
+def span(kind: str, name: str) -> Iterator[Span]:
+    """
+    구간 측정
+
+    Args:
+        kind: node / tool / llm / db
+        name: 노드·함수 이름
+    """
+    current = Span(kind, name)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe(SPAN_METRIC, elapsed, kind=kind, name=name, status=status)
+        collector = _collector.get()
+        if collector is not None:
+            record = {
+                "kind": kind,
+                "name": name,
+                "start_ms": round((start - collector.started) * 1000, 2),
+                "duration_ms": round(elapsed * 1000, 2),
+            }
+            if status != "ok":
+                record["status"] = status
+            if current.attributes:
+                record.update(current.attributes)
+            collector.add(record)
+
+
+def timed(kind: str, name: Optional[str] = None) -> Callable:
+    """함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """LangGraph 노드 계측 래퍼 (graph.node_wrapper 시그니처)"""
+    @functools.wraps(node)
+    def wrapper(state):
+        with span("node", name):
+            return node(state)
+    return wrapper
+
+
+def record_llm_tokens(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """LLM 토큰 사용량 카운터"""
+    registry.inc(TOKEN_METRIC, prompt_tokens or 0, model=model, type="prompt")
+    registry.inc(TOKEN_METRIC, completion_tokens or 0, model=model, type="completion")
@@ -41,11 +41,23 @@ def create_filters(user_input: Dict[str, Any]) -> Dict[str, Any]:
 
 # ==================== 벡터 및 점수 계산 Tools ====================
 
+# 사용자 선호도 슬라이더 (판매자 페르소나 벡터와 같은 차원 순서)
+SLIDER_KEYS = ["trust_safety", "quality_condition", "remote_transaction",
+               "activity_responsiveness", "price_flexibility"]
+
+# 상품 상태별 점수
+CONDITION_SCORES = {
+    "새상품": 1.0,
+    "거의새것": 0.8,
+    "중고": 0.6,
+    "사용감있음": 0.4
+}
+
+
 def normalize_slider_inputs(user_prefs: Dict[str, Any]) -> Dict[str, float]:
     """슬라이더 입력을 정규화"""
     normalized_vector = {}
-    for key in ["trust_safety", "quality_condition", "remote_transaction",
-                "activity_responsiveness", "price_flexibility"]:
+    for key in SLIDER_KEYS:
         value = user_prefs.get(key, 50.0)
         normalized_vector[key] = max(0.0, min(100.0, float(value)))
     return normalized_vector
@@ -65,13 +77,7 @@ def calculate_product_feature_score(product: Dict[str, Any]) -> float:
     view_score = min(product.get("view_count", 0) / 1000.0, 1.0)
     like_score = min(product.get("like_count", 0) / 100.0, 1.0)
 
-    condition_scores = {
-        "새상품": 1.0,
-        "거의새것": 0.8,
-        "중고": 0.6,
-        "사용감있음": 0.4
-    }
-    condition_score = condition_scores.get(product.get("condition", "중고"), 0.5)
+    condition_score = CONDITION_SCORES.get(product.get("condition", "중고"), 0.5)
 
     return 0.4 * view_score + 0.3 * like_score + 0.3 * condition_score
 
@@ -93,10 +99,27 @@ def calculate_diversity_score(items: List[Dict[str, Any]], key: str) -> float:
 
 # ==================== 상품 매칭 룰베이스 ====================
 
+MATCH_MAX_PRODUCTS_PER_SELLER = 5
+
+
+def fetch_match_candidates(
+    seller_ids: List[int],
+    max_products_per_seller: int = MATCH_MAX_PRODUCTS_PER_SELLER
+) -> List[Dict[str, Any]]:
+    """상품 매칭용 판매자별 상품 조회 (필터링 후에도 충분하도록 2배 조회)"""
+    from server.db.product_service import get_products_by_seller_ids
+
+    return get_products_by_seller_ids(
+        seller_ids=seller_ids,
+        limit=max_products_per_seller * 2
+    )
+
+
 def match_products_to_sellers(
     recommended_sellers: List[Dict[str, Any]],
     user_input: Dict[str, Any],
-    max_products_per_seller: int = 5
+    max_products_per_seller: int = MATCH_MAX_PRODUCTS_PER_SELLER,
+    sellers_with_products: Optional[List[Dict[str, Any]]] = None
 ) -> List[Dict[str, Any]]:
     """
     추천된 판매자들에게 상품을 매칭하는 룰베이스 함수
@@ -104,13 +127,13 @@ def match_products_to_sellers(
     Args:
         recommended_sellers: 추천된 판매자 리스트 (seller_id 포함)
         user_input: 사용자 입력 (search_query, price_min, price_max 등)
-        max_products_per_seller: 판매자당 최대 상품 수 (기본값: 10)
+        max_products_per_seller: 판매자당 최대 상품 수 (기본값: 5)
+        sellers_with_products: fetch_match_candidates로 미리 조회한 상품 (없으면 DB 조회)
 
     Returns:
         판매자 정보와 매칭된 상품 리스트가 포함된 딕셔너리 리스트
         (상품이 없는 판매자는 제외됨)
     """
-    from server.db.product_service import get_products_by_seller_ids
     from server.utils.logger import get_logger
 
     logger = get_logger(__name__)
@@ -126,10 +149,8 @@ def match_products_to_sellers(
         return []
 
     # DB에서 상품 조회 (필터링을 위해 더 많이 조회)
-    sellers_with_products = get_products_by_seller_ids(
-        seller_ids=seller_ids,
-        limit=max_products_per_seller * 2  # 필터링 후에도 충분한 상품 확보
-    )
+    if sellers_with_products is None:
+        sellers_with_products = fetch_match_candidates(seller_ids, max_products_per_seller)
 
     # 판매자 ID로 인덱싱
     sellers_dict = {str(seller["seller_id"]): seller for seller in sellers_with_products}
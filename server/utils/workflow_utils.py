@@ -1,17 +1,292 @@
 """
 워크플로우 유틸리티 함수들
 query_generator 등의 간단한 작업을 수행
+
+검색어 의도 해석 (parse_query_intent):
+자연어 검색어에서 가격 범위, 상품 상태, 카테고리, 거래 방식/배송비/안전결제 선호, 모델 번호를
+규칙 기반으로 추출하여 SQL 필터로 넘긴다. 카테고리/상태 사전은 DB의 distinct 값으로 만든다.
+    "아이폰 14 50만원 이하 새상품 택배"
+    → price_max=500000, condition="새상품", sell_method="택배",
+      model_numbers=["14"], search_terms="아이폰 14" (제목/설명 AND 검색어)
+
+필터는 결과가 없을 때만 완화되므로 애매한 표현은 필터로 만들지 않는다.
+- "직거래 말고/빼고/제외" 같은 부정 표현은 해당 조건을 필터로 쓰지 않음 (거래 방식은 반대쪽으로 해석)
+- 카테고리는 검색어에 카테고리 이름 외 다른 명사가 없을 때만 필터 ("노트북 가방"은 필터 없음)
+- 필터 표현을 모두 빼고 남은 검색어가 없으면 search_terms는 빈 문자열 (텍스트 매칭 생략)
 """
 
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from server.utils.logger import get_logger
 from server.utils.tools import (
     extract_keywords,
     create_filters
 )
-from server.workflow.state import RecommendationState
-from typing import Dict, Any
-<< << << < HEAD
-== == == =
->>>>>> > seeun
+
+logger = get_logger(__name__)
+
+# 검색어 해석용 DB 사전(카테고리/상태 값) 재조회 주기 (초)
+QUERY_VOCABULARY_TTL_SECONDS = int(os.getenv("QUERY_VOCABULARY_TTL_SECONDS", "600"))
+
+# 의도 해석 결과 중 get_sellers_with_products 필터로 쓰는 키
+INTENT_FILTER_KEYS = (
+    "category", "category_top", "price_min", "price_max", "condition",
+    "sell_method", "delivery_fee", "is_safe",
+)
+
+# ==================== 가격 ====================
+
+_UNITS = {"억": 100_000_000, "천만": 10_000_000, "백만": 1_000_000, "만": 10_000, "천": 1_000}
+_AMOUNT = r"(\d+(?:[.,]\d+)*)\s*(억|천만|백만|만|천)?\s*(원)?"
+_PRICE_RANGE = re.compile(_AMOUNT + r"\s*(?:~|-|에서|부터)\s*" + _AMOUNT + r"\s*(?:사이|까지)?")
+_PRICE_MAX = re.compile(_AMOUNT + r"\s*(이하|이내|까지|아래|밑으로|밑|미만|안쪽|안으로|넘지\s*않는)")
+_PRICE_MIN = re.compile(_AMOUNT + r"\s*(이상|넘는|초과|위로|넘게|부터)")
+_PRICE_APPROX = re.compile(_AMOUNT + r"\s*(정도|내외|안팎|쯤|전후|선에서|선)")
+_PRICE_BAND = re.compile(_AMOUNT + r"\s*대(?![가-힣])")
+# 수식어 없는 금액은 예산(상한)으로 해석 (단위 필수)
+_PRICE_BUDGET = re.compile(r"(\d+(?:[.,]\d+)*)\s*(억|천만|백만|만|천)\s*(원)?|(\d+(?:,\d{3})+|\d{4,})\s*(원)")
+
+# "정도/내외" 범위 (±)
+_APPROX_RATIO = 0.2
+
+# ==================== 상태 / 거래 조건 ====================
+
+# (표현, DB 상태 값) - 긴 표현부터 검사
+_CONDITION_PHRASES: List[Tuple[str, str]] = [
+    ("새것 같은", "거의새것"), ("새것같은", "거의새것"), ("새거 같은", "거의새것"),
+    ("사용감 없는", "거의새것"), ("사용감없는", "거의새것"), ("거의 새것", "거의새것"), ("거의새것", "거의새것"), ("s급", "거의새것"), ("민트급", "거의새것"),
+    ("미개봉", "새상품"), ("새상품", "새상품"), ("새 상품", "새상품"), ("새제품", "새상품"),
+    ("새것", "새상품"), ("사용감 있는", "사용감있음"), ("사용감있음", "사용감있음"), ("사용감", "사용감있음"),
+]
+_FREE_SHIPPING_PHRASES = ["무료배송", "무료 배송", "배송비 포함", "배송비포함", "택포", "무배"]
+_SAFE_PAYMENT_PHRASES = ["안전결제", "안전 결제", "안전거래", "안전 거래"]
+_DELIVERY_PHRASES = ["택배거래", "택배 거래", "택배만", "택배"]
+_DIRECT_PHRASES = ["직거래만", "직거래", "직접 만나", "만나서"]
+# 조건 표현 바로 뒤에 붙는 부정 표현 ("직거래 말고", "새상품은 빼고")
+_NEGATION = r"\s*(?:은|는)?\s*(?:말고|빼고|제외하고|제외|아닌)"
+
+# 카테고리 이름 조각 중 검색어 매칭에서 제외할 일반어
+_CATEGORY_STOP_PARTS = {"기타", "용품", "전체", "제품", "상품"}
+# 카테고리 외에 남아도 다른 상품을 가리키지 않는 수식어 (있어도 카테고리 필터 유지)
+_CATEGORY_MODIFIER_WORDS = {
+    "중고", "상태", "좋은", "좋은거", "깨끗한", "저렴한", "싼", "싸게", "급처", "급매", "최신",
+    "추천", "판매", "판매자", "팝니다", "구매", "구해요", "구합니다", "찾아요", "찾습니다",
+}
+
+_MODEL_TOKEN = re.compile(r"[a-z0-9]*\d[a-z0-9]*")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def _model_numbers(text: str) -> List[str]:
+    """
+    모델 번호 토큰 추출 ("아이폰 14" → 14, "m2", "s23")
+    한글 단위가 바로 붙은 1~2자리 숫자("2세대", "10세대", "27인치")는 모델 번호가 아니므로 제외
+    """
+    tokens = []
+    for match in _MODEL_TOKEN.finditer(text):
+        token = match.group()
+        if token.isdigit() and len(token) <= 2 and _HANGUL.match(text, match.end()):
+            continue
+        tokens.append(token)
+    return list(dict.fromkeys(tokens))
+
+
+def _parse_amount(number: str, unit: Optional[str]) -> float:
+    return float(number.replace(",", "")) * _UNITS.get(unit or "", 1)
+
+
+def _is_price(number: str, unit: Optional[str], won: Optional[str]) -> bool:
+    """단위/원이 붙었거나 1000 이상이면 금액 (모델 번호 "14 이상" 등 제외)"""
+    return bool(unit or won) or float(number.replace(",", "")) >= 1000
+
+
+def _band_width(value: float) -> float:
+    """'50만원대' → 10만 단위 폭"""
+    return float(10 ** (len(str(int(value))) - 1)) if value >= 1 else 1.0
+
+
+def _cut(text: str, match: "re.Match") -> str:
+    return text[:match.start()] + " " + text[match.end():]
+
+
+def _extract_price(text: str) -> Tuple[Optional[float], Optional[float], str]:
+    """가격 범위 추출 후 해당 구간을 제거한 텍스트 반환"""
+    match = _PRICE_RANGE.search(text)
+    if match:
+        n1, u1, _, n2, u2, w2 = match.groups()
+        if _is_price(n2, u2, w2):
+            # "30~50만원" → 앞 숫자에도 뒤 단위 적용
+            low = _parse_amount(n1, u1 or u2)
+            high = _parse_amount(n2, u2)
+            return min(low, high), max(low, high), _cut(text, match)
+
+    # "30만원 이상 50만원 이하"처럼 상한/하한이 따로 올 수 있음
+    bounds: Dict[str, Optional[float]] = {"min": None, "max": None}
+    for pattern, kind in ((_PRICE_MAX, "max"), (_PRICE_MIN, "min")):
+        match = pattern.search(text)
+        if match and _is_price(*match.groups()[:3]):
+            bounds[kind] = _parse_amount(match.group(1), match.group(2))
+            text = _cut(text, match)
+    if bounds["min"] is not None or bounds["max"] is not None:
+        return bounds["min"], bounds["max"], text
+
+    match = _PRICE_APPROX.search(text)
+    if match and _is_price(*match.groups()[:3]):
+        value = _parse_amount(match.group(1), match.group(2))
+        return value * (1 - _APPROX_RATIO), value * (1 + _APPROX_RATIO), _cut(text, match)
+
+    match = _PRICE_BAND.search(text)
+    if match and _is_price(*match.groups()[:3]):
+        value = _parse_amount(match.group(1), match.group(2))
+        return value, value + _band_width(value) - 1, _cut(text, match)
+
+    match = _PRICE_BUDGET.search(text)
+    if match:
+        number, unit = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), None)
+        return None, _parse_amount(number, unit), _cut(text, match)
+    return None, None, text
+
+
+def _remove_phrases(text: str, phrases: List[str]) -> Tuple[bool, bool, str]:
+    """
+    표현을 찾아 텍스트에서 제거
+
+    Returns:
+        (부정 없이 등장, 부정 표현과 함께 등장, 남은 텍스트)
+    """
+    found = negated = False
+    for phrase in phrases:
+        negation = re.compile(re.escape(phrase) + _NEGATION)
+        if negation.search(text):
+            negated = True
+            text = negation.sub(" ", text)
+        if phrase in text:
+            found = True
+            text = text.replace(phrase, " ")
+    return found, negated, text
+
+
+def _match_category(
+    text: str, vocabulary: Dict[str, List[str]]
+) -> Optional[Tuple[str, str, str]]:
+    """
+    DB 카테고리 사전에서 검색어에 포함된 카테고리 찾기 (가장 긴 매칭 우선)
+
+    Returns:
+        (level, 카테고리 이름, 검색어에서 맞은 조각) 또는 None
+    """
+    compact = text.replace(" ", "").lower()
+    matches: List[Tuple[int, str, str]] = []
+    for level in ("category", "category_top"):
+        for name in vocabulary.get(level, []):
+            parts = {name} | set(re.split(r"[/·,]", name))
+            for part in parts:
+                key = part.replace(" ", "").lower()
+                if len(key) >= 2 and key not in _CATEGORY_STOP_PARTS and key in compact:
+                    # 대분류 조각만 맞은 경우는 전체 이름이 맞은 중분류보다 낮은 우선순위
+                    matches.append((len(key) + (1 if level == "category" else 0), level, name, key))
+    if not matches:
+        return None
+    _, level, name, key = max(matches)
+    return level, name, key
+
+
+def _has_other_noun(text: str, category_key: str) -> bool:
+    """카테고리 조각을 뺀 나머지에 다른 상품을 가리킬 수 있는 단어가 있는지 ("노트북 가방" → 가방)"""
+    pattern = r"\s*".join(re.escape(ch) for ch in category_key)
+    rest = re.sub(pattern, " ", text, count=1)
+    return any(
+        len(token) >= 2 and not any(ch.isdigit() for ch in token)
+        and token not in _CATEGORY_MODIFIER_WORDS
+        for token in rest.split()
+    )
+
+
+def parse_query_intent(
+    query: str, vocabulary: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    자연어 검색어 → 구조화된 검색 의도 (규칙 기반)
+
+    Args:
+        query: 사용자 검색어
+        vocabulary: DB 사전 {"category": [...], "category_top": [...], "condition": [...]}
+            (없으면 카테고리 추출 생략, 상태는 기본 표현만 사용)
+
+    Returns:
+        INTENT_FILTER_KEYS 중 추출된 값, model_numbers, search_terms(필터 표현을 뺀 검색어, 없으면 "")
+    """
+    vocabulary = vocabulary or {}
+    text = (query or "").lower()
+    intent: Dict[str, Any] = {}
+
+    price_min, price_max, text = _extract_price(text)
+    if price_min is not None:
+        intent["price_min"] = price_min
+    if price_max is not None:
+        intent["price_max"] = price_max
+
+    known_conditions = set(vocabulary.get("condition") or [])
+    for phrase, condition in _CONDITION_PHRASES:
+        found, _, text = _remove_phrases(text, [phrase])
+        if found and (not known_conditions or condition in known_conditions):
+            intent.setdefault("condition", condition)
+
+    free_shipping, _, text = _remove_phrases(text, _FREE_SHIPPING_PHRASES)
+    if free_shipping:
+        intent["delivery_fee"] = "없음"
+    safe_payment, _, text = _remove_phrases(text, _SAFE_PAYMENT_PHRASES)
+    if safe_payment:
+        intent["is_safe"] = "사용"
+    # "직거래 말고" → 택배, "택배 빼고" → 직거래
+    delivery, no_delivery, text = _remove_phrases(text, _DELIVERY_PHRASES)
+    direct, no_direct, text = _remove_phrases(text, _DIRECT_PHRASES)
+    delivery, direct = delivery or no_direct, direct or no_delivery
+    if delivery != direct:
+        intent["sell_method"] = "택배" if delivery else "직거래"
+
+    category = _match_category(text, vocabulary)
+    if category and not _has_other_noun(text, category[2]):
+        intent[category[0]] = category[1]
+
+    search_terms = " ".join(text.split())
+    intent["model_numbers"] = _model_numbers(search_terms)
+    # 모두 필터로 해석됐으면 빈 문자열 (호출 측은 텍스트 매칭 없이 필터만 적용)
+    intent["search_terms"] = search_terms
+    return intent
+
+
+class _VocabularyCache:
+    """get_product_vocabulary 결과를 TTL 동안 재사용 (조회 실패 시 빈 사전)"""
+
+    def __init__(self):
+        self._value: Dict[str, List[str]] = {}
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, List[str]]:
+        if time.monotonic() - self._loaded_at >= QUERY_VOCABULARY_TTL_SECONDS:
+            with self._lock:
+                if time.monotonic() - self._loaded_at >= QUERY_VOCABULARY_TTL_SECONDS:
+                    from server.db.product_service import get_product_vocabulary
+                    try:
+                        self._value = get_product_vocabulary()
+                    except Exception:
+                        logger.exception("검색어 사전 조회 실패")
+                    self._loaded_at = time.monotonic()
+        return self._value
+
+
+_vocabulary_cache = _VocabularyCache()
+
+
+def get_query_vocabulary() -> Dict[str, List[str]]:
+    """검색어 해석용 DB 사전 (캐시)"""
+    return _vocabulary_cache.get()
 
 
 def generate_search_query(user_input: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,27 +311,54 @@ def generate_search_query(user_input: Dict[str, Any]) -> Dict[str, Any]:
 
     keywords = extract_keywords(combined_text)
 
-    # 필터 정보 추출
->>>>>> > seeun
- filters = create_filters(user_input)
-
-  # enhanced_query: 이전 대화의 키워드를 포함하여 향상된 쿼리 생성
-  enhanced_query = original_query
-   if previous_queries:
-        # 이전 대화의 주요 키워드만 추출하여 추가
-        prev_keywords = extract_keywords(
-            " ".join(previous_queries[-2:]))  # 최근 2개만
-        # 중복 제거하고 현재 쿼리에 없는 키워드만 추가
-        # 상위 3개 키워드와 중복 체크
-        new_keywords = [kw for kw in prev_keywords if kw not in keywords[:3]]
-        if new_keywords:
-            # 최대 2개만 추가
-            enhanced_query = f"{original_query} {' '.join(new_keywords[:2])}"
+    # 검색어 의도 해석 → 필터 (사용자가 직접 지정한 필터가 우선)
+    intent = parse_query_intent(original_query, get_query_vocabulary())
+    filters = {
+        **{key: intent[key] for key in INTENT_FILTER_KEYS if intent.get(key) is not None},
+        **create_filters(user_input),
+    }
 
     return {
         "original_query": original_query,
         "enhanced_query": original_query,
         "keywords": keywords,
         "filters": filters,
+        "intent": intent,
         "context_queries": previous_queries[-3:] if previous_queries else []
     }
+
+
+def query_filter_kwargs(search_query: Dict[str, Any]) -> Dict[str, Any]:
+    """search_query["filters"] → get_sellers_with_products / 후보 검색 필터 인자"""
+    filters = search_query.get("filters") or {}
+    return {key: filters[key] for key in INTENT_FILTER_KEYS if filters.get(key) is not None}
+
+
+def fetch_sellers_for_query(
+    search_query: Dict[str, Any], user_input: Dict[str, Any], limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    검색 의도 필터와 검색어를 적용해 판매자 조회 (후보 검색 결과가 없을 때 에이전트 기본 조회)
+
+    검색어(search_terms: 상품명 + 모델 번호)의 모든 단어가 제목/설명에 포함된 상품만 조회하고,
+    결과가 없으면 뒤쪽 단어("상태 좋은 거" 등 수식어)부터 하나씩 빼며 재조회하고,
+    검색어 없이도 없으면 검색어에서 추출한 조건을 빼고 사용자 입력 필터만으로 다시 조회
+    """
+    from server.db.product_service import get_sellers_with_products
+
+    terms = ((search_query.get("intent") or {}).get("search_terms") or "").split()
+    intent_filters = query_filter_kwargs(search_query)
+    for end in range(len(terms), -1, -1):
+        sellers = get_sellers_with_products(
+            search_query=" ".join(terms[:end]) or None, limit=limit, **intent_filters)
+        if sellers:
+            return sellers
+
+    user_filters = create_filters(user_input)
+    relaxed = {key: user_filters[key] for key in INTENT_FILTER_KEYS if key in user_filters}
+    if relaxed == intent_filters:
+        return sellers
+
+    logger.info("검색 의도 필터로 조회 결과 없음, 사용자 입력 필터만으로 재조회",
+                extra={"intent": search_query.get("intent")})
+    return get_sellers_with_products(search_query=None, limit=limit, **relaxed)
@@ -2,12 +2,19 @@
 워크플로우 Agents 노드 모음
 """
 
+from .candidate_retriever import candidate_retrieval_node
 from .product_agent import product_agent_node
 from .reliability_agent import reliability_agent_node
-from .orchestrator_agent import orchestrator_agent_node
+from .orchestrator_agent import orchestrator_agent_node, deterministic_orchestrator_node
+from .speculative import speculative_scoring_node
+from .combined_agent import combined_agent_node
 
 __all__ = [
+    "candidate_retrieval_node",
     "product_agent_node",
     "reliability_agent_node",
     "orchestrator_agent_node",
+    "deterministic_orchestrator_node",
+    "speculative_scoring_node",
+    "combined_agent_node",
 ]
@@ -0,0 +1,203 @@
+"""
+에이전트별 후보 풀 크기 결정
+판매자 수 / 판매자당 상품 수를 고정 limit 대신 에이전트별 토큰·지연 시간 예산으로 정한다.
+
+    프롬프트 토큰 ≈ base + Σ(판매자당 + 상품 수 × 상품당)
+    지연 시간(ms) ≈ LLM_BASE_LATENCY_MS + 프롬프트 토큰 / 입력 처리 속도 + 판매자 수 × 판매자당 출력 토큰 / 출력 속도
+
+샤드 점수화(LLM_SCORING_MODE=sharded)에서는 샤드 하나의 지연 시간 × 동시 실행 차수로 추정한다.
+
+후보는 싼 점수(검색 순위 + 페르소나 매칭 + 판매자 신뢰도)로 사전 랭킹하고,
+판매자당 상품 수를 최대값부터 줄여 가며 최소 판매자 수(MIN_SELLERS)를 예산 안에 담을 수 있는
+가장 큰 값을 고른 뒤 상위 판매자부터 예산이 허용하는 만큼 남긴다.
+
+에이전트별 설정 (PREFIX = PRODUCT_AGENT / RELIABILITY_AGENT):
+    {PREFIX}_TOKEN_BUDGET, {PREFIX}_LATENCY_BUDGET_MS,
+    {PREFIX}_BASE_TOKENS, {PREFIX}_TOKENS_PER_SELLER, {PREFIX}_TOKENS_PER_PRODUCT,
+    {PREFIX}_OUTPUT_TOKENS_PER_SELLER, {PREFIX}_MAX_SELLERS, {PREFIX}_MAX_PRODUCTS_PER_SELLER
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from server.db.seller_persona import persona_scores
+from server.workflow.schemas import MAX_FINAL_SELLERS
+from server.workflow.agents.sharding import (
+    LLM_SCORING_ANCHOR,
+    LLM_SCORING_MAX_CONCURRENCY,
+    LLM_SCORING_SHARD_SIZE,
+    anchor_slots,
+    shard_count,
+)
+
+LLM_BASE_LATENCY_MS = float(os.getenv("LLM_BASE_LATENCY_MS", "600"))
+LLM_PROMPT_TOKENS_PER_SECOND = float(os.getenv("LLM_PROMPT_TOKENS_PER_SECOND", "5000"))
+LLM_OUTPUT_TOKENS_PER_SECOND = float(os.getenv("LLM_OUTPUT_TOKENS_PER_SECOND", "80"))
+# 예산이 부족해도 이 수만큼의 판매자는 확보하도록 판매자당 상품 수를 줄임
+# (기본값은 최종 추천 판매자 수: 에이전트 후보가 이보다 적으면 응답을 다 채울 수 없음)
+CANDIDATE_POOL_MIN_SELLERS = int(
+    os.getenv("CANDIDATE_POOL_MIN_SELLERS", str(MAX_FINAL_SELLERS)))
+
+# 사전 랭킹 가중치 (검색 순위, 페르소나 매칭, 판매자 신뢰도)
+_PRERANK_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+@dataclass(frozen=True)
+class PoolBudget:
+    """에이전트 한 번의 LLM 호출 예산과 프롬프트 크기 계수"""
+
+    token_budget: int
+    latency_budget_ms: float
+    base_tokens: int
+    tokens_per_seller: int
+    tokens_per_product: int
+    output_tokens_per_seller: int
+    max_sellers: int
+    max_products_per_seller: int
+
+    @classmethod
+    def from_env(cls, prefix: str, **defaults) -> "PoolBudget":
+        return cls(**{
+            name: type(default)(os.getenv(f"{prefix}_{name.upper()}", str(default)))
+            for name, default in defaults.items()
+        })
+
+    @property
+    def fetch_limit(self) -> int:
+        """후보 검색 결과가 없을 때 DB에서 가져올 상품 행 수"""
+        return self.max_sellers * self.max_products_per_seller
+
+    def estimate_tokens(self, sellers: int, products: int) -> int:
+        return self.base_tokens + sellers * self.tokens_per_seller + products * self.tokens_per_product
+
+    def estimate_latency_ms(self, sellers: int, products: int) -> float:
+        shards = shard_count(sellers)
+        if shards > 1:
+            # 가장 큰 샤드 (기준점 판매자 포함) × 동시 실행 차수 (score_sellers 호출마다 독립)
+            waves = -(-shards // max(1, LLM_SCORING_MAX_CONCURRENCY))
+            anchors = anchor_slots(LLM_SCORING_SHARD_SIZE, LLM_SCORING_ANCHOR)
+            shard_sellers = -(-(sellers - anchors) // shards) + anchors
+            return waves * self._call_latency_ms(
+                shard_sellers, -(-products * shard_sellers // sellers))
+        return self._call_latency_ms(sellers, products)
+
+    def _call_latency_ms(self, sellers: int, products: int) -> float:
+        prompt_ms = self.estimate_tokens(sellers, products) / LLM_PROMPT_TOKENS_PER_SECOND * 1000
+        output_ms = sellers * self.output_tokens_per_seller / LLM_OUTPUT_TOKENS_PER_SECOND * 1000
+        return LLM_BASE_LATENCY_MS + prompt_ms + output_ms
+
+    def fits(self, sellers: int, products: int) -> bool:
+        return (self.estimate_tokens(sellers, products) <= self.token_budget
+                and self.estimate_latency_ms(sellers, products) <= self.latency_budget_ms)
+
+
+# 계수는 시드 카탈로그에서 에이전트 컨텍스트(프롬프트 포함)를 estimate_tokens로 잰 값의 회귀
+# 기본 예산은 CANDIDATE_POOL_MIN_SELLERS(= MAX_FINAL_SELLERS)명을 판매자당 상품 3개 이상으로 담도록 설정
+AGENT_BUDGETS: Dict[str, PoolBudget] = {
+    # 상품별 설명/시세/가격 리스크 피처가 커서 상품당 토큰이 큼
+    "product_agent": PoolBudget.from_env(
+        "PRODUCT_AGENT",
+        token_budget=18000, latency_budget_ms=15000.0,
+        base_tokens=3400, tokens_per_seller=250, tokens_per_product=370,
+        output_tokens_per_seller=80, max_sellers=30, max_products_per_seller=5,
+    ),
+    # 판매자 프로필/리뷰 위주, 상품은 거래 리스크만 포함
+    "reliability_agent": PoolBudget.from_env(
+        "RELIABILITY_AGENT",
+        token_budget=12000, latency_budget_ms=15000.0,
+        base_tokens=3300, tokens_per_seller=250, tokens_per_product=150,
+        output_tokens_per_seller=80, max_sellers=30, max_products_per_seller=3,
+    ),
+    # combined 토폴로지: 프로필/리뷰는 판매자당 한 번, 상품은 시세+가격 리스크+거래 리스크
+    # (판매자당 출력이 두 점수라 지연 시간 예산이 더 큼)
+    "combined_agent": PoolBudget.from_env(
+        "COMBINED_AGENT",
+        token_budget=14000, latency_budget_ms=18000.0,
+        base_tokens=1300, tokens_per_seller=250, tokens_per_product=150,
+        output_tokens_per_seller=110, max_sellers=30, max_products_per_seller=4,
+    ),
+}
+
+
+def prerank_sellers(user_input: Dict[str, Any], sellers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    싼 점수로 판매자 사전 랭킹 (LLM/툴 호출 없음)
+    입력 순서(검색 순위 또는 조회수 순)를 관련도로 보고 페르소나 매칭, 신뢰도와 가중 합산
+
+    Returns:
+        persona_score, prerank_score가 추가된 판매자 리스트 (prerank_score 내림차순)
+    """
+    if not sellers:
+        return []
+    scores = persona_scores(
+        user_input, [int(s["seller_id"]) for s in sellers if s.get("seller_id") is not None])
+    w_relevance, w_persona, w_trust = _PRERANK_WEIGHTS
+    n = len(sellers)
+    ranked = []
+    for position, seller in enumerate(sellers):
+        persona = scores.get(seller.get("seller_id"), 0.5)
+        # seller_profile_tool과 같은 400~600 → 0~1 정규화
+        trust = min(1.0, max(0.0, ((seller.get("seller_trust") or 0.0) - 400.0) / 200.0))
+        relevance = 1.0 - position / n
+        ranked.append({
+            **seller,
+            "persona_score": persona,
+            "prerank_score": w_relevance * relevance + w_persona * persona + w_trust * trust,
+        })
+    ranked.sort(key=lambda s: s["prerank_score"], reverse=True)
+    return ranked
+
+
+def plan_pool(budget: PoolBudget, product_counts: List[int]) -> Tuple[int, int]:
+    """
+    사전 랭킹 순 판매자별 상품 수 → (판매자 수, 판매자당 상품 수)
+
+    판매자당 상품 수를 최대값부터 줄여 가며 상위 판매자를 예산 안에서 채우고,
+    min(CANDIDATE_POOL_MIN_SELLERS, 후보 수)명 이상 담기는 첫 값을 사용
+    """
+    available = min(len(product_counts), budget.max_sellers)
+    required = min(CANDIDATE_POOL_MIN_SELLERS, available)
+    best = (0, 1)
+    for per_seller in range(max(budget.max_products_per_seller, 1), 0, -1):
+        sellers = products = 0
+        for count in product_counts[:available]:
+            next_products = products + min(count, per_seller)
+            if not budget.fits(sellers + 1, next_products):
+                break
+            sellers, products = sellers + 1, next_products
+        if sellers > best[0]:
+            best = (sellers, per_seller)
+        if sellers >= required:
+            return sellers, per_seller
+    # 예산이 최소 인원도 못 담으면 판매자당 1개로 담을 수 있는 만큼 (최소 1명)
+    return (max(best[0], 1) if product_counts else 0), best[1]
+
+
+def size_candidate_pool(
+    agent: str, sellers: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    사전 랭킹된 후보를 에이전트 예산에 맞게 자름
+
+    Returns:
+        (잘린 판매자 리스트, 응답 메타데이터용 결정 정보)
+    """
+    budget = AGENT_BUDGETS[agent]
+    seller_count, per_seller = plan_pool(
+        budget, [len(s.get("products") or []) for s in sellers])
+    trimmed = [
+        {**seller, "products": (seller.get("products") or [])[:per_seller]}
+        for seller in sellers[:seller_count]
+    ]
+    product_count = sum(len(s["products"]) for s in trimmed)
+    return trimmed, {
+        "available_sellers": len(sellers),
+        "seller_count": len(trimmed),
+        "products_per_seller": per_seller,
+        "product_count": product_count,
+        "estimated_prompt_tokens": budget.estimate_tokens(len(trimmed), product_count),
+        "estimated_latency_ms": round(budget.estimate_latency_ms(len(trimmed), product_count)),
+        "token_budget": budget.token_budget,
+        "latency_budget_ms": budget.latency_budget_ms,
+    }
@@ -0,0 +1,40 @@
+"""
+후보 검색 노드
+에이전트 실행 전에 검색어와 관련된 판매자 후보를 한 번 조회하여 두 에이전트가 공유
+(후보는 검색 순위 + 페르소나 매칭 + 신뢰도로 사전 랭킹, 에이전트별 예산에 맞춰 각 에이전트가 자름)
+"""
+
+from server.retrieval import RETRIEVAL_ENABLED, retrieve_candidate_sellers
+from server.utils.logger import get_logger
+from server.utils.workflow_utils import query_filter_kwargs
+from server.workflow.agents.candidate_pool import prerank_sellers
+from server.workflow.state import RecommendationState
+
+logger = get_logger(__name__)
+
+
+def candidate_retrieval_node(state: RecommendationState) -> dict:
+    """검색어 기반 후보 판매자 조회 (인덱스가 없거나 실패하면 에이전트가 기존 조회 사용)"""
+    search_query = state.get("search_query") or {}
+    # 가격/상태 등 필터 표현을 뺀 검색어 (필터는 사전 필터로 적용)
+    # 검색어 전체가 필터로 해석됐으면 텍스트 검색 없이 에이전트의 필터 조회 사용
+    intent = search_query.get("intent")
+    if intent is not None:
+        query = intent.get("search_terms")
+    else:
+        query = search_query.get("enhanced_query") or search_query.get("original_query")
+    user_input = state["user_input"]
+
+    update = {"current_step": "candidates_retrieved", "completed_steps": ["candidate_retrieval"]}
+    if not RETRIEVAL_ENABLED or not query:
+        return update
+
+    try:
+        sellers, info = retrieve_candidate_sellers(query, **query_filter_kwargs(search_query))
+    except Exception:
+        logger.exception("후보 검색 실패, 에이전트 기본 조회로 대체")
+        return update
+
+    sellers = prerank_sellers(user_input, sellers)
+    logger.info("후보 검색 완료", extra=info)
+    return {**update, "candidate_sellers": sellers, "retrieval_info": info}
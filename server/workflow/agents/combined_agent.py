@@ -0,0 +1,235 @@
+"""
+통합 점수화 에이전트 (combined 토폴로지)
+ProductAgent와 ReliabilityAgent가 같은 판매자에 대해 seller_profile_tool / review_feature_tool
+결과를 각각 LLM에 보내던 것을, 판매자별 피처를 한 번만 담은 컨텍스트로
+상품 특성 점수와 신뢰도 점수를 한 번의 LLM 호출로 함께 받는다.
+
+결과는 두 서브에이전트와 같은 형태(product_agent_recommendations,
+reliability_agent_recommendations)로 반환하여 오케스트레이터/결정적 결합기를 그대로 사용한다.
+"""
+
+from typing import Dict, Any, List
+from server.workflow.state import RecommendationState
+from server.utils.llm_agent import create_agent
+from server.workflow.agents.tool import (
+    seller_profile_tool,
+    item_market_tool,
+    price_risk_tool,
+    review_feature_tool,
+    trade_risk_tool,
+)
+from server.workflow.agents.sharding import score_sellers
+from server.workflow.prompts import load_prompt
+from server.workflow.schemas import CombinedScoring
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_PREFERENCE_KEYS = (
+    "price_min", "price_max", "trust_safety", "quality_condition",
+    "remote_transaction", "activity_responsiveness", "price_flexibility",
+)
+
+
+class CombinedScoringAgent:
+    """상품 특성 + 신뢰도 통합 점수화 에이전트"""
+
+    def __init__(self):
+        # 서브 에이전트와 같은 gpt-4o-mini 사용
+        self.llm_agent = create_agent("combined_agent", model="gpt-4o-mini")
+        self.combined_prompt = load_prompt("combined_prompt")
+
+    def score_sellers(
+        self,
+        user_input: Dict[str, Any],
+        sellers_with_products: List[Dict[str, Any]],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        판매자별 상품 특성 / 신뢰도 점수화
+
+        Args:
+            user_input: 사용자 입력 (가격 범위, 선호도 슬라이더)
+            sellers_with_products: 판매자와 상품 정보
+
+        Returns:
+            {"product": 상품 특성 결과 리스트, "reliability": 신뢰도 결과 리스트} (각 점수 내림차순)
+        """
+        # 판매자당 프로필/리뷰 1회, 상품당 시세/가격 리스크/거래 리스크 1회
+        seller_views: List[Dict[str, Any]] = []
+        for seller in sellers_with_products:
+            seller_id = seller.get("seller_id")
+            if not seller_id:
+                continue
+            seller_profile = seller_profile_tool(seller_id)
+
+            products = []
+            for p in seller.get("products", []) or []:
+                product_id = p.get("product_id")
+                if product_id is None:
+                    continue
+                market_feature = item_market_tool(product_id)
+                products.append({
+                    "product_id": product_id,
+                    "title": p.get("title", ""),
+                    "price": p.get("price"),
+                    "condition": p.get("condition", ""),
+                    "category": p.get("category", ""),
+                    "market": market_feature,
+                    "price_risk": price_risk_tool(market_feature, seller_profile),
+                    "trade_risk": trade_risk_tool(product_id),
+                })
+
+            seller_views.append({
+                "seller_id": seller_id,
+                "seller_name": seller.get("seller_name"),
+                "seller_profile": seller_profile,
+                "review_features": review_feature_tool(seller_id),
+                "products": products,
+            })
+
+        scores = score_sellers(
+            seller_views,
+            lambda shard: self._score_shard(user_input, shard),
+            agent="combined_agent",
+            score_keys=("product_score", "reliability_score"),
+        )
+
+        product_results: List[Dict[str, Any]] = []
+        reliability_results: List[Dict[str, Any]] = []
+        for seller in sellers_with_products:
+            seller_id = seller.get("seller_id")
+            score = scores.get(str(seller_id), {})
+            base = {
+                "seller_id": seller_id,
+                "seller_name": seller.get("seller_name"),
+                "products": seller.get("products", []),
+            }
+            product_results.append({
+                **base,
+                "product_score": score.get("product_score", 0.5),
+                "product_reasoning": score.get("reasoning", ""),
+                "seller_characteristics": score.get("seller_characteristics", ""),
+                "recommended_price_range": score.get("price_range", {"min": 0, "max": 0}),
+            })
+            reliability_results.append({
+                **base,
+                "reliability_score": score.get("reliability_score", 0.5),
+                "reliability_reasoning": score.get("reasoning", ""),
+                "seller_profile_summary": score.get("seller_characteristics", ""),
+                "reliability_features_matched": score.get("matched_features", []),
+                "trust_level": score.get("trust_level", "medium"),
+            })
+
+        product_results.sort(key=lambda x: x["product_score"], reverse=True)
+        reliability_results.sort(key=lambda x: x["reliability_score"], reverse=True)
+        return {"product": product_results, "reliability": reliability_results}
+
+    def _score_shard(
+        self,
+        user_input: Dict[str, Any],
+        seller_views: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        판매자 그룹 하나를 LLM 한 번으로 점수화
+
+        Returns:
+            seller_id(str) → 점수 객체 (내부 필드명)
+        """
+        context = {
+            "user_preferences": {k: user_input.get(k) for k in _PREFERENCE_KEYS},
+            "sellers": seller_views,
+        }
+
+        decision = self.llm_agent.decide_structured(
+            context=context,
+            decision_task=self.combined_prompt,
+            schema=CombinedScoring,
+        )
+        if decision is None:
+            return {}
+
+        return {
+            str(rec.id): {
+                "product_score": rec.ps,
+                "reliability_score": rec.rs,
+                "trust_level": rec.tl,
+                "seller_characteristics": rec.ch,
+                "matched_features": rec.tags,
+                "price_range": {"min": rec.pmin, "max": rec.pmax},
+                "reasoning": rec.why,
+            }
+            for rec in decision.s
+        }
+
+
+def combined_agent_node(state: RecommendationState) -> dict:
+    """통합 점수화 에이전트 노드 (product_agent + reliability_agent 대체)"""
+    try:
+        user_input = state["user_input"]
+
+        agent = CombinedScoringAgent()
+
+        from server.utils.workflow_utils import fetch_sellers_for_query
+        from server.workflow.agents.candidate_pool import (
+            AGENT_BUDGETS,
+            prerank_sellers,
+            size_candidate_pool,
+        )
+
+        search_query = state.get("search_query", {})
+
+        try:
+            # 후보 검색 노드 결과가 있으면 사용 (검색어와 관련된 판매자)
+            sellers_with_products = state.get("candidate_sellers")
+            if not sellers_with_products:
+                sellers_with_products = prerank_sellers(user_input, fetch_sellers_for_query(
+                    search_query, user_input, limit=AGENT_BUDGETS["combined_agent"].fetch_limit))
+
+            # 토큰/지연 시간 예산에 맞춰 판매자 수, 판매자당 상품 수 결정
+            sellers_with_products, candidate_pool = size_candidate_pool(
+                "combined_agent", sellers_with_products)
+
+            logger.info(
+                "통합 점수화용 판매자 조회 완료",
+                extra={
+                    "seller_count": len(sellers_with_products),
+                    "candidate_pool": candidate_pool,
+                }
+            )
+
+            if not sellers_with_products:
+                raise ValueError("필터 조건에 맞는 상품이 없습니다.")
+        except Exception as e:
+            logger.exception("통합 점수화 에이전트 DB 조회 실패")
+            raise ValueError(f"통합 점수화 에이전트 데이터 조회 실패: {str(e)}")
+
+        results = agent.score_sellers(user_input, sellers_with_products)
+
+        logger.info(
+            "통합 점수화 에이전트 분석 완료",
+            extra={"recommended_sellers": len(results["product"])},
+        )
+
+        return {
+            "product_agent_recommendations": {
+                "recommended_sellers": results["product"],
+                "reasoning": "통합 점수화: 상품 특성 관점 점수",
+            },
+            "reliability_agent_recommendations": {
+                "recommended_sellers": results["reliability"],
+                "reasoning": "통합 점수화: 신뢰도 관점 점수",
+            },
+            "candidate_pools": {"combined_agent": candidate_pool},
+            "completed_steps": ["product_analysis", "reliability_analysis"],
+        }
+
+    except Exception as e:
+        logger.exception("통합 점수화 에이전트 오류")
+        error = f"통합 점수화 에이전트 오류: {str(e)}"
+        return {
+            "product_agent_recommendations": {
+                "recommended_sellers": [], "reasoning": "", "error": error},
+            "reliability_agent_recommendations": {
+                "recommended_sellers": [], "reasoning": "", "error": error},
+            "completed_steps": ["product_analysis", "reliability_analysis"],
+        }
@@ -4,15 +4,138 @@ ProductAgent와 ReliabilityAgent의 결과를 통합하여
 최종 판매자 랭킹 생성
 """
 
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any, List, Optional
+from server.db.seller_persona import nearest_sellers, rank_sellers_by_persona
 from server.workflow.state import RecommendationState
 from server.utils.llm_agent import create_agent
 from server.workflow.prompts import load_prompt
+from server.workflow.schemas import FinalRanking, SUMMARY_MAX_CHARS
 from server.utils.logger import get_logger
-from server.utils.tools import match_products_to_sellers as rule_based_match
+from server.utils.tools import fetch_match_candidates, match_products_to_sellers as rule_based_match
 
 logger = get_logger(__name__)
 
+# 오케스트레이터 입력 상한 (추정 토큰, 컨텍스트 부분만) / 판매자별 대표 상품 제목 수
+ORCHESTRATOR_CONTEXT_MAX_TOKENS = int(os.getenv("ORCHESTRATOR_CONTEXT_MAX_TOKENS", "3000"))
+ORCHESTRATOR_CONTEXT_TITLES = int(os.getenv("ORCHESTRATOR_CONTEXT_TITLES", "3"))
+_TITLE_MAX_CHARS = 40
+
+_PREFERENCE_KEYS = (
+    "search_query", "category", "price_min", "price_max", "trust_safety", "quality_condition",
+    "remote_transaction", "activity_responsiveness", "price_flexibility",
+)
+
+# 결정적 결합기: 페르소나 매칭 점수 가중치, 신뢰 수준 low 판매자 점수 상한
+DETERMINISTIC_PERSONA_WEIGHT = 0.2
+DETERMINISTIC_LOW_TRUST_CAP = 0.5
+
+# 후보 검색 결과도 없을 때 페르소나 인덱스에서 가져올 판매자 수 (상품 매칭에서 빠지는 판매자 여유분 포함)
+PERSONA_FALLBACK_POOL = 30
+
+
+def merge_agent_sellers(
+    product_agent_results: Dict[str, Any],
+    reliability_agent_results: Dict[str, Any],
+) -> Dict[int, Dict[str, Any]]:
+    """판매자 정보 통합 (ProductAgent 결과 우선, ReliabilityAgent에만 있는 판매자 추가)"""
+    all_sellers: Dict[int, Dict[str, Any]] = {}
+    for seller in product_agent_results.get("recommended_sellers", []):
+        sid = seller.get("seller_id")
+        if sid is not None:
+            all_sellers[sid] = seller
+    for seller in reliability_agent_results.get("recommended_sellers", []):
+        sid = seller.get("seller_id")
+        if sid is not None and sid not in all_sellers:
+            all_sellers[sid] = seller
+    return all_sellers
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (ASCII 4자 ≈ 1토큰, 한글 등은 1.5자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def build_orchestrator_context(
+    user_input: Dict[str, Any],
+    product_agent_results: Dict[str, Any],
+    reliability_agent_results: Dict[str, Any],
+    max_tokens: int = ORCHESTRATOR_CONTEXT_MAX_TOKENS,
+    titles_per_seller: int = ORCHESTRATOR_CONTEXT_TITLES,
+) -> Dict[str, Any]:
+    """
+    오케스트레이터 LLM 입력 구성 (판매자별 요약만 전달)
+    서브에이전트 결과 전체(상품 설명, 긴 근거 문자열)와 대화 기록은 넣지 않고,
+    판매자당 ID / 두 점수 / 신뢰 수준 / 성향 요약 / 특징 태그 / 대표 상품 제목만 담는다.
+
+    판매자는 두 점수 평균 내림차순으로 추가하며, 추정 토큰이 max_tokens를 넘는 판매자부터 제외 (최소 1명)
+
+    Returns:
+        {"user_preferences": ..., "sellers": [...]}
+    """
+    sellers: Dict[Any, Dict[str, Any]] = {}
+
+    def entry(seller: Dict[str, Any]) -> Dict[str, Any]:
+        sid = seller["seller_id"]
+        if sid not in sellers:
+            sellers[sid] = {
+                "id": sid,
+                "name": seller.get("seller_name") or "",
+                "ps": None,
+                "rs": None,
+                "tl": None,
+                "ch": "",
+                "tags": [],
+                "items": [
+                    (p.get("title") or "")[:_TITLE_MAX_CHARS]
+                    for p in (seller.get("products") or [])[:titles_per_seller]
+                ],
+            }
+        return sellers[sid]
+
+    for seller in product_agent_results.get("recommended_sellers", []):
+        if seller.get("seller_id") is None:
+            continue
+        item = entry(seller)
+        item["ps"] = round(seller.get("product_score", 0.5), 3)
+        item["ch"] = (seller.get("seller_characteristics") or "")[:SUMMARY_MAX_CHARS]
+    for seller in reliability_agent_results.get("recommended_sellers", []):
+        if seller.get("seller_id") is None:
+            continue
+        item = entry(seller)
+        item["rs"] = round(seller.get("reliability_score", 0.5), 3)
+        item["tl"] = seller.get("trust_level")
+        item["tags"] = list(seller.get("reliability_features_matched") or [])
+        if not item["ch"]:
+            item["ch"] = (seller.get("seller_profile_summary") or "")[:SUMMARY_MAX_CHARS]
+
+    ranked = sorted(
+        sellers.values(),
+        key=lambda s: ((s["ps"] if s["ps"] is not None else 0.5)
+                       + (s["rs"] if s["rs"] is not None else 0.5)),
+        reverse=True,
+    )
+
+    preferences = {k: user_input.get(k) for k in _PREFERENCE_KEYS if user_input.get(k) is not None}
+    # LLM 프롬프트는 "- key: value" 형태로 직렬화되므로 같은 문자열로 추정
+    used = estimate_tokens(f"- user_preferences: {preferences}\n- sellers: []\n")
+    selected: List[Dict[str, Any]] = []
+    for item in ranked:
+        cost = estimate_tokens(f"{item}, ")
+        if selected and used + cost > max_tokens:
+            break
+        selected.append(item)
+        used += cost
+
+    if len(selected) < len(ranked):
+        logger.info(
+            "오케스트레이터 입력 상한으로 판매자 제외",
+            extra={"selected": len(selected), "total": len(ranked), "max_tokens": max_tokens},
+        )
+
+    return {"user_preferences": preferences, "sellers": selected}
+
 
 class OrchestratorAgent:
     """최종 통합 및 랭킹 에이전트 - LLM 기반 자율 판단"""
@@ -23,11 +146,17 @@ class OrchestratorAgent:
         self.orchestrator_prompt = load_prompt(
             "orchestrator_recommendation_prompt")
 
+    def warm_up(self) -> None:
+        """오케스트레이터 프롬프트 prefix 캐시 워밍 (speculative 모드)"""
+        self.llm_agent.warm_prefix(self.orchestrator_prompt, schema=FinalRanking)
+
     def finalize_recommendations(
         self,
         user_input: Dict[str, Any],
         product_agent_results: Dict[str, Any],
         reliability_agent_results: Dict[str, Any],
+        candidate_sellers: Optional[List[Dict[str, Any]]] = None,
+        prep: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         최종 추천 생성
@@ -36,159 +165,54 @@ class OrchestratorAgent:
             user_input: 사용자 입력
             product_agent_results: ProductAgent 결과
             reliability_agent_results: ReliabilityAgent 결과
+            candidate_sellers: 후보 검색 결과 (두 에이전트 모두 실패 시 페르소나 매칭으로 추천,
+                없으면 페르소나 인덱스의 top-k 판매자 사용)
+            prep: speculative 모드에서 미리 준비한 all_sellers / sellers_with_products
 
         Returns:
             최종 추천 결과
         """
-        # 에러 체크
-        product_error = product_agent_results.get("error")
-        reliability_error = reliability_agent_results.get("error")
-
-        product_sellers = product_agent_results.get("recommended_sellers", [])
-        reliability_sellers = reliability_agent_results.get(
-            "recommended_sellers", [])
-
-        # 두 에이전트 모두 실패한 경우
-        if (product_error and reliability_error) or (not product_sellers and not reliability_sellers):
-            logger.warning(
-                "두 에이전트 모두 실패 또는 빈 결과",
-                extra={
-                    "product_error": product_error,
-                    "reliability_error": reliability_error,
-                    "product_count": len(product_sellers),
-                    "reliability_count": len(reliability_sellers),
-                }
-            )
-            return {
-                "recommended_sellers": [],
-                "reasoning": f"상품 분석 오류: {product_error or '없음'}, 신뢰도 분석 오류: {reliability_error or '없음'}",
-            }
-
-        # 하나의 에이전트만 성공한 경우
-        if not product_sellers or not reliability_sellers:
-            logger.warning(
-                "하나의 에이전트만 성공",
-                extra={
-                    "product_count": len(product_sellers),
-                    "reliability_count": len(reliability_sellers),
-                }
-            )
-            # 성공한 에이전트의 결과만 사용
-            if product_sellers and not reliability_sellers:
-                return {
-                    "recommended_sellers": product_sellers[:10],
-                    "reasoning": "신뢰도 분석 실패로 상품 특성만 고려하여 추천합니다.",
-                }
-            elif reliability_sellers and not product_sellers:
-                return {
-                    "recommended_sellers": reliability_sellers[:10],
-                    "reasoning": "상품 특성 분석 실패로 신뢰도만 고려하여 추천합니다.",
-                }
+        degraded = self._degraded_result(
+            user_input, product_agent_results, reliability_agent_results, candidate_sellers)
+        if degraded is not None:
+            return degraded
 
         # -------------------------------------------------------------
-        # 🔥 1) LLM에게 넘길 context 구성
+        # 🔥 1) LLM에게 넘길 context 구성 (판매자별 요약, 토큰 상한 적용)
         # -------------------------------------------------------------
-        sub_agent_results = [
-            {
-                "agent": "product",
-                "results": {
-                    **product_agent_results,
-                    "user_input": user_input,
-                },
-            },
-            {
-                "agent": "reliability",
-                "results": {
-                    **reliability_agent_results,
-                    "user_input": user_input,
-                },
-            },
-        ]
-
-        context = {
-            "sub_agent_results": sub_agent_results,
-            "user_input": user_input,
-        }
+        context = build_orchestrator_context(
+            user_input, product_agent_results, reliability_agent_results)
 
         # -------------------------------------------------------------
         # 🔥 2) LLM에게 판단 요청
         # -------------------------------------------------------------
-        decision = self.llm_agent.decide(
+        decision = self.llm_agent.decide_structured(
             context=context,
             decision_task=self.orchestrator_prompt,
-            format="json",
+            schema=FinalRanking,
         )
 
-        # LLM 호출 실패 체크
-        if decision.get("error") or decision.get("fallback"):
-            logger.warning(
-                "LLM 호출 실패, 기본 결합 로직 사용",
-                extra={"error": decision.get("error")}
-            )
+        # LLM 호출 / 응답 검증 실패 체크
+        if decision is None:
+            logger.warning("LLM 호출 실패, 기본 결합 로직 사용")
             # 기본 결합 로직으로 fallback
-            return self._fallback_combine(product_sellers, reliability_sellers)
+            return self._fallback_combine(
+                product_agent_results.get("recommended_sellers", []),
+                reliability_agent_results.get("recommended_sellers", []),
+                user_input,
+            )
 
         # -------------------------------------------------------------
         # 🔥 3) LLM 결과 파싱 및 상품 매칭
         # -------------------------------------------------------------
-        final_recommendations = decision.get("final_recommendations", {})
-        if not final_recommendations:
-            logger.warning("LLM 결과에 final_recommendations 없음, 기본 결합 로직 사용")
-            return self._fallback_combine(product_sellers, reliability_sellers)
-
-        # LLM이 준 seller_ids / scores 원본
-        seller_ids = final_recommendations.get("seller_ids", [])
-        raw_scores = final_recommendations.get("scores", {})
-
-        # 🔥 scores를 항상 dict[str, dict] 형태로 정규화
-        scores: Dict[str, Dict[str, Any]] = {}
-
-        # case 1: 이미 dict인 경우
-        if isinstance(raw_scores, dict):
-            scores = {
-                str(k): v
-                for k, v in raw_scores.items()
-                if isinstance(v, dict)
-            }
-
-        # case 2: list로 온 경우 (예: [{"seller_id": ..., "score": ...}, ...])
-        elif isinstance(raw_scores, list):
-            for item in raw_scores:
-                if isinstance(item, dict) and "seller_id" in item:
-                    sid = item.get("seller_id")
-                    if sid is not None:
-                        scores[str(sid)] = item
-
-        # case 3: 그 외(str/None 등)는 무시 → 빈 dict 유지
-        else:
-            scores = {}
-
-        if not seller_ids:
-            logger.warning("LLM 결과에 seller_ids 없음, 기본 결합 로직 사용")
-            return self._fallback_combine(product_sellers, reliability_sellers)
-
-        # 판매자 ID를 정수로 변환
-        recommended_seller_ids: List[int] = []
-        for seller_id in seller_ids:
-            try:
-                recommended_seller_ids.append(int(seller_id))
-            except (ValueError, TypeError):
-                try:
-                    recommended_seller_ids.append(int(str(seller_id)))
-                except Exception:
-                    logger.warning(f"판매자 ID 변환 실패: {seller_id}")
-                    continue
+        # 추천 순서 그대로 seller_id, 판매자별 점수/설명
+        recommended_seller_ids: List[int] = [rec.id for rec in decision.r]
+        scores = {rec.id: rec for rec in decision.r}
 
         # 판매자 정보 통합 (ProductAgent와 ReliabilityAgent 결과 병합)
-        all_sellers: Dict[int, Dict[str, Any]] = {}
-        for seller in product_agent_results.get("recommended_sellers", []):
-            sid = seller.get("seller_id")
-            if sid is not None:
-                all_sellers[sid] = seller
-        for seller in reliability_agent_results.get("recommended_sellers", []):
-            sid = seller.get("seller_id")
-            if sid is not None and sid not in all_sellers:
-                all_sellers[sid] = seller
+        prep = prep or {}
+        all_sellers = prep.get("all_sellers") or merge_agent_sellers(
+            product_agent_results, reliability_agent_results)
 
         # 최종 추천된 판매자만 필터링
         recommended_sellers_list = [
@@ -201,18 +225,16 @@ class OrchestratorAgent:
         matched_sellers = rule_based_match(
             recommended_sellers_list,
             user_input,
+            sellers_with_products=prep.get("sellers_with_products"),
         )
 
         # 최종 점수와 추론 정보 추가
         for matched_seller in matched_sellers:
-            seller_id_str = str(matched_seller["seller_id"])
-            if seller_id_str in scores:
-                matched_seller["final_score"] = scores[seller_id_str].get(
-                    "score", 0.5)
-                matched_seller["final_reasoning"] = scores[seller_id_str].get(
-                    "reasoning", "")
-                matched_seller["match_explanation"] = scores[seller_id_str].get(
-                    "match_explanation", "")
+            score = scores.get(matched_seller["seller_id"])
+            if score is not None:
+                matched_seller["final_score"] = score.sc
+                matched_seller["final_reasoning"] = score.why
+                matched_seller["match_explanation"] = score.fit
             else:
                 # LLM 결과에 없으면 기본값 사용
                 matched_seller["final_score"] = (
@@ -228,15 +250,154 @@ class OrchestratorAgent:
 
         return {
             "recommended_sellers": matched_sellers,
-            "reasoning": decision.get("reasoning", "최종 추천 완료"),
+            "reasoning": decision.why or "최종 추천 완료",
+        }
+
+    def finalize_deterministic(
+        self,
+        user_input: Dict[str, Any],
+        product_agent_results: Dict[str, Any],
+        reliability_agent_results: Dict[str, Any],
+        candidate_sellers: Optional[List[Dict[str, Any]]] = None,
+        prep: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        LLM 호출 없는 최종 추천 (WORKFLOW_FINALIZER=deterministic)
+        신뢰도 가중치를 trust_safety 슬라이더로 정하고 (0.3~0.7), 페르소나 매칭 점수를 함께 반영
+
+        Args/Returns: finalize_recommendations와 동일
+        """
+        degraded = self._degraded_result(
+            user_input, product_agent_results, reliability_agent_results, candidate_sellers)
+        if degraded is not None:
+            return degraded
+
+        prep = prep or {}
+        all_sellers = {
+            sid: dict(seller)
+            for sid, seller in (prep.get("all_sellers") or merge_agent_sellers(
+                product_agent_results, reliability_agent_results)).items()
+        }
+        # ProductAgent 결과 우선으로 병합되므로 신뢰도 필드를 보충
+        for seller in reliability_agent_results.get("recommended_sellers", []):
+            merged = all_sellers.get(seller.get("seller_id"))
+            if merged is None:
+                continue
+            for key in ("reliability_score", "reliability_reasoning", "trust_level",
+                        "seller_profile_summary", "reliability_features_matched"):
+                if key in seller:
+                    merged.setdefault(key, seller[key])
+
+        trust_weight = 0.3 + 0.4 * min(100, max(0, user_input.get("trust_safety", 50))) / 100
+        persona = {
+            s["seller_id"]: s["persona_score"]
+            for s in rank_sellers_by_persona(user_input, list(all_sellers.values()))
+        }
+
+        ranked = []
+        for sid, seller in all_sellers.items():
+            product_score = seller.get("product_score", 0.5)
+            reliability_score = seller.get("reliability_score", 0.5)
+            agent_score = trust_weight * reliability_score + (1 - trust_weight) * product_score
+            final_score = ((1 - DETERMINISTIC_PERSONA_WEIGHT) * agent_score
+                           + DETERMINISTIC_PERSONA_WEIGHT * persona.get(sid, 0.5))
+            if seller.get("trust_level") == "low":
+                final_score = min(final_score, DETERMINISTIC_LOW_TRUST_CAP)
+
+            strength = "신뢰도" if reliability_score >= product_score else "상품 특성"
+            ranked.append({
+                **seller,
+                "seller_id": sid,
+                "product_score": product_score,
+                "reliability_score": reliability_score,
+                "persona_score": persona.get(sid, 0.5),
+                "final_score": final_score,
+                "final_reasoning": (
+                    f"상품 특성 {product_score:.2f}, 신뢰도 {reliability_score:.2f}를 "
+                    f"신뢰 선호도에 맞춰 {1 - trust_weight:.0%}:{trust_weight:.0%}로 결합했습니다."),
+                "match_explanation": f"{strength}을(를) 중시하는 사용자에게 적합합니다.",
+            })
+        ranked.sort(key=lambda x: x["final_score"], reverse=True)
+
+        # 상품이 없는 판매자는 매칭에서 빠지므로 여유 있게 넘긴 뒤 상위 10명 사용
+        matched_sellers = rule_based_match(
+            ranked[:20],
+            user_input,
+            sellers_with_products=prep.get("sellers_with_products"),
+        )[:10]
+
+        return {
+            "recommended_sellers": matched_sellers,
+            "reasoning": (
+                f"상품 특성과 신뢰도를 {1 - trust_weight:.0%}:{trust_weight:.0%}로 결합하고 "
+                f"선호도 매칭 점수를 {DETERMINISTIC_PERSONA_WEIGHT:.0%} 반영해 추천합니다."),
         }
 
+    def _degraded_result(
+        self,
+        user_input: Dict[str, Any],
+        product_agent_results: Dict[str, Any],
+        reliability_agent_results: Dict[str, Any],
+        candidate_sellers: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """한쪽 또는 두 에이전트가 모두 실패한 경우의 추천 결과 (둘 다 성공하면 None)"""
+        # 에러 체크
+        product_error = product_agent_results.get("error")
+        reliability_error = reliability_agent_results.get("error")
+
+        product_sellers = product_agent_results.get("recommended_sellers", [])
+        reliability_sellers = reliability_agent_results.get(
+            "recommended_sellers", [])
+
+        # 두 에이전트 모두 실패한 경우
+        if (product_error and reliability_error) or (not product_sellers and not reliability_sellers):
+            logger.warning(
+                "두 에이전트 모두 실패 또는 빈 결과",
+                extra={
+                    "product_error": product_error,
+                    "reliability_error": reliability_error,
+                    "product_count": len(product_sellers),
+                    "reliability_count": len(reliability_sellers),
+                }
+            )
+            candidates = candidate_sellers or self._nearest_persona_candidates(user_input)
+            if candidates:
+                return self._persona_fallback(user_input, candidates)
+            return {
+                "recommended_sellers": [],
+                "reasoning": f"상품 분석 오류: {product_error or '없음'}, 신뢰도 분석 오류: {reliability_error or '없음'}",
+            }
+
+        # 하나의 에이전트만 성공한 경우
+        if not product_sellers or not reliability_sellers:
+            logger.warning(
+                "하나의 에이전트만 성공",
+                extra={
+                    "product_count": len(product_sellers),
+                    "reliability_count": len(reliability_sellers),
+                }
+            )
+            # 성공한 에이전트의 결과만 사용
+            if product_sellers and not reliability_sellers:
+                return {
+                    "recommended_sellers": product_sellers[:10],
+                    "reasoning": "신뢰도 분석 실패로 상품 특성만 고려하여 추천합니다.",
+                }
+            elif reliability_sellers and not product_sellers:
+                return {
+                    "recommended_sellers": reliability_sellers[:10],
+                    "reasoning": "상품 특성 분석 실패로 신뢰도만 고려하여 추천합니다.",
+                }
+
+        return None
+
     def _fallback_combine(
         self,
         product_sellers: List[Dict[str, Any]],
         reliability_sellers: List[Dict[str, Any]],
+        user_input: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """기본 결합 로직 (LLM 실패 시 사용)"""
+        """기본 결합 로직 (LLM 실패 시 사용, 페르소나 벡터가 있으면 선호도 매칭 점수도 반영)"""
         # 판매자 ID 수집
         seller_ids = set()
         for seller in product_sellers:
@@ -263,12 +424,21 @@ class OrchestratorAgent:
                     "product_score": seller.get("product_score", 0.5),
                 }
 
-        # 최종 점수 계산 (기본 가중치: 50:50)
+        persona_scores = {}
+        if user_input is not None:
+            persona_scores = {
+                s["seller_id"]: s["persona_score"]
+                for s in rank_sellers_by_persona(user_input, list(seller_dict.values()))
+            }
+
+        # 최종 점수 계산 (기본 가중치: 50:50, 페르소나 점수가 있으면 1/3씩)
         fallback_sellers = []
         for seller_id, seller_data in seller_dict.items():
             product_score = seller_data.get("product_score", 0.5)
             reliability_score = seller_data.get("reliability_score", 0.5)
             final_score = product_score * 0.5 + reliability_score * 0.5
+            if seller_id in persona_scores:
+                final_score = (product_score + reliability_score + persona_scores[seller_id]) / 3
 
             fallback_sellers.append({
                 "seller_id": seller_id,
@@ -289,6 +459,78 @@ class OrchestratorAgent:
         }
 
 
+    def _nearest_persona_candidates(self, user_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """후보 검색 결과가 없을 때 선호도와 가까운 판매자를 페르소나 인덱스에서 찾아 조건에 맞는 상품 매칭"""
+        nearest = nearest_sellers(user_input, PERSONA_FALLBACK_POOL)
+        if not nearest:
+            return []
+        sellers_with_products = fetch_match_candidates([sid for sid, _ in nearest])
+        names = {s["seller_id"]: s.get("seller_name") for s in sellers_with_products}
+        return rule_based_match(
+            [{"seller_id": sid, "seller_name": names.get(sid, "")} for sid, _ in nearest],
+            user_input,
+            sellers_with_products=sellers_with_products,
+        )
+
+    def _persona_fallback(
+        self,
+        user_input: Dict[str, Any],
+        candidate_sellers: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """LLM 없이 후보 판매자를 사용자 슬라이더 - 판매자 페르소나 매칭 점수로 추천"""
+        ranked = rank_sellers_by_persona(user_input, candidate_sellers)[:10]
+        reasoning = "에이전트 분석 실패로 선호도와 판매자 성향 매칭 점수로 추천합니다."
+        return {
+            "recommended_sellers": [
+                {
+                    "seller_id": seller.get("seller_id"),
+                    "seller_name": seller.get("seller_name", ""),
+                    "products": seller.get("products", []),
+                    "final_score": seller["persona_score"],
+                    "persona_score": seller["persona_score"],
+                    "final_reasoning": reasoning,
+                    "match_explanation": "선호도 슬라이더와 성향이 가까운 판매자입니다.",
+                }
+                for seller in ranked
+            ],
+            "reasoning": reasoning,
+        }
+
+
+def deterministic_orchestrator_node(state: RecommendationState) -> dict:
+    """결정적 결합 노드 (LLM 호출 없이 서브에이전트 점수를 결합)"""
+    try:
+        final_results = OrchestratorAgent().finalize_deterministic(
+            state["user_input"],
+            state.get("product_agent_recommendations", {}),
+            state.get("reliability_agent_recommendations", {}),
+            candidate_sellers=state.get("candidate_sellers"),
+            prep=state.get("orchestrator_prep"),
+        )
+
+        logger.info(
+            "결정적 결합 완료",
+            extra={"recommended_sellers": len(final_results.get("recommended_sellers", []))},
+        )
+
+        return {
+            "final_seller_recommendations": final_results.get("recommended_sellers", []),
+            "ranking_explanation": final_results.get("reasoning", ""),
+            "current_step": "completed",
+            "completed_steps": ["orchestration"],
+        }
+
+    except Exception as e:
+        logger.exception("결정적 결합 오류")
+        return {
+            "final_seller_recommendations": [],
+            "ranking_explanation": f"결정적 결합 오류: {str(e)}",
+            "error_message": f"결정적 결합 오류: {str(e)}",
+            "current_step": "error",
+            "completed_steps": ["orchestration"],
+        }
+
+
 def orchestrator_agent_node(state: RecommendationState) -> dict:
     """최종 통합 및 랭킹 에이전트 노드"""
     try:
@@ -313,6 +555,8 @@ def orchestrator_agent_node(state: RecommendationState) -> dict:
             user_input,
             product_agent_results,
             reliability_agent_results,
+            candidate_sellers=state.get("candidate_sellers"),
+            prep=state.get("orchestrator_prep"),
         )
 
         logger.info(
@@ -4,17 +4,22 @@ from __future__ import annotations
 import os
 import re
 import json
+import math
+import calendar
 import time
+import heapq
 import sqlite3
+import threading
 import asyncio
 import contextlib
 import urllib.parse
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
-from statistics import median, mean
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 from openai import OpenAI
 
+from server.utils.market_stats import QuantileSketch, iqr_filter as _iqr_filter, summarize_prices
+
 # === 설정 ===============================================================
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./used_pricer.db")
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")        # 없으면 호출 시 에러
@@ -22,6 +27,21 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")   # 없으면 휴리스틱
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")
 UPDATE_BATCH_LIMIT = int(os.getenv("UPDATE_BATCH_LIMIT", "100"))
 
+# 시세 갱신 스케줄링 (staleness / 인기도 / 변동성 기반)
+PRICING_BASE_INTERVAL_HOURS = float(
+    os.getenv("PRICING_BASE_INTERVAL_HOURS", "24"))
+PRICING_MIN_INTERVAL_HOURS = float(
+    os.getenv("PRICING_MIN_INTERVAL_HOURS", "1"))
+PRICING_MAX_INTERVAL_HOURS = float(
+    os.getenv("PRICING_MAX_INTERVAL_HOURS", "168"))
+PRICING_WORKER_IDLE_SECONDS = float(
+    os.getenv("PRICING_WORKER_IDLE_SECONDS", "60"))
+# 검색어별 시세 스케치 유지 기간 (지나면 새로 누적)
+MARKET_SKETCH_WINDOW_HOURS = float(
+    os.getenv("MARKET_SKETCH_WINDOW_HOURS", "168"))
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 # === 데이터 모델 =========================================================
 
 
@@ -148,21 +168,19 @@ def serp_search(query: str, max_results: int = 30) -> List[Listing]:
 
 
 def iqr_filter(values: List[float]) -> List[float]:
-    if not values:
-        return []
-    s = sorted(values)
-    n = len(s)
-    if n < 4:
-        return s
-    q1, q3 = median(s[: n//2]), median(s[(n+1)//2:])
-    iqr = q3 - q1
-    lo, hi = q1 - 1.5*iqr, q3 + 1.5*iqr
-    return [x for x in s if lo <= x <= hi]
+    return _iqr_filter(values).tolist()
 
 
 def summarize_used(values: List[float]) -> Tuple[float, float]:
-    f = iqr_filter(values)
-    return (float(mean(f)), float(median(f))) if f else (0.0, 0.0)
+    return summarize_prices(values)
+
+
+def accept_new_prices(values: List[float], sketch: QuantileSketch) -> List[float]:
+    """새 시세 중 이상치 제외: 누적 표본이 충분하면 스케치의 IQR, 아니면 이번 표본의 IQR 사용"""
+    if sketch.n >= 20:
+        lo, hi = sketch.iqr_bounds()
+        return [v for v in values if lo <= v <= hi]
+    return iqr_filter(values)
 
 
 def compute_discounts(my_price: float, used_avg: float, used_p50: float) -> Dict[str, float]:
@@ -200,33 +218,192 @@ class DB:
                 price REAL, is_active INTEGER DEFAULT 1,
                 market_price_used_avg REAL, market_price_used_p50 REAL,
                 discount_vs_used_avg REAL, discount_vs_used_p50 REAL,
-                last_pricing_updated_at TEXT
+                last_pricing_updated_at TEXT,
+                view_count INTEGER DEFAULT 0, like_count INTEGER DEFAULT 0,
+                price_volatility REAL DEFAULT 0, next_pricing_due_at TEXT
+            );
+            """)
+            # 기존 DB에는 스케줄링 컬럼이 없으므로 보강
+            cols = {row[1] for row in self.conn.execute(
+                "PRAGMA table_info(items)")}
+            for name, ddl in (
+                ("view_count", "INTEGER DEFAULT 0"),
+                ("like_count", "INTEGER DEFAULT 0"),
+                ("price_volatility", "REAL DEFAULT 0"),
+                ("next_pricing_due_at", "TEXT"),
+            ):
+                if name not in cols:
+                    self.conn.execute(
+                        f"ALTER TABLE items ADD COLUMN {name} {ddl}")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_items_pricing_due "
+                "ON items(is_active, next_pricing_due_at)")
+            self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS market_sketches(
+                query_key TEXT PRIMARY KEY, sketch TEXT,
+                window_started_at TEXT, updated_at TEXT
             );
             """)
         # listing_cache 생략 가능
 
-    def fetch_items_to_update(self, limit: int) -> List[Dict[str, Any]]:
-        q = "SELECT id,name,brand,price FROM items WHERE is_active=1 LIMIT ?"
-        cur = self.conn.execute(q, (limit,))
+    def fetch_items_to_update(self, limit: int, now: Optional[str] = None) -> List[Dict[str, Any]]:
+        """갱신 시점이 도래한 상품 조회 (한 번도 갱신되지 않은 상품, 오래 밀린 상품 순)"""
+        now = now or time.strftime(_TS_FORMAT, time.gmtime())
+        q = """SELECT id,name,brand,price,view_count,like_count,
+        market_price_used_p50,price_volatility,last_pricing_updated_at,next_pricing_due_at
+        FROM items WHERE is_active=1
+        AND (next_pricing_due_at IS NULL OR next_pricing_due_at<=?)
+        ORDER BY next_pricing_due_at IS NOT NULL, next_pricing_due_at LIMIT ?"""
+        cur = self.conn.execute(q, (now, limit))
         cols = [c[0] for c in cur.description]
         return [dict(zip(cols, row)) for row in cur.fetchall()]
 
-    def update_item_pricing(self, item_id: int, metrics: Dict[str, Any]):
-        now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    def sync_popularity(self, counts: Dict[int, Tuple[int, int]]):
+        """카탈로그(products)의 조회수/찜 수를 items에 반영"""
+        if not counts:
+            return
+        self.conn.executemany(
+            "UPDATE items SET view_count=?, like_count=? WHERE id=?",
+            [(views, likes, item_id) for item_id, (views, likes) in counts.items()])
+
+    def next_due_at(self) -> Optional[str]:
+        """가장 가까운 다음 갱신 예정 시각"""
+        row = self.conn.execute(
+            "SELECT MIN(next_pricing_due_at) FROM items WHERE is_active=1").fetchone()
+        return row[0] if row else None
+
+    def update_item_pricing(self, item_id: int, metrics: Dict[str, Any],
+                            next_due_at: Optional[str] = None,
+                            volatility: Optional[float] = None):
+        now = time.strftime(_TS_FORMAT, time.gmtime())
         q = """UPDATE items SET market_price_used_avg=?, market_price_used_p50=?,
-        discount_vs_used_avg=?, discount_vs_used_p50=?, last_pricing_updated_at=? WHERE id=?"""
+        discount_vs_used_avg=?, discount_vs_used_p50=?, last_pricing_updated_at=?,
+        price_volatility=COALESCE(?, price_volatility), next_pricing_due_at=? WHERE id=?"""
         self.conn.execute(q, (metrics.get("used_avg"), metrics.get("used_p50"),
                               metrics.get("discount_vs_used_avg"), metrics.get(
                                   "discount_vs_used_p50"),
-                              now, item_id))
+                              now, volatility, next_due_at, item_id))
+
+    def load_sketch(self, query_key: str, max_age_hours: float) -> Tuple[QuantileSketch, str]:
+        """검색어별 시세 스케치 조회 (없거나 기간이 지났으면 빈 스케치)"""
+        now = time.strftime(_TS_FORMAT, time.gmtime())
+        row = self.conn.execute(
+            "SELECT sketch, window_started_at FROM market_sketches WHERE query_key=?",
+            (query_key,)).fetchone()
+        if row:
+            started = _parse_ts(row[1])
+            if started is not None and time.time() - started < max_age_hours * 3600.0:
+                return QuantileSketch.from_dict(json.loads(row[0])), row[1]
+        return QuantileSketch(), now
+
+    def save_sketch(self, query_key: str, sketch: QuantileSketch, window_started_at: str):
+        now = time.strftime(_TS_FORMAT, time.gmtime())
+        self.conn.execute(
+            """INSERT INTO market_sketches(query_key, sketch, window_started_at, updated_at)
+            VALUES(?,?,?,?) ON CONFLICT(query_key) DO UPDATE SET
+            sketch=excluded.sketch, window_started_at=excluded.window_started_at,
+            updated_at=excluded.updated_at""",
+            (query_key, json.dumps(sketch.to_dict()), window_started_at, now))
+
+# === 갱신 스케줄링 =======================================================
+
+
+@dataclass
+class RefreshPolicy:
+    """시세 갱신 주기 정책
+
+    갱신 주기 = base / ((1 + 인기도 가중) * (1 + 변동성 가중)), [min, max]로 클리핑
+    """
+    base_interval_hours: float = PRICING_BASE_INTERVAL_HOURS
+    min_interval_hours: float = PRICING_MIN_INTERVAL_HOURS
+    max_interval_hours: float = PRICING_MAX_INTERVAL_HOURS
+    popularity_weight: float = 0.25
+    volatility_weight: float = 4.0
+    volatility_alpha: float = 0.3      # 변동성 EWMA 계수
+    candidate_factor: int = 5          # 우선순위 재정렬용 후보 배수
+
+
+def _parse_ts(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(calendar.timegm(time.strptime(value, _TS_FORMAT)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_ts(epoch: float) -> str:
+    return time.strftime(_TS_FORMAT, time.gmtime(epoch))
+
+
+def fetch_product_popularity(item_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """카탈로그 DB products에서 상품별 (view_count, like_count) 조회 (items.id = product_id)
+
+    시세 DB는 카탈로그와 분리되어 있어 인기도는 여기서 읽어 온다.
+    카탈로그 DB에 접근할 수 없으면 빈 dict (items에 저장된 마지막 값 사용)
+    """
+    if not item_ids:
+        return {}
+    try:
+        from server.db.database import ReadSessionLocal
+        from server.db.models import Product
+    except Exception:
+        return {}
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(Product.product_id, Product.view_count, Product.like_count).filter(
+            Product.product_id.in_(item_ids)).all()
+        return {int(pid): (int(views or 0), int(likes or 0)) for pid, views, likes in rows}
+    except Exception:
+        return {}
+    finally:
+        db.close()
+
+
+def _popularity(item: Dict[str, Any]) -> float:
+    views = item.get("view_count") or 0
+    likes = item.get("like_count") or 0
+    return math.log1p(max(0, views) + 2 * max(0, likes))
+
+
+def refresh_priority(item: Dict[str, Any], now: float, policy: RefreshPolicy) -> float:
+    """갱신 우선순위: 오래됐을수록, 인기 많을수록, 시세 변동이 클수록 높음"""
+    last = _parse_ts(item.get("last_pricing_updated_at"))
+    if last is None:
+        return math.inf  # 시세가 한 번도 계산되지 않은 상품 최우선
+    staleness_hours = max(0.0, (now - last) / 3600.0)
+    volatility = item.get("price_volatility") or 0.0
+    return (staleness_hours
+            * (1 + policy.popularity_weight * _popularity(item))
+            * (1 + policy.volatility_weight * volatility))
+
+
+def update_volatility(prev_p50: Optional[float], new_p50: float,
+                      prev_volatility: Optional[float], alpha: float) -> float:
+    """직전 대비 중앙값 변화율의 EWMA"""
+    prev_volatility = prev_volatility or 0.0
+    if not prev_p50 or not new_p50:
+        return prev_volatility
+    change = abs(new_p50 - prev_p50) / prev_p50
+    return round(alpha * change + (1 - alpha) * prev_volatility, 6)
+
+
+def next_refresh_interval_hours(item: Dict[str, Any], volatility: float,
+                                policy: RefreshPolicy) -> float:
+    hours = policy.base_interval_hours / (
+        (1 + policy.popularity_weight * _popularity(item))
+        * (1 + policy.volatility_weight * volatility))
+    return max(policy.min_interval_hours, min(policy.max_interval_hours, hours))
+
 
 # === 서비스 ===============================================================
 
 
 class PriceUpdater:
-    def __init__(self, db: Optional[DB] = None):
+    def __init__(self, db: Optional[DB] = None, policy: Optional[RefreshPolicy] = None):
         self.db = db or DB(DATABASE_URL)
         self.db.ensure_schema()
+        self.policy = policy or RefreshPolicy()
 
     def update_item_once(self, item: Dict[str, Any]) -> Dict[str, float]:
         q = extract_product_query(item["name"], brand=item.get("brand"))
@@ -234,15 +411,82 @@ class PriceUpdater:
         if len(prices) < 5:
             serp = serp_search(q)
             prices.extend([ls.price_krw for ls in serp])
-        used_avg, used_p50 = summarize_used(prices)
+        # 이전 수집분과 병합하여 점진적으로 시세 갱신 (원본 가격 재계산 없음)
+        sketch, window_started_at = self.db.load_sketch(
+            q, MARKET_SKETCH_WINDOW_HOURS)
+        sketch.extend(accept_new_prices(prices, sketch))
+        self.db.save_sketch(q, sketch, window_started_at)
+        used_avg = float(sketch.mean or 0.0)
+        used_p50 = float(sketch.quantile(0.5) or 0.0)
         metrics = {"used_avg": used_avg, "used_p50": used_p50}
         metrics.update(compute_discounts(item["price"], used_avg, used_p50))
-        self.db.update_item_pricing(item["id"], metrics)
-        return metrics
+
+        volatility = update_volatility(
+            item.get("market_price_used_p50"), used_p50,
+            item.get("price_volatility"), self.policy.volatility_alpha)
+        interval = next_refresh_interval_hours(item, volatility, self.policy)
+        next_due_at = _format_ts(time.time() + interval * 3600.0)
+        self.db.update_item_pricing(
+            item["id"], metrics, next_due_at=next_due_at, volatility=volatility)
+        return {**metrics, "price_volatility": volatility, "next_pricing_due_at": next_due_at}
 
     def run_batch(self, limit: int = UPDATE_BATCH_LIMIT) -> List[Dict[str, Any]]:
-        items = self.db.fetch_items_to_update(limit)
-        return [{"id": it["id"], **self.update_item_once(it)} for it in items]
+        return RefreshScheduler(self).run_once(limit)
+
+
+class RefreshScheduler:
+    """갱신 시점이 도래한 상품을 우선순위 순으로 처리하는 스케줄러
+
+    cron 배치(run_once)와 상주 워커(run_forever) 모두 지원한다.
+    """
+
+    def __init__(self, updater: PriceUpdater,
+                 popularity_source: Optional[
+                     Callable[[List[int]], Dict[int, Tuple[int, int]]]] = None):
+        self.updater = updater
+        self.policy = updater.policy
+        self.popularity_source = popularity_source or fetch_product_popularity
+
+    def next_batch(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        candidates = self.updater.db.fetch_items_to_update(
+            limit * self.policy.candidate_factor, now=_format_ts(now))
+        # 우선순위/갱신 주기 계산 전에 최신 인기도 반영 (items에도 저장)
+        counts = self.popularity_source([it["id"] for it in candidates])
+        for it in candidates:
+            if it["id"] in counts:
+                it["view_count"], it["like_count"] = counts[it["id"]]
+        self.updater.db.sync_popularity(counts)
+        return heapq.nlargest(
+            limit, candidates, key=lambda it: refresh_priority(it, now, self.policy))
+
+    def run_once(self, limit: int = UPDATE_BATCH_LIMIT) -> List[Dict[str, Any]]:
+        results = []
+        for item in self.next_batch(limit):
+            try:
+                results.append({"id": item["id"], **self.updater.update_item_once(item)})
+            except Exception as e:
+                # 한 상품 실패가 배치 전체를 멈추지 않도록 다음 주기로 미룸
+                retry_at = _format_ts(
+                    time.time() + self.policy.min_interval_hours * 3600.0)
+                self.updater.db.conn.execute(
+                    "UPDATE items SET next_pricing_due_at=? WHERE id=?", (retry_at, item["id"]))
+                results.append({"id": item["id"], "error": str(e)})
+        return results
+
+    def run_forever(self, limit: int = UPDATE_BATCH_LIMIT,
+                    idle_seconds: float = PRICING_WORKER_IDLE_SECONDS,
+                    stop_event: Optional[threading.Event] = None):
+        """백그라운드 워커: 도래한 상품이 없으면 다음 예정 시각까지 대기"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            if self.run_once(limit):
+                continue
+            wait = idle_seconds
+            next_due = _parse_ts(self.updater.db.next_due_at())
+            if next_due is not None:
+                wait = min(idle_seconds, max(1.0, next_due - time.time()))
+            stop_event.wait(wait)
 
 
 # === CLI =================================================================
@@ -251,11 +495,21 @@ if __name__ == "__main__":
     import sys
     ap = argparse.ArgumentParser()
     ap.add_argument("--limit", type=int, default=UPDATE_BATCH_LIMIT)
+    ap.add_argument("--loop", action="store_true",
+                    help="상주 워커로 실행 (갱신 시점이 된 상품을 계속 처리)")
+    ap.add_argument("--idle-seconds", type=float,
+                    default=PRICING_WORKER_IDLE_SECONDS)
     args = ap.parse_args()
     svc = PriceUpdater()
     try:
-        res = svc.run_batch(limit=args.limit)
-        sys.stdout.write(json.dumps(res, ensure_ascii=False, indent=2))
+        if args.loop:
+            RefreshScheduler(svc).run_forever(
+                limit=args.limit, idle_seconds=args.idle_seconds)
+        else:
+            res = svc.run_batch(limit=args.limit)
+            sys.stdout.write(json.dumps(res, ensure_ascii=False, indent=2))
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         sys.stderr.write(f"[ERROR] {e}\n")
         sys.exit(1)
@@ -13,7 +13,9 @@ from server.workflow.agents.tool import (
     price_risk_tool,
     review_feature_tool,
 )
+from server.workflow.agents.sharding import score_sellers
 from server.workflow.prompts import load_prompt
+from server.workflow.schemas import ProductScoring
 from server.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -112,10 +114,7 @@ class ProductAgent:
             )
 
         # -------------------------------------------------------------
-        # 🔥 2) LLM에게 넘길 context 구성
-        # -------------------------------------------------------------
-        # -------------------------------------------------------------
-        # 🔥 (NEW) seller_id 기반 매핑 생성 — zip() 제거
+        # 🔥 2) seller_id 기반 매핑 생성 후 LLM 점수화 (샤드 모드면 판매자 그룹별 동시 호출)
         # -------------------------------------------------------------
         # seller_product_data 내부는 seller_id 포함된 dict 리스트
         seller_data_map = {
@@ -123,8 +122,53 @@ class ProductAgent:
             for item in seller_product_data
         }
 
+        seller_scores = score_sellers(
+            sellers_with_products,
+            lambda shard: self._score_sellers(user_input, shard, seller_data_map),
+            agent="product_agent",
+        )
+
+        recommended_sellers: List[Dict[str, Any]] = []
+        for seller in sellers_with_products:
+            seller_id = seller.get("seller_id")
+            seller_score_data = seller_scores.get(str(seller_id), {})
+
+            recommended_sellers.append(
+                {
+                    "seller_id": seller_id,
+                    "seller_name": seller.get("seller_name"),
+                    "product_score": seller_score_data.get("score", 0.5),
+                    "product_reasoning": seller_score_data.get("reasoning", ""),
+                    "seller_characteristics": seller_score_data.get(
+                        "seller_characteristics", ""
+                    ),
+                    "recommended_price_range": seller_score_data.get(
+                        "price_range", {"min": 0, "max": 0}
+                    ),
+                    "products": seller.get("products", []),
+                }
+            )
+
+        # 상품 특성 점수 기준 정렬
+        recommended_sellers.sort(
+            key=lambda x: x["product_score"], reverse=True)
+
+        return recommended_sellers
+
+    def _score_sellers(
+        self,
+        user_input: Dict[str, Any],
+        sellers_with_products: List[Dict[str, Any]],
+        seller_data_map: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        판매자 그룹 하나를 LLM 한 번으로 점수화
+
+        Returns:
+            seller_id(str) → LLM 점수 객체
+        """
         # -------------------------------------------------------------
-        # 🔥 context 구성 (zip → seller_id 매핑 방식으로 변경)
+        # 🔥 context 구성 (seller_id 매핑 방식)
         # -------------------------------------------------------------
         context = {
             "user_price_min": user_input.get("price_min", 0),
@@ -176,50 +220,30 @@ class ProductAgent:
         }
 
         # -------------------------------------------------------------
-        # 🔥 3) LLM에게 판단 요청
+        # 🔥 LLM에게 판단 요청
         # -------------------------------------------------------------
-        decision = self.llm_agent.decide(
+        decision = self.llm_agent.decide_structured(
             context=context,
             decision_task=self.product_prompt,
-            format="json",
+            schema=ProductScoring,
         )
+        if decision is None:
+            return {}
 
         # -------------------------------------------------------------
-        # 🔥 4) LLM 결과를 기반으로 판매자 점수 계산
+        # 🔥 LLM 결과를 seller_id별로 정리 (응답 필드명 → 내부 필드명)
         # -------------------------------------------------------------
-        recommended_sellers_result = decision.get("recommended_sellers", [])
-
-        # seller_id를 키로 하는 딕셔너리 생성
         seller_scores: Dict[str, Dict[str, Any]] = {
-            str(rec.get("seller_id")): rec for rec in recommended_sellers_result
+            str(rec.id): {
+                "score": rec.sc,
+                "reasoning": rec.why,
+                "seller_characteristics": rec.ch,
+                "price_range": {"min": rec.pmin, "max": rec.pmax},
+            }
+            for rec in decision.s
         }
 
-        recommended_sellers: List[Dict[str, Any]] = []
-        for seller in sellers_with_products:
-            seller_id = seller.get("seller_id")
-            seller_score_data = seller_scores.get(str(seller_id), {})
-
-            recommended_sellers.append(
-                {
-                    "seller_id": seller_id,
-                    "seller_name": seller.get("seller_name"),
-                    "product_score": seller_score_data.get("score", 0.5),
-                    "product_reasoning": seller_score_data.get("reasoning", ""),
-                    "seller_characteristics": seller_score_data.get(
-                        "seller_characteristics", ""
-                    ),
-                    "recommended_price_range": seller_score_data.get(
-                        "price_range", {"min": 0, "max": 0}
-                    ),
-                    "products": seller.get("products", []),
-                }
-            )
-
-        # 상품 특성 점수 기준 정렬
-        recommended_sellers.sort(
-            key=lambda x: x["product_score"], reverse=True)
-
-        return recommended_sellers
+        return seller_scores
 
 
 def product_agent_node(state: RecommendationState) -> dict:
@@ -231,9 +255,11 @@ def product_agent_node(state: RecommendationState) -> dict:
         agent = ProductAgent()
 
         # DB에서 조회
-        from server.db.product_service import (
-            get_sellers_with_products,
-            search_products_by_keywords,
+        from server.utils.workflow_utils import fetch_sellers_for_query
+        from server.workflow.agents.candidate_pool import (
+            AGENT_BUDGETS,
+            prerank_sellers,
+            size_candidate_pool,
         )
 
         search_query = state.get("search_query", {})
@@ -245,25 +271,23 @@ def product_agent_node(state: RecommendationState) -> dict:
             )
             keywords = search_query.get("keywords", [])
 
-            # 사용자 입력에서 필터 추출
-            category = user_input.get("category")
-            price_min = user_input.get("price_min")
-            price_max = user_input.get("price_max")
-
-            # DB에서 조회 (검색어 필터는 사용하지 않음 - 가격/할인율 기준으로만 넓게 조회)
-            # Orchestrator가 사용자 의도를 파악해서 최종 필터링
-            sellers_with_products = get_sellers_with_products(
-                search_query=None,  # 검색어 필터 제거
-                category=category,
-                price_min=price_min,
-                price_max=price_max,
-                limit=50,
-            )
+            # 후보 검색 노드 결과가 있으면 사용 (검색어와 관련된 판매자)
+            sellers_with_products = state.get("candidate_sellers")
+            if not sellers_with_products:
+                # DB에서 조회 (검색어에서 해석한 가격/상태/카테고리/거래 조건과 모델 번호로 필터)
+                # Orchestrator가 사용자 의도를 파악해서 최종 필터링
+                sellers_with_products = prerank_sellers(user_input, fetch_sellers_for_query(
+                    search_query, user_input, limit=AGENT_BUDGETS["product_agent"].fetch_limit))
+
+            # 토큰/지연 시간 예산에 맞춰 판매자 수, 판매자당 상품 수 결정
+            sellers_with_products, candidate_pool = size_candidate_pool(
+                "product_agent", sellers_with_products)
 
             logger.info(
                 "상품 특성 분석용 판매자 조회 완료",
                 extra={
                     "seller_count": len(sellers_with_products) if sellers_with_products else 0,
+                    "candidate_pool": candidate_pool,
                     "has_keywords": bool(keywords),
                     "search_query": search_query_obj if not keywords else None,
                 }
@@ -271,9 +295,9 @@ def product_agent_node(state: RecommendationState) -> dict:
 
             if not sellers_with_products:
                 # DB에 상품이 있는지 확인
-                from server.db.database import SessionLocal
+                from server.db.database import ReadSessionLocal
                 from server.db.models import Product
-                db = SessionLocal()
+                db = ReadSessionLocal()
                 try:
                     total_count = db.query(Product).count()
                     if total_count == 0:
@@ -314,6 +338,7 @@ def product_agent_node(state: RecommendationState) -> dict:
                 "reasoning": "상품 특성 관점에서 판매자 프로파일링 및 추천 완료",
                 "confidence": 0.8,
             },
+            "candidate_pools": {"product_agent": candidate_pool},
             "completed_steps": ["product_analysis"],
         }
 
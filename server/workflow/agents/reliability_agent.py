@@ -12,7 +12,9 @@ from server.workflow.agents.tool import (
     review_feature_tool,
     trade_risk_tool,
 )
+from server.workflow.agents.sharding import score_sellers
 from server.workflow.prompts import load_prompt
+from server.workflow.schemas import ReliabilityScoring
 from server.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -83,44 +85,14 @@ class ReliabilityAgent:
             )
 
         # -------------------------------------------------------------
-        # 🔥 2) LLM에게 넘길 context 구성
+        # 🔥 2) LLM 점수화 (샤드 모드면 판매자 그룹별 동시 호출)
         # -------------------------------------------------------------
-        context = {
-            "user_trust_safety_preference": user_input.get("trust_safety", 50),
-            "user_remote_transaction_preference": user_input.get("remote_transaction", 50),
-
-            # tools 기반 구조화 피처
-            "sellers_reliability_view": seller_reliability_data,
-        }
-
-        # -------------------------------------------------------------
-        # 🔥 3) LLM에게 판단 요청
-        # -------------------------------------------------------------
-        decision = self.llm_agent.decide(
-            context=context,
-            decision_task=self.reliability_prompt,
-            format="json",
+        recommended_sellers_result = score_sellers(
+            seller_reliability_data,
+            lambda shard: self._score_sellers(user_input, shard),
+            agent="reliability_agent",
         )
 
-        # -------------------------------------------------------------
-        # 🔥 4) LLM 결과를 기반으로 판매자 점수 계산
-        # -------------------------------------------------------------
-        raw = decision.get("recommended_sellers", {})
-
-        # normalize to dict[str, dict]
-        if isinstance(raw, dict):
-            recommended_sellers_result = {
-                str(k): v for k, v in raw.items() if isinstance(v, dict)
-            }
-        elif isinstance(raw, list):
-            recommended_sellers_result = {
-                str(item.get("seller_id")): item
-                for item in raw
-                if isinstance(item, dict) and item.get("seller_id") is not None
-            }
-        else:
-            recommended_sellers_result = {}
-
         recommended_sellers: List[Dict[str, Any]] = []
         for seller in sellers_with_products:
             seller_id = seller.get("seller_id")
@@ -147,6 +119,55 @@ class ReliabilityAgent:
 
         return recommended_sellers
 
+    def _score_sellers(
+        self,
+        user_input: Dict[str, Any],
+        seller_reliability_data: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        판매자 그룹 하나를 LLM 한 번으로 점수화
+
+        Returns:
+            seller_id(str) → LLM 점수 객체
+        """
+        # -------------------------------------------------------------
+        # 🔥 context 구성
+        # -------------------------------------------------------------
+        context = {
+            "user_trust_safety_preference": user_input.get("trust_safety", 50),
+            "user_remote_transaction_preference": user_input.get("remote_transaction", 50),
+
+            # tools 기반 구조화 피처
+            "sellers_reliability_view": seller_reliability_data,
+        }
+
+        # -------------------------------------------------------------
+        # 🔥 LLM에게 판단 요청
+        # -------------------------------------------------------------
+        decision = self.llm_agent.decide_structured(
+            context=context,
+            decision_task=self.reliability_prompt,
+            schema=ReliabilityScoring,
+        )
+        if decision is None:
+            return {}
+
+        # -------------------------------------------------------------
+        # 🔥 LLM 결과를 seller_id별로 정리 (응답 필드명 → 내부 필드명)
+        # -------------------------------------------------------------
+        recommended_sellers_result = {
+            str(rec.id): {
+                "score": rec.sc,
+                "reasoning": rec.why,
+                "seller_profile_summary": rec.sum,
+                "matched_features": rec.tags,
+                "trust_level": rec.tl,
+            }
+            for rec in decision.s
+        }
+
+        return recommended_sellers_result
+
 
 def reliability_agent_node(state: RecommendationState) -> dict:
     """신뢰도 분석 에이전트 노드"""
@@ -157,9 +178,11 @@ def reliability_agent_node(state: RecommendationState) -> dict:
         agent = ReliabilityAgent()
 
         # DB에서 조회 (product_agent와 동일한 로직)
-        from server.db.product_service import (
-            get_sellers_with_products,
-            search_products_by_keywords,
+        from server.utils.workflow_utils import fetch_sellers_for_query
+        from server.workflow.agents.candidate_pool import (
+            AGENT_BUDGETS,
+            prerank_sellers,
+            size_candidate_pool,
         )
 
         search_query = state.get("search_query", {})
@@ -171,25 +194,23 @@ def reliability_agent_node(state: RecommendationState) -> dict:
             )
             keywords = search_query.get("keywords", [])
 
-            # 사용자 입력에서 필터 추출
-            category = user_input.get("category")
-            price_min = user_input.get("price_min")
-            price_max = user_input.get("price_max")
-
-            # DB에서 조회 (검색어 필터는 사용하지 않음 - 신뢰도 기준으로만 넓게 조회)
-            # Orchestrator가 사용자 의도를 파악해서 최종 필터링
-            sellers_with_products = get_sellers_with_products(
-                search_query=None,  # 검색어 필터 제거
-                category=category,
-                price_min=price_min,
-                price_max=price_max,
-                limit=50,
-            )
+            # 후보 검색 노드 결과가 있으면 사용 (검색어와 관련된 판매자)
+            sellers_with_products = state.get("candidate_sellers")
+            if not sellers_with_products:
+                # DB에서 조회 (검색어에서 해석한 가격/상태/카테고리/거래 조건과 모델 번호로 필터)
+                # Orchestrator가 사용자 의도를 파악해서 최종 필터링
+                sellers_with_products = prerank_sellers(user_input, fetch_sellers_for_query(
+                    search_query, user_input, limit=AGENT_BUDGETS["reliability_agent"].fetch_limit))
+
+            # 토큰/지연 시간 예산에 맞춰 판매자 수, 판매자당 상품 수 결정
+            sellers_with_products, candidate_pool = size_candidate_pool(
+                "reliability_agent", sellers_with_products)
 
             logger.info(
                 "신뢰도 분석용 판매자 조회 완료",
                 extra={
                     "seller_count": len(sellers_with_products) if sellers_with_products else 0,
+                    "candidate_pool": candidate_pool,
                     "has_keywords": bool(keywords),
                     "search_query": search_query_obj if not keywords else None,
                 }
@@ -197,9 +218,9 @@ def reliability_agent_node(state: RecommendationState) -> dict:
 
             if not sellers_with_products:
                 # DB에 상품이 있는지 확인
-                from server.db.database import SessionLocal
+                from server.db.database import ReadSessionLocal
                 from server.db.models import Product
-                db = SessionLocal()
+                db = ReadSessionLocal()
                 try:
                     total_count = db.query(Product).count()
                     if total_count == 0:
@@ -241,6 +262,7 @@ def reliability_agent_node(state: RecommendationState) -> dict:
                 "recommended_sellers": reliability_recommendations,
                 "reasoning": "신뢰도 관점에서 신뢰할 수 있는 판매자 프로파일링 및 추천 완료",
             },
+            "candidate_pools": {"reliability_agent": candidate_pool},
             # add reducer가 기존 리스트와 병합
             "completed_steps": ["reliability_analysis"],
         }
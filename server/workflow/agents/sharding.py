@@ -0,0 +1,159 @@
+"""
+판매자 점수화 LLM 호출 분할 (map-reduce)
+후보 판매자를 고정 크기 샤드로 나눠 샤드별 LLM 호출을 동시에 실행하고 결과를 합친다.
+출력 토큰(판매자별 점수 객체)이 샤드마다 나뉘므로 전체 지연 시간은 가장 느린 샤드에 좌우된다.
+
+- 샤드 배정: 사전 랭킹 순서로 라운드 로빈 (샤드 간 후보 품질 분포를 비슷하게 유지)
+- 점수 보정: 사전 랭킹 1위 판매자를 모든 샤드에 기준점(anchor)으로 넣고,
+  샤드마다 기준점 점수가 전체 평균과 같아지도록 샤드 점수를 평행 이동 (0~1로 자름)
+  샤드 크기가 1이면 기준점을 넣을 자리가 없으므로 보정하지 않음
+- 동시 실행: score_sellers 호출마다 LLM_SCORING_MAX_CONCURRENCY 크기의 풀을 따로 사용
+  (병렬 그래프 브랜치의 다른 에이전트나 다른 요청의 샤드 뒤에 줄 서지 않음)
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from server.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# single: 한 번의 호출로 전체 점수화 / sharded: 샤드별 동시 호출
+LLM_SCORING_MODE = os.getenv("LLM_SCORING_MODE", "single").lower()
+LLM_SCORING_SHARD_SIZE = int(os.getenv("LLM_SCORING_SHARD_SIZE", "6"))
+LLM_SCORING_MAX_CONCURRENCY = int(os.getenv("LLM_SCORING_MAX_CONCURRENCY", "4"))
+LLM_SCORING_ANCHOR = os.getenv("LLM_SCORING_ANCHOR", "true").lower() == "true"
+
+if LLM_SCORING_MODE not in ("single", "sharded"):
+    raise ValueError(f"LLM_SCORING_MODE는 single 또는 sharded여야 합니다: {LLM_SCORING_MODE}")
+
+ShardScorer = Callable[[List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]
+
+
+def anchor_slots(shard_size: int, anchor: bool = True) -> int:
+    """샤드마다 기준점 판매자가 차지하는 자리 수 (기준점 외 판매자 자리가 없으면 0)"""
+    return 1 if anchor and shard_size > 1 else 0
+
+
+def shard_sellers(
+    sellers: List[Dict[str, Any]], shard_size: int, anchor: bool = True
+) -> List[List[Dict[str, Any]]]:
+    """
+    판매자를 샤드로 분할 (anchor=True면 첫 판매자를 모든 샤드에 포함)
+
+    Args:
+        sellers: 사전 랭킹 순 판매자 리스트
+        shard_size: 샤드당 판매자 수 (기준점 포함, 1이면 기준점 없이 분할)
+    """
+    if not sellers:
+        return []
+    anchors = sellers[:anchor_slots(shard_size, anchor)]
+    rest = sellers[len(anchors):]
+    per_shard = max(1, shard_size - len(anchors))
+    n_shards = max(1, -(-len(rest) // per_shard))
+    return [anchors + rest[i::n_shards] for i in range(n_shards)]
+
+
+def shard_count(seller_count: int) -> int:
+    """판매자 수에 대한 점수화 LLM 호출 수 (single 모드 / 샤드 크기 이하면 1)"""
+    if LLM_SCORING_MODE != "sharded" or seller_count <= LLM_SCORING_SHARD_SIZE:
+        return 1
+    anchors = anchor_slots(LLM_SCORING_SHARD_SIZE, LLM_SCORING_ANCHOR)
+    per_shard = max(1, LLM_SCORING_SHARD_SIZE - anchors)
+    return -(-(seller_count - anchors) // per_shard)
+
+
+def calibrate_shard_scores(
+    shard_results: List[Dict[str, Dict[str, Any]]],
+    anchor_id: Optional[str],
+    score_keys: Sequence[str] = ("score",),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    샤드별 점수 병합 (기준점 점수로 샤드 간 점수 기준 맞춤)
+
+    Args:
+        shard_results: 샤드별 seller_id(str) → 점수 객체
+        anchor_id: 모든 샤드에 포함된 판매자 ID (없으면 보정 없이 병합)
+        score_keys: 보정할 점수 필드 (필드마다 따로 평행 이동)
+    """
+    offsets: List[Dict[str, float]] = [{} for _ in shard_results]
+    for key in score_keys:
+        anchor_scores = [
+            (i, float(result[anchor_id][key])) for i, result in enumerate(shard_results)
+            if anchor_id is not None and _has_score(result.get(anchor_id), key)
+        ]
+        if not anchor_scores:
+            continue
+        target = sum(score for _, score in anchor_scores) / len(anchor_scores)
+        for i, score in anchor_scores:
+            offsets[i][key] = target - score
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for result, offset in zip(shard_results, offsets):
+        for seller_id, item in result.items():
+            if seller_id == anchor_id and seller_id in merged:
+                continue
+            for key in score_keys:
+                if _has_score(item, key):
+                    item = {**item, key: min(1.0, max(0.0, float(item[key]) + offset.get(key, 0.0)))}
+            merged[seller_id] = item
+    return merged
+
+
+def _has_score(item: Optional[Dict[str, Any]], key: str) -> bool:
+    if not isinstance(item, dict):
+        return False
+    try:
+        float(item.get(key))
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def score_sellers(
+    sellers: List[Dict[str, Any]],
+    score_shard: ShardScorer,
+    agent: str,
+    score_keys: Sequence[str] = ("score",),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    판매자 점수화 (LLM_SCORING_MODE에 따라 한 번 또는 샤드별 동시 호출)
+
+    Args:
+        sellers: 사전 랭킹 순 판매자 리스트
+        score_shard: 판매자 리스트 → seller_id(str)별 점수 객체 (LLM 호출 1회)
+        agent: 로그용 에이전트 이름
+        score_keys: 샤드 간 보정할 점수 필드
+
+    Returns:
+        seller_id(str) → 점수 객체
+    """
+    if LLM_SCORING_MODE != "sharded" or len(sellers) <= LLM_SCORING_SHARD_SIZE:
+        return score_shard(sellers)
+
+    shards = shard_sellers(sellers, LLM_SCORING_SHARD_SIZE, anchor=LLM_SCORING_ANCHOR)
+    anchor = anchor_slots(LLM_SCORING_SHARD_SIZE, LLM_SCORING_ANCHOR) > 0
+    anchor_id = str(sellers[0].get("seller_id")) if anchor else None
+    logger.info(
+        "판매자 점수화 샤드 실행",
+        extra={"agent": agent, "seller_count": len(sellers), "shard_count": len(shards),
+               "shard_size": LLM_SCORING_SHARD_SIZE},
+    )
+
+    # 호출마다 풀을 따로 두어 동시 실행 차수를 이 에이전트 호출 단위로 제한
+    # (PoolBudget.estimate_latency_ms의 waves 추정과 같은 기준)
+    workers = max(1, min(LLM_SCORING_MAX_CONCURRENCY, len(shards)))
+    shard_results = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"llm-shard-{agent}") as executor:
+        # 워커 스레드에서도 요청의 timing collector에 span이 기록되도록 컨텍스트 복사
+        futures = [
+            executor.submit(contextvars.copy_context().run, score_shard, shard) for shard in shards
+        ]
+        for future in futures:
+            try:
+                shard_results.append(future.result())
+            except Exception:
+                logger.exception("판매자 점수화 샤드 실패", extra={"agent": agent})
+    return calibrate_shard_scores(shard_results, anchor_id, score_keys)
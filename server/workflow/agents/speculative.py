@@ -0,0 +1,126 @@
+"""
+오케스트레이터 선행 준비 (speculative 모드)
+기본 그래프는 두 서브에이전트가 모두 끝나야 오케스트레이터가 시작되어
+지연 시간이 max(서브에이전트) + 오케스트레이터(DB 조회 포함)가 된다.
+
+speculative 모드에서는 두 서브에이전트를 한 노드에서 동시에 실행하고,
+먼저 끝난 쪽 결과로 오케스트레이터의 결정적 작업을 늦게 끝나는 쪽과 겹쳐 수행한다.
+
+- 판매자 정보 병합 (all_sellers)
+- 상품 매칭용 판매자별 상품 선조회 (fetch_match_candidates)
+- 오케스트레이터 프롬프트 prefix 캐시 워밍 (ORCHESTRATOR_PREFIX_WARMUP)
+
+두 번째 결과가 도착하면 남은 DB 작업 없이 오케스트레이터 LLM 호출이 바로 시작된다.
+
+작업은 요청마다 만드는 스레드 풀(SPECULATIVE_WORKERS_PER_REQUEST)에서 실행하여
+동시 요청 수와 관계없이 서브에이전트가 다른 요청의 작업 뒤에 줄 서지 않는다.
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+from server.utils.logger import get_logger
+from server.utils.metrics import instrument_node
+from server.utils.tools import fetch_match_candidates
+from server.workflow.agents.orchestrator_agent import OrchestratorAgent, merge_agent_sellers
+from server.workflow.agents.product_agent import product_agent_node
+from server.workflow.agents.reliability_agent import reliability_agent_node
+from server.workflow.state import RecommendationState, merge_dicts
+
+logger = get_logger(__name__)
+
+ORCHESTRATOR_SPECULATIVE = os.getenv("ORCHESTRATOR_SPECULATIVE", "false").lower() == "true"
+# 캐시 워밍 요청은 prefix 토큰만큼 비용이 들어 기본 비활성
+ORCHESTRATOR_PREFIX_WARMUP = os.getenv("ORCHESTRATOR_PREFIX_WARMUP", "false").lower() == "true"
+
+_SUB_AGENTS = {
+    "product_agent": ("product_agent_recommendations", product_agent_node),
+    "reliability_agent": ("reliability_agent_recommendations", reliability_agent_node),
+}
+
+# 요청당 작업 수: 서브에이전트 2개 + 상품 선조회 + 캐시 워밍
+SPECULATIVE_WORKERS_PER_REQUEST = int(os.getenv("SPECULATIVE_WORKERS_PER_REQUEST", "4"))
+
+
+def _submit(executor: ThreadPoolExecutor, fn, *args):
+    # 워커 스레드에서도 요청의 timing collector에 span이 기록되도록 컨텍스트 복사
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _seller_ids(results: Dict[str, Any]) -> List[int]:
+    return [s["seller_id"] for s in results.get("recommended_sellers", [])
+            if s.get("seller_id") is not None]
+
+
+def speculative_scoring_node(state: RecommendationState) -> dict:
+    """
+    두 서브에이전트 동시 실행 + 오케스트레이터 결정적 작업 선행
+
+    Returns:
+        두 서브에이전트 노드의 상태 업데이트 병합 + orchestrator_prep
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, SPECULATIVE_WORKERS_PER_REQUEST), thread_name_prefix="speculative")
+    try:
+        return _run_speculative(executor, state)
+    finally:
+        # 캐시 워밍은 기다리지 않음 (남은 작업이 끝나면 스레드 종료)
+        executor.shutdown(wait=False)
+
+
+def _run_speculative(executor: ThreadPoolExecutor, state: RecommendationState) -> dict:
+    futures = {
+        _submit(executor, instrument_node(name, node), state): name
+        for name, (_, node) in _SUB_AGENTS.items()
+    }
+
+    updates: List[Dict[str, Any]] = []
+    preload = None
+    preload_ids: set = set()
+    for future in as_completed(futures):
+        name = futures[future]
+        update = future.result()
+        updates.append(update)
+        results = update.get(_SUB_AGENTS[name][0]) or {}
+
+        if preload is None:
+            # 첫 결과: 공용 후보 전체(있으면) + 이 에이전트의 판매자 상품을 미리 조회
+            preload_ids = set(_seller_ids(results))
+            preload_ids.update(
+                s["seller_id"] for s in state.get("candidate_sellers") or []
+                if s.get("seller_id") is not None)
+            preload = _submit(executor, fetch_match_candidates, sorted(preload_ids))
+            if ORCHESTRATOR_PREFIX_WARMUP:
+                # 결과를 기다리지 않음 (두 번째 결과가 먼저 오면 워밍 없이 진행)
+                _submit(executor, OrchestratorAgent().warm_up)
+            logger.info(
+                "오케스트레이터 선행 준비 시작",
+                extra={"first_agent": name, "preload_sellers": len(preload_ids)},
+            )
+
+    merged: Dict[str, Any] = {"completed_steps": [], "candidate_pools": {}}
+    for update in updates:
+        for key, value in update.items():
+            if key == "completed_steps":
+                merged[key] += value
+            elif key == "candidate_pools":
+                merged[key] = merge_dicts(merged[key], value)
+            else:
+                merged[key] = value
+
+    product_results = merged.get("product_agent_recommendations") or {}
+    reliability_results = merged.get("reliability_agent_recommendations") or {}
+    sellers_with_products = preload.result() if preload is not None else []
+    # 후보 공유 없이 각자 조회한 경우 두 번째 에이전트에만 있는 판매자 보충
+    missing = sorted(set(_seller_ids(reliability_results) + _seller_ids(product_results))
+                     - preload_ids)
+    if missing:
+        sellers_with_products = sellers_with_products + fetch_match_candidates(missing)
+
+    merged["orchestrator_prep"] = {
+        "all_sellers": merge_agent_sellers(product_results, reliability_results),
+        "sellers_with_products": sellers_with_products,
+    }
+    return merged
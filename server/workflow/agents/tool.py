@@ -8,10 +8,17 @@ from typing import Dict, Any, List
 import numpy as np
 from sqlalchemy.orm import Session
 
-from server.db.database import SessionLocal
+from server.db.database import ReadSessionLocal
 from server.db.models import Product, Seller, Review
+from server.utils.cache import cache_manager
+from server.utils.market_stats import QuantileSketch
+from server.utils.metrics import timed
 
+# 카테고리별 가격 스케치 캐시 유지 시간 (초)
+MARKET_SKETCH_TTL_SECONDS = 600
 
+
+@timed("tool")
 def seller_profile_tool(seller_id: int) -> Dict[str, Any]:
     """
     공통 툴: DB에서 판매자 정보와 리뷰를 조회하여
@@ -23,7 +30,7 @@ def seller_profile_tool(seller_id: int) -> Dict[str, Any]:
     Returns:
         판매자 프로필 정보 딕셔너리
     """
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
 
     try:
         # --- 1) DB에서 판매자 정보 조회 ---
@@ -156,13 +163,14 @@ ProductAgent 전용 툴
 """
 
 
+@timed("tool")
 def item_market_tool(product_id: int) -> Dict[str, Any]:
     """
     ProductAgent 전용 툴:
     - DB에서 같은 카테고리/유사 상품들의 가격 분포를 보고
       시세와 현재 가격의 차이를 정량화한다.
     """
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
 
     def _empty_result(similar_count: int = 0) -> Dict[str, Any]:
         return {
@@ -185,23 +193,16 @@ def item_market_tool(product_id: int) -> Dict[str, Any]:
         category_mid = product.category
         price = float(product.price)
 
-        # --- 1) 유사 아이템 집합 정의 (같은 상/중 카테고리) ---
-        similar_query = db.query(Product).filter(
-            Product.category_top == category_top,
-            Product.category == category_mid,
-            Product.price.isnot(None),
-        )
-        prices: List[float] = [float(p.price) for p in similar_query]
-        similar_items_count = len(prices)
+        # --- 1) 유사 아이템 집합 정의 (같은 상/중 카테고리) → 가격 스케치 ---
+        sketch = _category_price_sketch(db, category_top, category_mid)
+        similar_items_count = sketch.n
 
         if similar_items_count < 5:
             # 데이터가 너무 적으면 None 처리
             return _empty_result(similar_items_count)
 
-        prices_array = np.array(prices)
-
         # --- 2) 시세 추정 (median 사용 예시) ---
-        fair_price = float(np.median(prices_array))
+        fair_price = float(sketch.quantile(0.5))
 
         if fair_price == 0:
             return _empty_result(similar_items_count)
@@ -211,7 +212,7 @@ def item_market_tool(product_id: int) -> Dict[str, Any]:
             fair_price  # -0.2 → 20% 싸다
 
         # percentile (분포에서 현재 가격이 몇 분위인지)
-        price_percentile = float(np.mean(prices_array <= price))
+        price_percentile = float(sketch.cdf(price))
 
         return {
             "item_id": int(product_id),
@@ -225,6 +226,31 @@ def item_market_tool(product_id: int) -> Dict[str, Any]:
         db.close()
 
 
+@timed("db", "category_price_sketch")
+def _category_price_sketch(db: Session, category_top: str, category_mid: str) -> QuantileSketch:
+    """
+    카테고리별 가격 분위수 스케치 (캐시)
+    같은 카테고리 상품마다 전체 가격을 다시 읽고 정렬하지 않도록 공유한다.
+    """
+    cache_key = {"category_top": category_top, "category": category_mid}
+    cached = cache_manager.get("market_sketch", cache_key)
+    if cached is not None:
+        return QuantileSketch.from_dict(cached)
+
+    prices = db.query(Product.price).filter(
+        Product.category_top == category_top,
+        Product.category == category_mid,
+        Product.price.isnot(None),
+    ).all()
+    sketch = QuantileSketch()
+    sketch.extend(np.fromiter((row[0] for row in prices),
+                  dtype=float, count=len(prices)))
+    cache_manager.set("market_sketch", cache_key,
+                      sketch.to_dict(), MARKET_SKETCH_TTL_SECONDS)
+    return sketch
+
+
+@timed("tool")
 def price_risk_tool(
     market_features: Dict[str, Any],
     seller_profile: Dict[str, Any],
@@ -283,6 +309,7 @@ def price_risk_tool(
     }
 
 
+@timed("tool")
 def trade_risk_tool(product_id: int) -> Dict[str, Any]:
     """
     ReliabilityAgent 전용 툴:
@@ -290,7 +317,7 @@ def trade_risk_tool(product_id: int) -> Dict[str, Any]:
       거래 구조의 위험도를 0~100 점수와 태그로 반환한다.
     """
 
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
 
     try:
         product = (
@@ -356,6 +383,7 @@ def trade_risk_tool(product_id: int) -> Dict[str, Any]:
         db.close()
 
 
+@timed("tool")
 def review_feature_tool(
     seller_id: int,
     max_reviews: int = 20,
@@ -364,7 +392,7 @@ def review_feature_tool(
     ProductAgent / ReliabilityAgent 공통 툴:
     - 최근 리뷰 내용을 요약해 긍/부정 키워드 및 길이 등을 분석한다.
     """
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
 
     try:
         # 최신 리뷰 순으로 제한
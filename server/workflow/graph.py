@@ -2,20 +2,55 @@
 LangGraph 워크플로우 그래프 정의
 """
 
+import os
+from typing import Callable, Optional
+
 from langgraph.graph import StateGraph, END
 from server.workflow.state import RecommendationState
 from server.workflow.agents import (
+    candidate_retrieval_node,
     product_agent_node,
     reliability_agent_node,
     orchestrator_agent_node,
+    deterministic_orchestrator_node,
+    speculative_scoring_node,
+    combined_agent_node,
 )
+from server.workflow.agents.speculative import ORCHESTRATOR_SPECULATIVE
 from server.utils.workflow_utils import generate_search_query
+from server.utils.metrics import instrument_node
+
+
+NodeWrapper = Callable[[str, Callable], Callable]
+
+# split: 상품 특성/신뢰도 에이전트 분리 / combined: 통합 점수화 에이전트 1회 호출
+WORKFLOW_TOPOLOGY = os.getenv("WORKFLOW_TOPOLOGY", "split").lower()
+# llm: 오케스트레이터 LLM 결합 / deterministic: 점수 가중 결합
+WORKFLOW_FINALIZER = os.getenv("WORKFLOW_FINALIZER", "llm").lower()
 
+if WORKFLOW_TOPOLOGY not in ("split", "combined"):
+    raise ValueError(f"WORKFLOW_TOPOLOGY는 split 또는 combined여야 합니다: {WORKFLOW_TOPOLOGY}")
+if WORKFLOW_FINALIZER not in ("llm", "deterministic"):
+    raise ValueError(f"WORKFLOW_FINALIZER는 llm 또는 deterministic이어야 합니다: {WORKFLOW_FINALIZER}")
 
-def recommendation_workflow() -> StateGraph:
+
+def recommendation_workflow(
+    node_wrapper: Optional[NodeWrapper] = None,
+    speculative: bool = ORCHESTRATOR_SPECULATIVE,
+    topology: str = WORKFLOW_TOPOLOGY,
+    finalizer: str = WORKFLOW_FINALIZER,
+) -> StateGraph:
     """
     추천 시스템 워크플로우 그래프 생성
 
+    Args:
+        node_wrapper: (노드 이름, 노드 함수)를 받아 감싼 함수를 반환하는 훅
+            (벤치마크/계측용, 없으면 원본 노드 사용)
+        speculative: 두 서브에이전트를 한 노드에서 실행하고 먼저 끝난 결과로
+            오케스트레이터 준비(판매자 병합, 상품 선조회)를 겹쳐 수행 (split 토폴로지만 해당)
+        topology: split(서브에이전트 2개) / combined(통합 점수화 에이전트 1개)
+        finalizer: llm(오케스트레이터 LLM) / deterministic(LLM 없이 점수 가중 결합)
+
     Returns:
         StateGraph: LangGraph 워크플로우 그래프
     """
@@ -23,6 +58,11 @@ def recommendation_workflow() -> StateGraph:
     # State 그래프 생성
     workflow = StateGraph(RecommendationState)
 
+    def add_node(name: str, node: Callable):
+        # 모든 노드는 span으로 계측 (/metrics, timings 응답)
+        node = instrument_node(name, node)
+        workflow.add_node(name, node_wrapper(name, node) if node_wrapper else node)
+
     # 초기화 노드: 검색 쿼리 생성
     def init_node(state: RecommendationState) -> dict:
         """초기화: 검색 쿼리 생성"""
@@ -41,24 +81,36 @@ def recommendation_workflow() -> StateGraph:
             "completed_steps": ["initialization"],  # add reducer가 기존 리스트와 병합
         }
 
-    # 2개 서브에이전트
-    workflow.add_node("product_agent", product_agent_node)
-    workflow.add_node("reliability_agent", reliability_agent_node)
+    # 후보 검색 (두 서브에이전트가 공유)
+    add_node("candidate_retrieval", candidate_retrieval_node)
+
+    # 점수화 노드 (split: 2개 서브에이전트, speculative 모드에서는 한 노드에서 동시 실행)
+    if topology == "combined":
+        scoring_nodes = ["combined_agent"]
+        add_node("combined_agent", combined_agent_node)
+    elif speculative:
+        scoring_nodes = ["speculative_scoring"]
+        add_node("speculative_scoring", speculative_scoring_node)
+    else:
+        scoring_nodes = ["product_agent", "reliability_agent"]
+        add_node("product_agent", product_agent_node)
+        add_node("reliability_agent", reliability_agent_node)
 
     # 추천 오케스트레이터 (2개 결과 종합 및 랭킹)
-    workflow.add_node("orchestrator_agent", orchestrator_agent_node)
+    add_node(
+        "orchestrator_agent",
+        deterministic_orchestrator_node if finalizer == "deterministic" else orchestrator_agent_node,
+    )
 
     # 엣지 추가
     workflow.set_entry_point("init")
-    workflow.add_node("init", init_node)
-
-    # 초기화 → 2개 서브에이전트 병렬 실행
-    workflow.add_edge("init", "product_agent")
-    workflow.add_edge("init", "reliability_agent")
+    add_node("init", init_node)
 
-    # 2개 서브에이전트 완료 후 오케스트레이터
-    workflow.add_edge("product_agent", "orchestrator_agent")
-    workflow.add_edge("reliability_agent", "orchestrator_agent")
+    # 초기화 → 후보 검색 → 점수화 노드 병렬 실행 → 모두 완료 후 오케스트레이터
+    workflow.add_edge("init", "candidate_retrieval")
+    for name in scoring_nodes:
+        workflow.add_edge("candidate_retrieval", name)
+        workflow.add_edge(name, "orchestrator_agent")
 
     # 오케스트레이터 완료
     workflow.add_edge("orchestrator_agent", END)
@@ -0,0 +1,99 @@
+"""
+에이전트 LLM 응답 스키마 (structured outputs)
+LLM 호출 시 strict JSON schema로 전달하여 응답 형태를 고정하고, 결과는 같은 모델로 검증한다.
+
+- 필드명은 출력 토큰을 줄이기 위해 짧게 사용 (에이전트가 내부 필드명으로 변환)
+- 설명 문자열 길이는 description으로 안내하고, 검증 시 상한을 넘으면 잘라서 사용
+- 점수는 0~1 범위를 벗어나면 잘라서 사용 (검증 실패로 대체 로직이 실행되지 않도록)
+"""
+
+from typing import Annotated, List, Literal
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+# 설명 문자열 길이 상한 (자)
+REASON_MAX_CHARS = 160
+SUMMARY_MAX_CHARS = 80
+TAG_MAX_CHARS = 20
+MAX_TAGS = 5
+MAX_FINAL_SELLERS = 10
+
+
+def _bounded_text(max_chars: int):
+    return AfterValidator(lambda v: v[:max_chars])
+
+
+Score = Annotated[float, AfterValidator(lambda v: min(1.0, max(0.0, v)))]
+Reason = Annotated[str, _bounded_text(REASON_MAX_CHARS)]
+Summary = Annotated[str, _bounded_text(SUMMARY_MAX_CHARS)]
+Tags = Annotated[
+    List[Annotated[str, _bounded_text(TAG_MAX_CHARS)]], AfterValidator(lambda v: v[:MAX_TAGS])]
+
+
+class _AgentSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class ProductSellerScore(_AgentSchema):
+    """상품 특성 관점 판매자 점수"""
+    id: int = Field(..., description="입력의 seller_id")
+    sc: Score = Field(..., description="상품 특성 매칭 점수 (0.0-1.0)")
+    ch: Summary = Field(..., description=f"판매자 성향 요약 (한국어 1문장, {SUMMARY_MAX_CHARS}자 이내)")
+    pmin: int = Field(..., description="판매 가격대 하한 (KRW)")
+    pmax: int = Field(..., description="판매 가격대 상한 (KRW)")
+    why: Reason = Field(..., description=f"점수 근거 (한국어 1-2문장, {REASON_MAX_CHARS}자 이내)")
+
+
+class ProductScoring(_AgentSchema):
+    """ProductAgent 응답"""
+    s: List[ProductSellerScore] = Field(..., description="입력의 모든 판매자 (점수 내림차순)")
+
+
+class ReliabilitySellerScore(_AgentSchema):
+    """신뢰도 관점 판매자 점수"""
+    id: int = Field(..., description="입력의 seller_id")
+    sc: Score = Field(..., description="신뢰도 매칭 점수 (0.0-1.0)")
+    tl: Literal["high", "medium", "low"] = Field(..., description="신뢰 수준")
+    sum: Summary = Field(..., description=f"판매자 프로필 요약 (한국어 1문장, {SUMMARY_MAX_CHARS}자 이내)")
+    tags: Tags = Field(..., description=f"매칭된 특징 (한국어 짧은 구, 최대 {MAX_TAGS}개, 각 {TAG_MAX_CHARS}자 이내)")
+    why: Reason = Field(..., description=f"점수 근거 (한국어 1-2문장, {REASON_MAX_CHARS}자 이내)")
+
+
+class ReliabilityScoring(_AgentSchema):
+    """ReliabilityAgent 응답"""
+    s: List[ReliabilitySellerScore] = Field(..., description="입력의 모든 판매자 (점수 내림차순)")
+
+
+class FinalSellerScore(_AgentSchema):
+    """최종 추천 판매자"""
+    id: int = Field(..., description="서브 에이전트 결과에 있는 seller_id")
+    sc: Score = Field(..., description="최종 결합 점수 (0.0-1.0)")
+    why: Reason = Field(
+        ..., description=f"상품 특성/신뢰도/사용자 선호 반영 근거 (한국어 1-2문장, {REASON_MAX_CHARS}자 이내)")
+    fit: Summary = Field(..., description=f"어떤 구매자에게 적합한지 (한국어 1문장, {SUMMARY_MAX_CHARS}자 이내)")
+
+
+class FinalRanking(_AgentSchema):
+    """OrchestratorAgent 응답"""
+    r: Annotated[List[FinalSellerScore], AfterValidator(lambda v: v[:MAX_FINAL_SELLERS])] = Field(
+        ..., min_length=1, description=f"추천 판매자 (추천 순, 1-{MAX_FINAL_SELLERS}명)")
+    why: Annotated[str, _bounded_text(REASON_MAX_CHARS * 2)] = Field(
+        ..., description=f"전체 결합 기준 설명 (한국어 2-3문장, {REASON_MAX_CHARS * 2}자 이내)")
+
+
+class CombinedSellerScore(_AgentSchema):
+    """상품 특성 + 신뢰도 동시 점수"""
+    id: int = Field(..., description="입력의 seller_id")
+    ps: Score = Field(..., description="상품 특성 매칭 점수 (0.0-1.0)")
+    rs: Score = Field(..., description="신뢰도 매칭 점수 (0.0-1.0)")
+    tl: Literal["high", "medium", "low"] = Field(..., description="신뢰 수준")
+    ch: Summary = Field(..., description=f"판매자 성향 요약 (한국어 1문장, {SUMMARY_MAX_CHARS}자 이내)")
+    tags: Tags = Field(..., description=f"매칭된 특징 (한국어 짧은 구, 최대 {MAX_TAGS}개, 각 {TAG_MAX_CHARS}자 이내)")
+    pmin: int = Field(..., description="판매 가격대 하한 (KRW)")
+    pmax: int = Field(..., description="판매 가격대 상한 (KRW)")
+    why: Reason = Field(..., description=f"두 점수의 근거 (한국어 1-2문장, {REASON_MAX_CHARS}자 이내)")
+
+
+class CombinedScoring(_AgentSchema):
+    """CombinedScoringAgent 응답"""
+    s: List[CombinedSellerScore] = Field(..., description="입력의 모든 판매자")
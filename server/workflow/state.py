@@ -6,6 +6,11 @@ from typing import TypedDict, List, Dict, Any, Optional, Annotated
 from operator import add
 
 
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """병렬 노드가 같은 dict 필드에 서로 다른 키를 쓸 때 병합하는 reducer"""
+    return {**(left or {}), **(right or {})}
+
+
 # ==================== 워크플로우 State ====================
 
 class RecommendationState(TypedDict, total=False):
@@ -14,9 +19,17 @@ class RecommendationState(TypedDict, total=False):
     user_input: Dict[str, Any]
     search_query: Optional[Dict[str, Any]]
 
+    # 후보 검색 결과 (에이전트 공용 후보, 없으면 각 에이전트가 직접 조회)
+    candidate_sellers: Optional[List[Dict[str, Any]]]
+    retrieval_info: Optional[Dict[str, Any]]
+    # 에이전트별 후보 풀 크기 결정 정보 (병렬 에이전트가 각자 키를 씀)
+    candidate_pools: Annotated[Dict[str, Any], merge_dicts]
+
     # 서브에이전트 결과
     product_agent_recommendations: Optional[Dict[str, Any]]
     reliability_agent_recommendations: Optional[Dict[str, Any]]
+    # speculative 모드: 서브에이전트와 겹쳐 미리 준비한 오케스트레이터 입력 (판매자 병합, 상품 선조회)
+    orchestrator_prep: Optional[Dict[str, Any]]
 
     # 최종 결과
     final_seller_recommendations: Optional[List[Dict[str, Any]]]
@@ -0,0 +1,15 @@
+"""
+pytest 공통 설정
+server 모듈은 import 시점에 DATABASE_URL로 엔진을 만들기 때문에 import 전에 임시 SQLite 파일을 지정한다.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmpdir = tempfile.mkdtemp(prefix="tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmpdir, 'test.db')}")
@@ -0,0 +1,69 @@
+"""
+에이전트별 후보 풀 크기 결정 (plan_pool) 테스트
+"""
+
+import pytest
+
+from server.workflow.agents import candidate_pool
+from server.workflow.agents.candidate_pool import AGENT_BUDGETS, PoolBudget, plan_pool
+from server.workflow.schemas import MAX_FINAL_SELLERS
+
+
+def _budget(token_budget: int) -> PoolBudget:
+    # 판매자 1명 = 50 + 상품 수 × 10 토큰, 지연 시간 제한 없음
+    return PoolBudget(
+        token_budget=token_budget, latency_budget_ms=1e9,
+        base_tokens=100, tokens_per_seller=50, tokens_per_product=10,
+        output_tokens_per_seller=0, max_sellers=30, max_products_per_seller=5,
+    )
+
+
+@pytest.fixture
+def min_sellers(monkeypatch):
+    monkeypatch.setattr(candidate_pool, "CANDIDATE_POOL_MIN_SELLERS", 10)
+
+
+@pytest.mark.parametrize("token_budget, product_counts, expected", [
+    # 예산 안에 전원 + 최대 상품 수
+    (1000, [5] * 4, (4, 5)),
+    # 최소 인원보다 후보가 적으면 후보 수가 기준
+    (1000, [5] * 2, (2, 5)),
+    # 상품 5개로는 9명 → 최소 10명을 담을 수 있는 4개로 줄임
+    (1000, [5] * 20, (10, 4)),
+    # 상품이 적은 판매자는 실제 상품 수만 계산
+    (1000, [1] * 12, (12, 5)),
+    # 예산 소진: 판매자당 1개로도 최소 인원을 못 담으면 담을 수 있는 만큼
+    (300, [5] * 20, (3, 1)),
+    # 한 명도 못 담는 예산이어도 최소 1명
+    (120, [5] * 20, (1, 1)),
+    # 후보 없음
+    (1000, [], (0, 5)),
+])
+def test_plan_pool(min_sellers, token_budget, product_counts, expected):
+    assert plan_pool(_budget(token_budget), product_counts) == expected
+
+
+def test_plan_pool_respects_max_sellers(min_sellers):
+    budget = _budget(100_000)
+    assert plan_pool(budget, [5] * 50) == (budget.max_sellers, 5)
+
+
+def test_plan_pool_latency_budget(min_sellers):
+    # 판매자당 출력 1초 → 지연 시간 예산(기본 지연 포함)이 판매자 수를 제한
+    # (상품 수를 줄여도 나아지지 않으면 판매자당 상품 수는 최대값 유지)
+    budget = PoolBudget(
+        token_budget=100_000,
+        latency_budget_ms=candidate_pool.LLM_BASE_LATENCY_MS + 4500,
+        base_tokens=0, tokens_per_seller=0, tokens_per_product=0,
+        output_tokens_per_seller=int(candidate_pool.LLM_OUTPUT_TOKENS_PER_SECOND),
+        max_sellers=30, max_products_per_seller=3,
+    )
+    assert plan_pool(budget, [3] * 20) == (4, 3)
+
+
+@pytest.mark.parametrize("agent", sorted(AGENT_BUDGETS))
+def test_default_budgets_fill_final_response(agent):
+    # 기본 설정으로 최종 추천 판매자 수만큼 후보를 넘길 수 있어야 함
+    sellers, per_seller = plan_pool(AGENT_BUDGETS[agent], [5] * 30)
+    assert sellers >= MAX_FINAL_SELLERS
+    assert per_seller >= 3
@@ -0,0 +1,49 @@
+"""
+히스토리 커서 페이지네이션 테스트
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from server.db.database import SessionLocal, database
+from server.db.history_service import list_history
+from server.db.models import History
+
+
+@pytest.fixture
+def history_rows():
+    """server_default(func.now()) 행과 앱에서 created_at을 넣은 행(write-behind 방식)을 섞어 저장"""
+    database.create_tables()
+    db = SessionLocal()
+    try:
+        db.query(History).delete()
+        for i in range(7):
+            values = {"search_query": f"query-{i}", "user_input": {}, "results": []}
+            if i % 2:
+                values["created_at"] = datetime.now(timezone.utc)
+            db.add(History(**values))
+            db.commit()
+        ids = [row.id for row in db.query(History.id).order_by(History.id.desc())]
+    finally:
+        db.close()
+    return ids
+
+
+def test_list_history_walks_every_page(history_rows):
+    seen = []
+    cursor = None
+    for _ in range(len(history_rows) + 1):
+        page = list_history(cursor=cursor, limit=2)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert cursor is None
+    assert seen == history_rows
+
+
+def test_list_history_rejects_malformed_cursor():
+    with pytest.raises(ValueError):
+        list_history(cursor="not-a-cursor")
@@ -0,0 +1,69 @@
+"""
+검색어 의도 해석 (parse_query_intent) 테스트
+"""
+
+import pytest
+
+from server.utils.workflow_utils import parse_query_intent
+
+VOCABULARY = {
+    "category": ["노트북", "스마트폰", "태블릿", "모니터", "여성가방"],
+    "category_top": ["PC/노트북", "모바일/태블릿", "패션잡화"],
+    "condition": ["새상품", "거의새것", "중고", "사용감있음"],
+}
+
+FILTER_KEYS = (
+    "category", "category_top", "price_min", "price_max", "condition",
+    "sell_method", "delivery_fee", "is_safe",
+)
+
+
+@pytest.mark.parametrize("query, filters, search_terms", [
+    # 가격
+    ("아이폰 14 50만원 이하 새상품 택배",
+     {"price_max": 500000, "condition": "새상품", "sell_method": "택배"}, "아이폰 14"),
+    ("3만원에서 5만원", {"price_min": 30000, "price_max": 50000}, ""),
+    ("30~50만원 아이패드", {"price_min": 300000, "price_max": 500000}, "아이패드"),
+    ("50만원대 갤럭시", {"price_min": 500000, "price_max": 599999}, "갤럭시"),
+    ("100만원 정도 맥북", {"price_min": 800000, "price_max": 1200000}, "맥북"),
+    ("아이폰 14 이상", {}, "아이폰 14 이상"),
+    # 상태
+    ("새것 같은 중고", {"condition": "거의새것"}, "중고"),
+    ("새상품 말고 아이폰", {}, "아이폰"),
+    ("사용감 있는 아이폰", {"condition": "사용감있음"}, "아이폰"),
+    # 거래 방식 / 배송비 / 안전결제
+    ("배송 빠른 판매자", {}, "배송 빠른 판매자"),
+    ("직거래 말고 택배", {"sell_method": "택배"}, ""),
+    ("직거래 말고 아이폰", {"sell_method": "택배"}, "아이폰"),
+    ("택배는 빼고 직거래만", {"sell_method": "직거래"}, ""),
+    ("직거래 택배 둘 다", {}, "둘 다"),
+    ("무료배송 안전결제 아이폰", {"delivery_fee": "없음", "is_safe": "사용"}, "아이폰"),
+    # 카테고리 (다른 명사가 있으면 필터로 쓰지 않음)
+    ("노트북", {"category": "노트북"}, "노트북"),
+    ("저렴한 노트북 추천", {"category": "노트북"}, "저렴한 노트북 추천"),
+    ("노트북 가방", {}, "노트북 가방"),
+    ("노트북가방", {}, "노트북가방"),
+    ("게이밍 노트북", {}, "게이밍 노트북"),
+    ("태블릿 16 새상품", {"category": "태블릿", "condition": "새상품"}, "태블릿 16"),
+])
+def test_parse_query_intent(query, filters, search_terms):
+    intent = parse_query_intent(query, VOCABULARY)
+    assert {key: intent[key] for key in FILTER_KEYS if key in intent} == filters
+    assert intent["search_terms"] == search_terms
+
+
+@pytest.mark.parametrize("query, model_numbers", [
+    ("아이폰 14 프로", ["14"]),
+    ("맥북 m2 13인치", ["m2"]),
+    ("에어팟 2세대", []),
+    ("아이패드 10세대", []),
+    ("갤럭시 s23 울트라", ["s23"]),
+])
+def test_parse_query_intent_model_numbers(query, model_numbers):
+    assert parse_query_intent(query, VOCABULARY)["model_numbers"] == model_numbers
+
+
+def test_parse_query_intent_without_vocabulary_skips_category():
+    intent = parse_query_intent("노트북 새상품")
+    assert "category" not in intent
+    assert intent["condition"] == "새상품"
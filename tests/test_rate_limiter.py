@@ -0,0 +1,100 @@
+"""
+Rate limiter 백엔드 테스트 (슬라이딩 윈도우 경계, 리셋, remaining)
+"""
+
+import asyncio
+
+import pytest
+
+from server.middleware import limiter
+from server.middleware.limiter import MemoryRateLimiter, RateLimitResult
+
+WINDOW = 100
+LIMIT = 3
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(1000.0)
+    monkeypatch.setattr(limiter.time, "monotonic", fake)
+    monkeypatch.setattr(limiter.time, "time", fake)
+    return fake
+
+
+async def _hit(backend, key: str = "user:1") -> RateLimitResult:
+    return await backend.hit(key, LIMIT, WINDOW)
+
+
+async def _check_window_boundaries(backend, clock):
+    # 윈도우 시작 (t=1000, 경과 0초): limit까지 허용 후 차단
+    results = [await _hit(backend) for _ in range(LIMIT + 1)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.count for r in results] == [1, 2, 3, 3]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[-1].reset_after == pytest.approx(WINDOW)
+
+    # 같은 윈도우 중간: 여전히 차단, reset_after는 남은 시간
+    clock.now = 1050.0
+    blocked = await _hit(backend)
+    assert not blocked.allowed
+    assert blocked.reset_after == pytest.approx(50.0)
+
+    # 다음 윈도우 시작: 이전 윈도우 카운트가 가중치 1로 남아 차단
+    clock.now = 1100.0
+    assert not (await _hit(backend)).allowed
+
+    # 다음 윈도우 절반: 이전 3건 * 0.5 = 1.5 → 두 건 더 허용
+    clock.now = 1150.0
+    first, second, third = await _hit(backend), await _hit(backend), await _hit(backend)
+    assert (first.allowed, first.count, first.remaining) == (True, 2, 1)
+    assert (second.allowed, second.count, second.remaining) == (True, 3, 0)
+    assert not third.allowed
+
+    # 두 윈도우 이상 지나면 완전히 리셋
+    clock.now = 1400.0
+    reset = await _hit(backend)
+    assert (reset.allowed, reset.count, reset.remaining) == (True, 1, LIMIT - 1)
+
+    # 키별로 독립적인 카운트
+    assert (await _hit(backend, key="user:2")).count == 1
+
+
+def test_memory_limiter_window_boundaries(clock):
+    asyncio.run(_check_window_boundaries(MemoryRateLimiter(), clock))
+
+
+def test_memory_limiter_evicts_idle_keys(clock):
+    backend = MemoryRateLimiter(evict_interval=0)
+    asyncio.run(_hit(backend, key="idle"))
+    clock.now = 1100.0
+    asyncio.run(_hit(backend, key="active"))
+    assert len(backend) == 2
+
+    # 두 윈도우 이상 요청이 없던 키만 제거
+    clock.now = 1300.0
+    asyncio.run(_hit(backend, key="active"))
+    assert len(backend) == 1
+
+
+def test_redis_limiter_window_boundaries(clock):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    if not limiter.REDIS_AVAILABLE:
+        pytest.skip("redis 패키지 없음")
+
+    async def run():
+        backend = limiter.RedisRateLimiter(client=fakeredis.FakeAsyncRedis())
+        try:
+            await _check_window_boundaries(backend, clock)
+        finally:
+            await backend.close()
+
+    asyncio.run(run())
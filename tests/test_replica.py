@@ -0,0 +1,68 @@
+"""
+읽기 복제본 라우팅 / lag guard 테스트
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from server.db import replica as replica_module
+from server.db.replica import Replica, ReplicaRouter
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    healthy = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    # 존재하지 않는 디렉터리 → 연결 실패
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    yield primary, healthy, unreachable
+    for engine in (primary, healthy, unreachable):
+        engine.dispose()
+
+
+def _router(primary, *engines, **kwargs):
+    return ReplicaRouter(
+        primary=primary,
+        replicas=[Replica(engine=engine) for engine in engines],
+        check_interval=3600,
+        **kwargs,
+    )
+
+
+def test_replicas_unused_before_first_check(engines):
+    primary, healthy, _ = engines
+    router = _router(primary, healthy)
+    assert not router.replicas[0].healthy
+    assert router._monitor is None
+
+
+def test_first_pick_checks_replicas_synchronously(engines):
+    primary, healthy, unreachable = engines
+    router = _router(primary, unreachable, healthy)
+    try:
+        # 첫 선택에서 확인이 끝나 연결 실패 복제본은 한 번도 선택되지 않음
+        picks = [router.pick() for _ in range(4)]
+        assert all(pick is router.replicas[1] for pick in picks)
+        assert router.replicas[0].lag is None
+        assert router.replicas[1].lag == 0.0
+    finally:
+        router._stop.set()
+
+
+def test_lagging_replica_excluded(engines, monkeypatch):
+    primary, healthy, _ = engines
+    monkeypatch.setattr(replica_module, "replication_lag", lambda conn: 30.0)
+    router = _router(primary, healthy, max_lag=10)
+    try:
+        assert router.pick() is None
+        assert router.session().get_bind() is primary
+    finally:
+        router._stop.set()
+
+
+def test_start_monitor_without_replicas(engines):
+    primary, _, _ = engines
+    router = _router(primary)
+    router.start_monitor()
+    assert router._monitor is None
+    assert router.pick() is None
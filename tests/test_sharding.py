@@ -0,0 +1,161 @@
+"""
+판매자 점수화 샤드 분할 / 점수 보정 테스트
+"""
+
+import threading
+import time
+
+import pytest
+
+from server.workflow.agents import sharding
+from server.workflow.agents.sharding import (
+    calibrate_shard_scores,
+    score_sellers,
+    shard_count,
+    shard_sellers,
+)
+
+
+def _sellers(n):
+    return [{"seller_id": i} for i in range(1, n + 1)]
+
+
+def _ids(shards):
+    return [[s["seller_id"] for s in shard] for shard in shards]
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    monkeypatch.setattr(sharding, "LLM_SCORING_MODE", "sharded")
+    monkeypatch.setattr(sharding, "LLM_SCORING_SHARD_SIZE", 3)
+    monkeypatch.setattr(sharding, "LLM_SCORING_ANCHOR", True)
+    monkeypatch.setattr(sharding, "LLM_SCORING_MAX_CONCURRENCY", 4)
+
+
+def test_shard_sellers_puts_anchor_in_every_shard():
+    shards = shard_sellers(_sellers(7), shard_size=3)
+    # 기준점(1) + 나머지 6명을 라운드 로빈으로 2명씩
+    assert _ids(shards) == [[1, 2, 5], [1, 3, 6], [1, 4, 7]]
+    assert all(len(shard) <= 3 for shard in shards)
+
+
+def test_shard_sellers_without_anchor():
+    assert _ids(shard_sellers(_sellers(5), shard_size=2, anchor=False)) == [[1, 4], [2, 5], [3]]
+
+
+def test_shard_sellers_size_one_skips_anchor():
+    # 기준점 + 1명이 샤드 크기(1)를 넘으므로 기준점 없이 한 명씩
+    shards = shard_sellers(_sellers(3), shard_size=1)
+    assert _ids(shards) == [[1], [2], [3]]
+
+
+def test_shard_sellers_empty():
+    assert shard_sellers([], shard_size=3) == []
+
+
+@pytest.mark.parametrize("seller_count, expected", [(1, 1), (3, 1), (4, 2), (5, 2), (7, 3)])
+def test_shard_count_matches_shard_sellers(sharded, seller_count, expected):
+    assert shard_count(seller_count) == expected
+    if seller_count > sharding.LLM_SCORING_SHARD_SIZE:
+        assert len(shard_sellers(_sellers(seller_count), 3)) == expected
+
+
+def test_shard_count_size_one(sharded, monkeypatch):
+    monkeypatch.setattr(sharding, "LLM_SCORING_SHARD_SIZE", 1)
+    assert shard_count(4) == len(shard_sellers(_sellers(4), 1)) == 4
+
+
+def test_shard_count_single_mode(monkeypatch):
+    monkeypatch.setattr(sharding, "LLM_SCORING_MODE", "single")
+    assert shard_count(100) == 1
+
+
+def test_calibrate_shifts_shards_to_anchor_mean():
+    merged = calibrate_shard_scores(
+        [
+            {"1": {"score": 0.6}, "2": {"score": 0.5}},
+            {"1": {"score": 0.8}, "3": {"score": 0.95}},
+        ],
+        anchor_id="1",
+    )
+    # 기준점 평균 0.7 → 첫 샤드 +0.1, 두 번째 샤드 -0.1
+    assert merged["1"]["score"] == pytest.approx(0.7)
+    assert merged["2"]["score"] == pytest.approx(0.6)
+    assert merged["3"]["score"] == pytest.approx(0.85)
+
+
+def test_calibrate_clips_to_unit_range():
+    merged = calibrate_shard_scores(
+        [{"1": {"score": 0.2}, "2": {"score": 0.9}}, {"1": {"score": 1.0}, "3": {"score": 0.1}}],
+        anchor_id="1",
+    )
+    # 기준점 평균 0.6 → +0.4 / -0.4 이동 후 0~1로 자름
+    assert merged["2"]["score"] == 1.0
+    assert merged["3"]["score"] == 0.0
+
+
+def test_calibrate_leaves_shard_without_anchor_score_unshifted():
+    merged = calibrate_shard_scores(
+        [
+            {"1": {"score": 0.6}, "2": {"score": 0.5}},
+            {"1": {"reasoning": "점수 누락"}, "3": {"score": 0.9}},
+            {"4": {"score": 0.3}},
+        ],
+        anchor_id="1",
+    )
+    # 기준점 점수가 있는 샤드만 평균에 포함 (자기 자신이므로 이동 없음)
+    assert merged["1"]["score"] == pytest.approx(0.6)
+    assert merged["2"]["score"] == pytest.approx(0.5)
+    assert merged["3"]["score"] == pytest.approx(0.9)
+    assert merged["4"]["score"] == pytest.approx(0.3)
+
+
+def test_calibrate_per_score_key():
+    merged = calibrate_shard_scores(
+        [
+            {"1": {"ps": 0.4, "rs": 0.9}, "2": {"ps": 0.5, "rs": 0.5}},
+            {"1": {"ps": 0.6, "rs": 0.7}, "3": {"ps": 0.5, "rs": 0.5}},
+        ],
+        anchor_id="1",
+        score_keys=("ps", "rs"),
+    )
+    assert (merged["2"]["ps"], merged["2"]["rs"]) == pytest.approx((0.6, 0.4))
+    assert (merged["3"]["ps"], merged["3"]["rs"]) == pytest.approx((0.4, 0.6))
+
+
+def test_score_sellers_drops_failed_shard(sharded):
+    def score_shard(shard):
+        ids = [s["seller_id"] for s in shard]
+        if 3 in ids:
+            raise RuntimeError("LLM 오류")
+        return {str(i): {"score": 0.5} for i in ids}
+
+    merged = score_sellers(_sellers(5), score_shard, agent="test")
+    # 샤드 [1, 2, 4], [1, 3, 5] 중 두 번째 실패 → 첫 샤드 결과만 남음
+    assert sorted(merged) == ["1", "2", "4"]
+
+
+def test_score_sellers_bounds_concurrency_per_call(sharded, monkeypatch):
+    monkeypatch.setattr(sharding, "LLM_SCORING_MAX_CONCURRENCY", 2)
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def score_shard(shard):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return {str(s["seller_id"]): {"score": 0.5} for s in shard}
+
+    # 두 에이전트가 동시에 호출해도 각자 2개씩 실행 (공유 풀 대기 없음)
+    threads = [
+        threading.Thread(target=score_sellers, args=(_sellers(9), score_shard, name))
+        for name in ("product_agent", "reliability_agent")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert active["max"] == 4